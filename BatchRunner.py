@@ -0,0 +1,132 @@
+import functools
+import multiprocessing
+import signal
+import threading
+
+from BatchSolver import solve_task
+
+
+class TaskTimeout(BaseException):
+    """Raised inside a task which has run for longer than the batch runner's time limit. It's a BaseException rather
+    than an Exception so that a task's own 'except Exception' error handling can't catch it and carry on running."""
+
+
+def _raise_timeout(signal_number, frame):
+    raise TaskTimeout()
+
+
+def _check_timeout_supported():
+    """Raises a ValueError if a time limit can't be applied to tasks here. The time limit uses a real-time timer
+    signal, which needs a platform that has one (so not Windows) and can only be handled on the main thread of the
+    process - rather than letting a task run on without its limit, the batch is refused."""
+    if not hasattr(signal, "setitimer"):
+        raise ValueError("Task time limits need a real-time timer signal, which this platform doesn't have.")
+    if threading.current_thread() is not threading.main_thread():
+        raise ValueError("Task time limits can only be applied to tasks carried out on the main thread.")
+
+
+def _run_task(function, task, timeout):
+    """Carries out one task, returning (result, None) if it succeeds or (None, error message) if it fails or runs out
+    of time. A ValueError is raised (without carrying out the task) if a time limit is given but can't be applied."""
+    use_timer = timeout is not None
+    if use_timer:
+        _check_timeout_supported()
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        try:
+            result = function(task)
+        finally:
+            # Stopping the timer as soon as the task finishes (if it goes off just before this, the TaskTimeout is
+            # caught below rather than escaping and stopping the rest of the chunk)
+            if use_timer:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        return result, None
+    except TaskTimeout:
+        return None, f"Timed out after {timeout} seconds"
+    except Exception as error:
+        return None, f"{type(error).__name__}: {error}"
+    finally:
+        if use_timer:
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _run_chunk(function, timeout, chunk):
+    """Carries out a chunk of (index, task) pairs in one go, returning an (index, result, error) triple for each"""
+    results = []
+    for index, task in chunk:
+        result, error = _run_task(function, task, timeout)
+        results.append((index, result, error))
+    return results
+
+
+class BatchRunner:
+    """Solves many independent problems in parallel, spreading them across all the processor cores through a pool of
+    worker processes. By default each task is a task dictionary for BatchSolver.solve_task (e.g. a random exam graph
+    or item list with the algorithm to carry out), but any picklable top-level function can be used instead.
+
+    - The tasks are sent to the workers in chunks, so that each worker receives several tasks at a time rather than
+    one, which keeps the cost of passing tasks between processes small compared to solving them
+    - The results are streamed back as they are finished, either in the same order as the tasks or in whichever order
+    they complete (which avoids waiting on a slow task before returning later ones)
+    - Each task can be given a time limit in seconds, after which it is stopped and reported as timed out. This needs
+    a real-time timer signal, so a ValueError is raised if a time limit is set on a platform without one (Windows), or
+    if the tasks are to be carried out in this process (processes=1) and it's not being run on the main thread.
+
+    Each task is solved by exactly the same function whether it's run in a worker or in this process (with
+    processes=1), so the results - including the generated logs - are identical to solving the tasks one by one."""
+
+    def __init__(self, function=solve_task, processes=None, chunk_size=None, timeout=None):
+        self.function = function
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size # Number of tasks sent to a worker at a time (chosen from the tasks if None)
+        self.timeout = timeout # Time limit for each task in seconds (None for no limit)
+        # Refusing a time limit straight away if the platform can't apply one
+        if timeout is not None and not hasattr(signal, "setitimer"):
+            _check_timeout_supported()
+
+    def run(self, tasks, ordered=True):
+        """Generator which carries out all the tasks, yielding an (index, result, error) triple for each one as it is
+        finished - where index is the task's position in 'tasks', and either result is the function's returned value
+        and error is None, or result is None and error is a message saying why the task failed or timed out. If
+        'ordered' is True the triples are yielded in the order of the tasks, otherwise in the order they finish."""
+
+        chunks = self._chunks(tasks)
+        run_chunk = functools.partial(_run_chunk, self.function, self.timeout)
+
+        # Carrying out the tasks in this process if only one process is to be used
+        if self.processes == 1:
+            for chunk in chunks:
+                yield from run_chunk(chunk)
+            return
+
+        with multiprocessing.Pool(self.processes) as pool:
+            if ordered:
+                chunk_results = pool.imap(run_chunk, chunks)
+            else:
+                chunk_results = pool.imap_unordered(run_chunk, chunks)
+            for results in chunk_results:
+                yield from results
+
+    def run_all(self, tasks):
+        """Carries out all the tasks and returns the list of their (index, result, error) triples in task order"""
+        return list(self.run(tasks, ordered=True))
+
+    def _chunks(self, tasks):
+        """Generator which splits the tasks into lists of (index, task) pairs to send to the workers. Unless a chunk
+        size has been set, it's chosen so each worker receives about four chunks (up to 64 tasks per chunk)."""
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            if hasattr(tasks, "__len__"):
+                chunk_size = max(1, min(64, len(tasks) // (self.processes * 4)))
+            else:
+                chunk_size = 16
+
+        chunk = []
+        for index, task in enumerate(tasks):
+            chunk.append((index, task))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
@@ -0,0 +1,270 @@
+import argparse
+import functools
+import json
+import os
+import sys
+
+from GraphCore import Graph
+from GraphFiles import load_graph_file
+from GraphAlgorithms import (PrimsMST, KruskalsMST, DijkstrasShortestPath, NearestNeighbour, TravellingSalesman,
+                             AllPairsShortestPaths, RouteInspection)
+from SimpleAlgorithms import BubbleSort, BinPacking, ExactBinPacking
+
+
+GRAPH_ALGORITHMS = ("prim", "kruskal", "dijkstra", "nearest-neighbour", "tsp-bounds", "floyd-warshall",
+                    "route-inspection")
+LIST_ALGORITHMS = ("bubble-sort", "first-fit", "first-fit-decreasing", "lower-bound", "best-fit", "best-fit-decreasing",
+                   "worst-fit", "next-fit", "full-bin", "optimal-packing")
+
+
+def build_graph(nodes, edges):
+    """Builds a logical graph from (label, x, y) node records and (node1 label, node2 label, weight) edge records,
+    placing any nodes without a position at the origin"""
+    graph = Graph()
+    graph.bulk_load([(label, x or 0, y or 0) for label, x, y in nodes], edges)
+    return graph
+
+
+def read_items_file(file_path):
+    """Reads a list of items for the sorting & bin-packing algorithms from a file. A '.json' file holds either a list
+    of integers or an object with an 'items' list (and optionally a bin 'capacity'), while any other file holds the
+    integers separated by spaces, commas or new lines. Returns the items and the capacity (None if not given)."""
+    with open(file_path, encoding="utf-8") as file:
+        text = file.read()
+
+    capacity = None
+    try:
+        if os.path.splitext(file_path)[1].lower() == ".json":
+            data = json.loads(text)
+            if isinstance(data, dict):
+                capacity = data.get("capacity")
+                data = data["items"]
+            items = [int(item) for item in data]
+        else:
+            items = [int(item) for item in text.replace(",", " ").split()]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"{file_path}: items must be a list of integers.")
+
+    if not items:
+        raise ValueError(f"{file_path}: please enter at least one integer.")
+    return items, capacity
+
+
+def solve_task(task):
+    """Carries out one algorithm on one problem, described by a dictionary with:
+    - 'algorithm': one of GRAPH_ALGORITHMS or LIST_ALGORITHMS
+    - 'nodes' & 'edges': the graph's node and edge records (for the graph algorithms)
+    - 'start' & 'end': the labels of the start (and end for Dijkstra's) node
+    - 'classical': whether the travelling salesman bounds are found for the classical rather than practical problem
+    - 'items', 'capacity' & 'descending': the list of items, bin capacity and sort order (for the list algorithms)
+    - 'record_sort': whether First/Best-Fit-Decreasing show the working of their bubble sort (True if not given)
+    - 'time_limit' & 'node_limit': the limits of the optimal packing's search (5 seconds and no node limit if not given)
+    Returns a dictionary with the algorithm and the 'log' lines of its working, exactly as the solution windows show
+    them (plus the 'table' rows of Dijkstra's working table). A ValueError is raised for an invalid problem. This
+    doesn't use PyQt at all, so it can be used for solving problems in bulk."""
+
+    algorithm = task["algorithm"]
+    result = {"algorithm": algorithm}
+
+    if algorithm in GRAPH_ALGORITHMS:
+        graph = build_graph(task["nodes"], task["edges"])
+        # Error message if the graph is empty
+        if not graph.nodes:
+            raise ValueError("The graph cannot be empty")
+
+        if algorithm == "kruskal":
+            result["log"] = KruskalsMST(graph).find_MST().log
+            return result
+        if algorithm == "route-inspection":
+            route_inspection = RouteInspection(graph)
+            route_inspection.find_route()
+            result["log"] = route_inspection.log
+            return result
+        if algorithm == "floyd-warshall":
+            shortest_paths = AllPairsShortestPaths(graph)
+            shortest_paths.solve(record_tables=True)
+            result["log"] = shortest_paths.table_log()
+            return result
+        if algorithm == "tsp-bounds":
+            travelling_salesman = TravellingSalesman(graph, practical=not task.get("classical"))
+            travelling_salesman.find_bounds()
+            result["log"] = travelling_salesman.log
+            return result
+
+        # Carrying out Nearest Neighbour from every node if no start node is given
+        if algorithm == "nearest-neighbour" and not str(task.get("start", "")).strip():
+            result["log"] = NearestNeighbour(graph).find_all_starts().log
+            return result
+
+        # Locating the start (and end) node by their labels
+        start_node = graph.get_node(str(task.get("start", "")).upper().strip())
+        if not start_node:
+            raise ValueError("Starting Node must exist in the graph!")
+
+        if algorithm == "prim":
+            result["log"] = PrimsMST(graph).find_MST(start_node).log
+        elif algorithm == "nearest-neighbour":
+            result["log"] = NearestNeighbour(graph).find_path(start_node).log
+        else:
+            end_node = graph.get_node(str(task.get("end", "")).upper().strip())
+            if not end_node:
+                raise ValueError("Both nodes must exist!")
+            dijkstra = DijkstrasShortestPath(graph)
+            dijkstra.find_shortest_path(start_node, end_node)
+            result["log"] = dijkstra.solution_log()
+            result["table"] = [list(row) for row in dijkstra.table_data()]
+        return result
+
+    if algorithm in LIST_ALGORITHMS:
+        items = list(task["items"])
+        if algorithm == "bubble-sort":
+            sorter = BubbleSort(items)
+            result["log"] = sorter.log_lines(sorter.passes(descending=bool(task.get("descending"))))
+            return result
+
+        # Error messages for an invalid bin capacity or an item larger than it
+        capacity = task.get("capacity")
+        if capacity is None:
+            raise ValueError("Please enter a bin capacity.")
+        if capacity <= 0:
+            raise ValueError("Bin capacity must be positive.")
+        for position, weight in enumerate(items, start=1):
+            if weight > capacity:
+                raise ValueError(f"Item #{position} of weight {weight} cannot be larger than the Bin Capacity")
+
+        bin_packer = BinPacking(items, capacity)
+        record_sort = task.get("record_sort", True)
+        if algorithm == "first-fit":
+            result["log"] = bin_packer.bins_log_lines(bin_packer.first_fit())
+        elif algorithm == "first-fit-decreasing":
+            result["log"] = bin_packer.first_fit_decreasing_log_lines(*bin_packer.first_fit_decreasing(record_sort))
+        elif algorithm == "best-fit-decreasing":
+            result["log"] = bin_packer.first_fit_decreasing_log_lines(*bin_packer.best_fit_decreasing(record_sort))
+        elif algorithm == "optimal-packing":
+            exact_packer = ExactBinPacking(items, capacity, time_limit=task.get("time_limit", 5.0),
+                                           node_limit=task.get("node_limit"))
+            exact_packer.solve()
+            result["log"] = exact_packer.log_lines()
+            result["optimal"] = exact_packer.optimal
+        elif algorithm in ("best-fit", "worst-fit", "next-fit", "full-bin"):
+            packing_algorithm = getattr(bin_packer, algorithm.replace("-", "_"))
+            result["log"] = bin_packer.bins_log_lines(packing_algorithm())
+        else:
+            result["log"] = bin_packer.lower_bound_log_lines()
+        return result
+
+    raise ValueError(f"Unknown algorithm '{algorithm}'.")
+
+
+def read_task(algorithm, file_path, arguments):
+    """Builds the task dictionary (for solve_task) for solving one input file with the command line's options"""
+    task = {"algorithm": algorithm}
+    if algorithm in GRAPH_ALGORITHMS:
+        task["nodes"], task["edges"] = load_graph_file(file_path)
+        task["start"] = arguments.start
+        task["end"] = arguments.end
+        task["classical"] = arguments.classical
+    else:
+        task["items"], capacity = read_items_file(file_path)
+        task["capacity"] = arguments.capacity if arguments.capacity is not None else capacity
+        task["descending"] = arguments.descending
+        task["record_sort"] = not arguments.no_sort_working
+        task["time_limit"] = arguments.search_time_limit
+        task["node_limit"] = arguments.search_node_limit
+    return task
+
+
+def solve_file(algorithm, arguments, file_path):
+    """Solves one input file with the command line's options, returning the result dictionary with the file's path
+    (and the error message instead of the log if the file couldn't be solved)"""
+    try:
+        result = solve_task(read_task(algorithm, file_path, arguments))
+    except (OSError, ValueError) as error:
+        result = {"algorithm": algorithm, "error": str(error)}
+    result["file"] = file_path
+    return result
+
+
+def format_text(result):
+    """Returns the lines of a result as they are printed in the text output format"""
+    lines = list(result["log"])
+    if "table" in result:
+        lines.append("")
+        lines.append("Node\tLabelling Order\tFinal Value\tWorking Values")
+        for row in result["table"]:
+            lines.append("\t".join(str(value) for value in row))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Solves graph files or item lists without opening the Decision Mathematics Learning Aid, printing "
+                    "the same working as the solution windows.")
+    parser.add_argument("algorithm", choices=GRAPH_ALGORITHMS + LIST_ALGORITHMS)
+    parser.add_argument("files", nargs="+",
+                        help="graph files (.json, .graphbin or .txt) or item files (.json or text) to solve")
+    parser.add_argument("--start", default="",
+                        help="label of the starting node (Nearest Neighbour is carried out from every node if not given)")
+    parser.add_argument("--end", default="", help="label of the end node (Dijkstra's)")
+    parser.add_argument("--classical", action="store_true",
+                        help="find the travelling salesman bounds on the graph as it is, without converting it into "
+                             "the practical problem")
+    parser.add_argument("--capacity", type=int, help="bin capacity (overrides any capacity in the item files)")
+    parser.add_argument("--descending", action="store_true", help="bubble sort into descending order")
+    parser.add_argument("--no-sort-working", action="store_true",
+                        help="leave out the bubble sort working of First/Best-Fit-Decreasing, sorting the items in "
+                             "O(n log n) instead (the bins are the same)")
+    parser.add_argument("--search-time-limit", type=float, default=5.0,
+                        help="time limit in seconds for the optimal packing's search, after which the best packing "
+                             "found is given without proving it optimal")
+    parser.add_argument("--search-node-limit", type=int,
+                        help="most bins the optimal packing's search tries before stopping")
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="output format")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="number of worker processes to solve the files in parallel (0 for one per core)")
+    parser.add_argument("--chunk-size", type=int, help="number of files sent to a worker process at a time")
+    parser.add_argument("--timeout", type=float, help="time limit in seconds for solving each file")
+    parser.add_argument("--unordered", action="store_true",
+                        help="output the results as they finish rather than in the order of the files")
+    arguments = parser.parse_args(argv)
+
+    # Imported here since the batch runner itself uses solve_task from this module
+    from BatchRunner import BatchRunner
+    try:
+        runner = BatchRunner(functools.partial(solve_file, arguments.algorithm, arguments),
+                             processes=arguments.processes or None, chunk_size=arguments.chunk_size,
+                             timeout=arguments.timeout)
+    # Error message if the time limit can't be applied on this platform
+    except ValueError as error:
+        parser.error(str(error))
+
+    results = []
+    failed = False
+    for index, result, error in runner.run(arguments.files, ordered=not arguments.unordered):
+        # Recording the error if solving the file failed or timed out
+        if error is not None:
+            result = {"algorithm": arguments.algorithm, "error": error, "file": arguments.files[index]}
+        failed = failed or "error" in result
+
+        # Collecting the results for JSON output, or streaming each result as it arrives for text output
+        if arguments.format == "json":
+            results.append(result)
+            continue
+        if len(arguments.files) > 1:
+            print(f"=== {result['file']} ===")
+        if "error" in result:
+            print("Error: " + result["error"])
+        else:
+            print("\n".join(format_text(result)))
+        if len(arguments.files) > 1:
+            print()
+
+    if arguments.format == "json":
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
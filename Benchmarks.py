@@ -0,0 +1,362 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from GraphCore import Graph
+from GraphAlgorithms import (MergeSort, NearestNeighbour, PrimsMST, KruskalsMST, DynamicMST, DijkstrasShortestPath,
+                             AllPairsShortestPaths, TravellingSalesman, RouteInspection)
+from SimpleAlgorithms import BubbleSort, BinPacking, ExactBinPacking
+
+# NumPy is optional - its version is only recorded since it speeds up some of the algorithms
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+GRAPH_INPUTS = ("sparse", "dense", "complete", "grid")
+ITEM_INPUTS = ("items",)
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+MAX_WEIGHT = 99 # Edge weights are chosen from 1 to this
+ITEM_CAPACITY = 100 # Bin capacity for the item lists, whose weights are chosen from 1 to the capacity
+OPTIMAL_NODE_LIMIT = 20000 # Most bins the optimal packing benchmark's search tries
+
+
+def case_random(input_kind, size, seed):
+    """Returns the random number generator for one input, seeded from the input's kind, size and the run's seed so
+    that every input is the same on every run (and doesn't change when other inputs are added or removed)"""
+    return random.Random(f"{input_kind}:{size}:{seed}")
+
+
+def expected_edges(input_kind, size):
+    """Returns roughly how many edges a generated graph of the given kind & number of nodes has, so that inputs too
+    large to build can be skipped before generating them"""
+    if input_kind == "sparse":
+        return 2 * size
+    if input_kind == "dense":
+        return size * (size - 1) // 4
+    if input_kind == "complete":
+        return size * (size - 1) // 2
+    return 2 * size # Grid
+
+
+def generate_graph(input_kind, size, seed):
+    """Generates a connected random graph with about 'size' nodes, returning (label, x, y) node records and (node1
+    label, node2 label, weight) edge records for Graph.bulk_load. The kinds of graph are:
+    - 'sparse': a random spanning tree plus as many random edges again (about 2 edges per node)
+    - 'dense': a random spanning tree plus each other pair of nodes joined with probability 1/2
+    - 'complete': every pair of nodes joined
+    - 'grid': a square grid of nodes, each joined to the nodes beside & below it (size is rounded to a square)"""
+    generator = case_random(input_kind, size, seed)
+
+    if input_kind == "grid":
+        side = max(2, round(size ** 0.5))
+        nodes = [(f"N{row * side + column}", column * 50.0, row * 50.0)
+                 for row in range(side) for column in range(side)]
+        edges = []
+        for row in range(side):
+            for column in range(side):
+                node_id = row * side + column
+                if column + 1 < side:
+                    edges.append((f"N{node_id}", f"N{node_id + 1}", generator.randint(1, MAX_WEIGHT)))
+                if row + 1 < side:
+                    edges.append((f"N{node_id}", f"N{node_id + side}", generator.randint(1, MAX_WEIGHT)))
+        return nodes, edges
+
+    labels = [f"N{node_id}" for node_id in range(size)]
+    nodes = [(label, generator.uniform(0, 1000), generator.uniform(0, 1000)) for label in labels]
+    joined = set() # Pairs of node ids (lower id first) already joined by an edge
+    edges = []
+
+    def join(node1_id, node2_id):
+        joined.add((min(node1_id, node2_id), max(node1_id, node2_id)))
+        edges.append((labels[node1_id], labels[node2_id], generator.randint(1, MAX_WEIGHT)))
+
+    if input_kind == "complete":
+        for node1_id in range(size):
+            for node2_id in range(node1_id + 1, size):
+                join(node1_id, node2_id)
+        return nodes, edges
+
+    # Joining each node to a random earlier node, so the graph is connected
+    for node_id in range(1, size):
+        join(generator.randrange(node_id), node_id)
+
+    if input_kind == "dense":
+        for node1_id in range(size):
+            for node2_id in range(node1_id + 1, size):
+                if (node1_id, node2_id) not in joined and generator.random() < 0.5:
+                    join(node1_id, node2_id)
+    else:
+        # Adding random edges until there are about two for every node (as many as the graph can hold)
+        target = min(2 * size, size * (size - 1) // 2)
+        while len(edges) < target:
+            node1_id, node2_id = generator.sample(range(size), 2)
+            if (min(node1_id, node2_id), max(node1_id, node2_id)) not in joined:
+                join(node1_id, node2_id)
+    return nodes, edges
+
+
+def generate_items(size, seed):
+    """Generates a random list of 'size' item weights from 1 to the item capacity"""
+    generator = case_random("items", size, seed)
+    return [generator.randint(1, ITEM_CAPACITY) for item in range(size)]
+
+
+def build_graph(input_kind, size, seed, compact=False):
+    """Generates a graph and builds it (as a CompactGraph snapshot if 'compact' is True), along with its index, so
+    none of the building is counted in the algorithms' times"""
+    nodes, edges = generate_graph(input_kind, size, seed)
+    graph = Graph()
+    graph.bulk_load(nodes, edges)
+    if compact:
+        graph = graph.compact()
+    graph.index()
+    return graph
+
+
+def first_node(graph):
+    return graph.index().nodes[0]
+
+
+def last_node(graph):
+    return graph.index().nodes[-1]
+
+
+def run_dynamic_MST(graph):
+    """Keeps a minimum spanning tree up to date while the weights of a hundred edges are changed (and back again)"""
+    dynamic_MST = DynamicMST(graph)
+    edges = list(graph.edges)[::max(1, len(graph.edges) // 100)]
+    for edge in edges:
+        graph.change_edge_weight(edge, edge.weight + MAX_WEIGHT)
+    for edge in edges:
+        graph.change_edge_weight(edge, edge.weight - MAX_WEIGHT)
+    dynamic_MST.close()
+
+
+def run_route_inspection(graph):
+    route_inspection = RouteInspection(graph)
+    route_inspection.find_route()
+
+
+def run_optimal_packing(items):
+    # A node limit rather than a time limit, so the same search is timed on every run
+    ExactBinPacking(items, ITEM_CAPACITY, time_limit=None, node_limit=OPTIMAL_NODE_LIMIT).solve()
+
+
+# Every benchmark as (name, input kinds, function carrying out the algorithm on one input, largest input size). The
+# largest size leaves out inputs the algorithm would take minutes on (e.g. the quadratic Bubble Sort on 10^5 items).
+BENCHMARKS = (
+    ("merge-sort", GRAPH_INPUTS, lambda graph: MergeSort(list(graph.edges)).edges_mergesort_ascending(), None),
+    ("prim", GRAPH_INPUTS, lambda graph: PrimsMST(graph).find_MST(first_node(graph)), None),
+    ("kruskal", GRAPH_INPUTS, lambda graph: KruskalsMST(graph).find_MST(), None),
+    ("dynamic-mst", GRAPH_INPUTS, run_dynamic_MST, None),
+    ("dijkstra", GRAPH_INPUTS,
+     lambda graph: DijkstrasShortestPath(graph).find_shortest_path(first_node(graph), last_node(graph)), None),
+    ("nearest-neighbour", GRAPH_INPUTS, lambda graph: NearestNeighbour(graph).find_path(first_node(graph)), None),
+    ("all-pairs-shortest-paths", GRAPH_INPUTS, lambda graph: AllPairsShortestPaths(graph).solve(), 300),
+    ("tsp-bounds", GRAPH_INPUTS, lambda graph: TravellingSalesman(graph).find_bounds(), 100),
+    ("route-inspection", GRAPH_INPUTS, run_route_inspection, None),
+    ("bubble-sort", ITEM_INPUTS, lambda items: BubbleSort(items).ascending(), 2000),
+    ("first-fit", ITEM_INPUTS, lambda items: BinPacking(items, ITEM_CAPACITY).first_fit(), None),
+    ("first-fit-decreasing", ITEM_INPUTS, lambda items: BinPacking(items, ITEM_CAPACITY).first_fit_decreasing(), 2000),
+    ("first-fit-decreasing-fast", ITEM_INPUTS,
+     lambda items: BinPacking(items, ITEM_CAPACITY).first_fit_decreasing(record_sort=False), None),
+    ("best-fit", ITEM_INPUTS, lambda items: BinPacking(items, ITEM_CAPACITY).best_fit(), None),
+    ("best-fit-decreasing-fast", ITEM_INPUTS,
+     lambda items: BinPacking(items, ITEM_CAPACITY).best_fit_decreasing(record_sort=False), None),
+    ("worst-fit", ITEM_INPUTS, lambda items: BinPacking(items, ITEM_CAPACITY).worst_fit(), None),
+    ("next-fit", ITEM_INPUTS, lambda items: BinPacking(items, ITEM_CAPACITY).next_fit(), None),
+    ("full-bin", ITEM_INPUTS, lambda items: BinPacking(items, ITEM_CAPACITY).full_bin(), 10000),
+    ("lower-bound", ITEM_INPUTS, lambda items: BinPacking(items, ITEM_CAPACITY).lower_bound(), None),
+    ("martello-toth-bound", ITEM_INPUTS, lambda items: BinPacking(items, ITEM_CAPACITY).martello_toth_lower_bound(),
+     None),
+    ("optimal-packing", ITEM_INPUTS, run_optimal_packing, 1000),
+)
+BENCHMARK_NAMES = tuple(name for name, input_kinds, function, max_size in BENCHMARKS)
+
+
+def clear_cached_results(argument):
+    """Removes the results kept in a graph's result cache, so every run carries out the algorithm in full rather than
+    reusing the result of the run before (e.g. the all-pairs shortest paths)"""
+    if hasattr(argument, "result_cache"):
+        argument.result_cache.clear()
+
+
+def time_function(function, argument, repeats):
+    """Carries out the function on the argument 'repeats' times, returning the time of each run in seconds"""
+    times = []
+    for repeat in range(repeats):
+        clear_cached_results(argument)
+        start = time.perf_counter()
+        function(argument)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def peak_memory(function, argument):
+    """Carries out the function once more while tracing memory allocations, returning the highest amount of memory
+    (in bytes) allocated at once during the run on top of what was already in use. This is done separately from the
+    timed runs since tracing slows the algorithms down."""
+    clear_cached_results(argument)
+    tracemalloc.start()
+    try:
+        start_memory = tracemalloc.get_traced_memory()[0]
+        function(argument)
+        return tracemalloc.get_traced_memory()[1] - start_memory
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(names=BENCHMARK_NAMES, input_kinds=GRAPH_INPUTS + ITEM_INPUTS, sizes=DEFAULT_SIZES, seed=0,
+                   repeats=3, measure_memory=True, max_edges=500000, compact=False):
+    """Generator which carries out every chosen benchmark on every chosen input kind & size, yielding a result
+    dictionary for each as it's finished. Each input is generated once and shared by all the benchmarks using it. A
+    result records the benchmark, input and its size (with the numbers of nodes & edges for graphs), the time of each
+    run with the best & median, and the peak memory - or the reason it was skipped, if the input is larger than the
+    benchmark's largest size or 'max_edges', or the algorithm can't be carried out on it."""
+    chosen = [benchmark for benchmark in BENCHMARKS if benchmark[0] in names]
+    for input_kind in input_kinds:
+        for size in sizes:
+            benchmarks = [(name, function, max_size)
+                          for name, kinds, function, max_size in chosen if input_kind in kinds]
+            if not benchmarks:
+                continue
+
+            # Generating the input for this kind & size (unless it's too large to build)
+            problem = None
+            details = {}
+            if input_kind in ITEM_INPUTS:
+                problem = generate_items(size, seed)
+            elif expected_edges(input_kind, size) <= max_edges:
+                problem = build_graph(input_kind, size, seed, compact)
+                details = {"nodes": len(problem.nodes), "edges": len(problem.edges)}
+
+            for name, function, max_size in benchmarks:
+                result = {"benchmark": name, "input": input_kind, "size": size}
+                result.update(details)
+                if problem is None:
+                    result["skipped"] = f"graph would have more than {max_edges} edges"
+                elif max_size is not None and size > max_size:
+                    result["skipped"] = f"larger than the benchmark's largest size ({max_size})"
+                elif name == "dynamic-mst" and compact:
+                    result["skipped"] = "needs an editable graph"
+                else:
+                    if input_kind in GRAPH_INPUTS:
+                        problem.index() # Rebuilding the index if an earlier benchmark edited the graph
+                    try:
+                        times = time_function(function, problem, repeats)
+                    except ValueError as error:
+                        result["skipped"] = str(error)
+                    else:
+                        result["times"] = times
+                        result["best_seconds"] = min(times)
+                        result["median_seconds"] = statistics.median(times)
+                        if measure_memory:
+                            result["peak_memory_bytes"] = peak_memory(function, problem)
+                yield result
+            problem = None # Letting go of the input before generating the next
+
+
+def compare_results(previous_results, results, threshold):
+    """Compares the median times of the results with those of a previous run (matching the benchmark, input & size),
+    returning a line for each along with the list of regressions: those which took more than 'threshold' times as
+    long as before"""
+    previous_times = {}
+    for result in previous_results:
+        if "median_seconds" in result:
+            previous_times[(result["benchmark"], result["input"], result["size"])] = result["median_seconds"]
+
+    lines = []
+    regressions = []
+    for result in results:
+        key = (result["benchmark"], result["input"], result["size"])
+        if "median_seconds" not in result or key not in previous_times:
+            continue
+        previous_time, median_time = previous_times[key], result["median_seconds"]
+        ratio = median_time / previous_time if previous_time else float('inf')
+        line = f"{key[0]:<26}{key[1]:<10}{key[2]:>8}  {previous_time:.5f}s → {median_time:.5f}s  ×{ratio:.2f}"
+        if ratio > threshold:
+            line += "  REGRESSION"
+            regressions.append(result)
+        lines.append(line)
+    return lines, regressions
+
+
+def metadata(arguments):
+    """Returns the details of the run stored alongside the results, so runs on different machines or versions of
+    Python can be told apart"""
+    return {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"), "label": arguments.label,
+            "python": platform.python_version(), "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "numpy": numpy.__version__ if numpy is not None else None,
+            "seed": arguments.seed, "repeats": arguments.repeats, "compact": arguments.compact}
+
+
+def format_result(result):
+    """Returns the line printed for a result as it's finished"""
+    name = f"{result['benchmark']:<26}{result['input']:<10}{result['size']:>8}"
+    if "skipped" in result:
+        return f"{name}  skipped: {result['skipped']}"
+    line = f"{name}  best {result['best_seconds']:.5f}s  median {result['median_seconds']:.5f}s"
+    if "peak_memory_bytes" in result:
+        line += f"  peak {result['peak_memory_bytes'] / 1024:.1f} KiB"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Times the algorithms of the Decision Mathematics Learning Aid on seeded random graphs and item "
+                    "lists, recording the results as JSON so that runs on different versions can be compared. It "
+                    "doesn't use PyQt, so it runs without a display.")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARK_NAMES, default=BENCHMARK_NAMES,
+                        help="benchmarks to run (all by default)")
+    parser.add_argument("--inputs", nargs="+", choices=GRAPH_INPUTS + ITEM_INPUTS, default=GRAPH_INPUTS + ITEM_INPUTS,
+                        help="kinds of input to generate (all by default)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES,
+                        help="numbers of nodes (graphs) or items (item lists) to generate")
+    parser.add_argument("--seed", type=int, default=0, help="seed for generating the inputs")
+    parser.add_argument("--repeats", type=int, default=3, help="number of timed runs of each benchmark")
+    parser.add_argument("--max-edges", type=int, default=500000, help="skip graphs with more edges than this")
+    parser.add_argument("--no-memory", action="store_true", help="don't measure the peak memory of each benchmark")
+    parser.add_argument("--compact", action="store_true",
+                        help="carry out the graph algorithms on compact (CSR) snapshots of the graphs")
+    parser.add_argument("--label", default="", help="label stored with the results (e.g. the version benchmarked)")
+    parser.add_argument("--output", help="JSON file to save the results in")
+    parser.add_argument("--compare", help="JSON file of previous results to compare the median times against")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="how many times slower than the previous results counts as a regression")
+    arguments = parser.parse_args(argv)
+
+    results = []
+    for result in run_benchmarks(arguments.benchmarks, arguments.inputs, arguments.sizes, arguments.seed,
+                                 arguments.repeats, not arguments.no_memory, arguments.max_edges, arguments.compact):
+        print(format_result(result), flush=True)
+        results.append(result)
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump({"metadata": metadata(arguments), "results": results}, file, ensure_ascii=False, indent=2)
+            file.write("\n")
+
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as file:
+            previous_results = json.load(file)["results"]
+        lines, regressions = compare_results(previous_results, results, arguments.threshold)
+        print()
+        print(f"Compared with {arguments.compare}:")
+        print("\n".join(lines))
+        if regressions:
+            print(f"{len(regressions)} regression(s) slower than ×{arguments.threshold}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,87 +1,169 @@
-from GraphStructure import Graph, Node, Edge, DummyLogicalEdge
+import heapq
+import math
+from collections import deque
+from operator import attrgetter, itemgetter
+
+from GraphCore import Graph, GraphNode, GraphEdge, join_labels
+
+# NumPy is optional - it's only used to speed up Floyd's algorithm on large graphs
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class MergeSort:
     """The Merge Sort is called by several algorithms at different parts since it is the most efficient way - it's
-    used for sorting edges of priority queues by their weight into ascending order. It efficiently carries out the sort
-    using recursion by:
-    - Dividing the list into two sublists and repeating this on each sublist until each item has been separated
-    - Merging two sublists into one sorted list and repeating this on sublists until whole list has been merged"""
-
-    def __init__(self, edges):
+    used for sorting edges of priority queues by their weight into ascending order. It carries out the sort from the
+    bottom up, without recursion, by:
+    - Treating each item as a sorted sublist of its own
+    - Merging neighbouring pairs of sorted sublists into sorted sublists twice as long, and repeating these passes
+    until the whole list has been merged
+
+    Rather than creating new lists for every merge, the positions of the items are merged back and forth between the
+    current order and one extra buffer of the same length. Any items can be sorted, by a key function (the weight of
+    the edges by default) in ascending or descending order. The sort is stable: items with equal keys always stay in
+    the order they were given, so every algorithm using it breaks ties in the same way. If 'record_steps' is True,
+    the list after each pass of merges is stored in 'steps' to display the working."""
+
+    def __init__(self, edges, key=None, descending=False, record_steps=False):
         self.edges = edges
+        self.key = key if key is not None else attrgetter("weight") # Sorting edges by their weight by default
+        self.descending = descending
+        self.record_steps = record_steps
+        self.steps = [] # The list after each pass of merges (if recorded)
 
     def edges_mergesort_ascending(self):
-        self.edges = self._merge_sort_ascending(self.edges)
+        self.descending = False
+        return self.sort()
+
+    def sort(self):
+        """The sorting function of the algorithm which carries out passes of merges until the whole list is sorted"""
+        items = list(self.edges)
+        keys = [self.key(item) for item in items] # Calculating each item's key only once
+        length = len(items)
+        order = list(range(length)) # Positions of the items in their current order
+        buffer = [0] * length # Where the sublists are merged into on each pass
+        self.steps = []
+
+        # Merging neighbouring sublists of 'width' items on each pass, doubling the width each time
+        width = 1
+        while width < length:
+            for low in range(0, length, 2 * width):
+                middle = min(low + width, length)
+                high = min(low + 2 * width, length)
+                self._merge(order, buffer, keys, low, middle, high)
+            order, buffer = buffer, order # The merged order becomes the current order for the next pass
+            if self.record_steps:
+                self.steps.append([items[position] for position in order])
+            width *= 2
+
+        self.edges = [items[position] for position in order]
         return self.edges
 
-    def _merge_sort_ascending(self, edges):
-        """The sorting function of the algorithm which divides the list and then merges them sorted"""
-        if len(edges) <= 1: # No need to sort if only one item
-            return edges
-        # Divide lists into two sublists
-        middle = len(edges) // 2
-        left_half = self._merge_sort_ascending(edges[:middle])
-        right_half = self._merge_sort_ascending(edges[middle:])
-        return self._merge_ascending(left_half, right_half) # Calls 'merge' method to merge them sorted
-
-    def _merge_ascending(self, left, right):
-        """Merges two sorted lists into one sorted list in ascending order"""
-        sorted_edges = []
-        sublist1_index = 0
-        sublist2_index = 0
-        # Traversing through both list, adding  the lower weighted edge to the sorted list then moving onto the next
-        while sublist1_index < len(left) and sublist2_index < len(right):
-            if left[sublist1_index].weight <= right[sublist2_index].weight:
-                sorted_edges.append(left[sublist1_index])
+    def _merge(self, order, buffer, keys, low, middle, high):
+        """Merges the two neighbouring sorted sublists order[low:middle] and order[middle:high] into one sorted
+        sublist in buffer[low:high]. On equal keys the item from the first sublist is taken, keeping the sort stable."""
+        sublist1_index = low
+        sublist2_index = middle
+        buffer_index = low
+        # Traversing through both sublists, adding the lower (or higher if descending) item then moving onto the next
+        while sublist1_index < middle and sublist2_index < high:
+            key1 = keys[order[sublist1_index]]
+            key2 = keys[order[sublist2_index]]
+            if (key1 >= key2) if self.descending else (key1 <= key2):
+                buffer[buffer_index] = order[sublist1_index]
                 sublist1_index += 1
             else:
-                sorted_edges.append(right[sublist2_index])
+                buffer[buffer_index] = order[sublist2_index]
                 sublist2_index += 1
-        # Adding remaining edges to sorted list
-        sorted_edges.extend(left[sublist1_index:])
-        sorted_edges.extend(right[sublist2_index:])
-        return sorted_edges
+            buffer_index += 1
+        # Adding remaining items of the sublists to the buffer
+        remaining = order[sublist1_index:middle] if sublist1_index < middle else order[sublist2_index:high]
+        buffer[buffer_index:high] = remaining
 
 
 class NearestNeighbour:
+    """This class is used to carry out the Nearest Neighbour algorithm on the inputted graph, which finds a path
+    visiting every node by always moving from the current node along the lowest weight edge to a node not yet visited.
+
+    In implementing the algorithm, the following components have been used:
+    - A 'sorted_edges' index, listing each node's connected edges (by the node's integer id from the graph's index)
+    sorted into ascending order of weight by the Merge Sort. It's built once for the graph the first time it's needed,
+    so running the algorithm again (e.g. from every starting node) doesn't re-sort any edges
+    - A 'visited' array of flags indexed by node id, so checking whether a node has been visited takes constant time
+
+    If the current node has no edges to unvisited nodes, the algorithm is stuck: rather than failing, the path found so
+    far is returned with 'stuck' set to True and the log explaining at which node it got stuck.
+
+    For the travelling salesman problem, the path can be closed into a tour by the edge from its last node back to the
+    starting node. The find_all_starts method carries out the algorithm from every node in turn, returning the tour of
+    lowest weight, which is the best upper bound for the travelling salesman problem the algorithm can give."""
+
     def __init__(self, input_graph):
         self.input_graph = input_graph
         self.output_path = Graph()
+        self.sorted_edges = None # Each node id's (neighbour id, weight, edge number) entries by ascending weight
+        self.stuck = False # Whether the last path found got stuck before visiting every node
+        self.tour_weight = None # Weight of the last path closed into a tour (None if it couldn't be closed)
+        self.start_results = [] # (starting node label, path, tour weight) for each start of find_all_starts
+        self.best_upper_bound = None # Lowest tour weight found by find_all_starts
+
+    def _sort_edges(self):
+        """Builds the 'sorted_edges' index of every node's connected edges in ascending order of weight (only once)"""
+        if self.sorted_edges is None:
+            self.sorted_edges = []
+            for connected_edges in self.input_graph.index().adjacency:
+                edge_sorter = MergeSort(connected_edges, key=itemgetter(1))
+                self.sorted_edges.append(edge_sorter.sort())
+        return self.sorted_edges
+
+    def find_path(self, starting_node, close_tour=False):
+        """Finds the Nearest Neighbour path from the starting node. If 'close_tour' is True and the path visits every
+        node, it's closed into a tour by adding the edge from the last node back to the starting node, and the tour's
+        weight is stored in 'tour_weight' (which is left as None if there is no such edge)."""
+        self.output_path = Graph()
+        self.stuck = False
+        self.tour_weight = None
+        sorted_edges = self._sort_edges()
+        index = self.input_graph.index()
 
-    def find_path(self, starting_node):
         self.output_path.add_node(starting_node)
-        visited_nodes = []
-        output_path_edges = []
+        visited_nodes = [starting_node] # Nodes of the path in the order they were visited
+        current_id = index.ids[starting_node.label]
+        visited = bytearray(len(index)) # Flags for whether each node id has been visited
+        visited[current_id] = 1
 
         current_node = starting_node
-        visited_nodes.append(starting_node)
-
-        while len(self.output_path.nodes) < len(self.input_graph.nodes):
-            connected_edges_queue = list(current_node.edges)
-            edge_sorter = MergeSort(connected_edges_queue)
-            connected_edges_queue = edge_sorter.edges_mergesort_ascending() # Edges connected to current node
-
+        while len(visited_nodes) < len(index):
             new_edge = None
-            # Traversing through current node's edges to add lowest weight connecting to unvisited
-            for edge in connected_edges_queue:
-                for node in edge.nodes:
-                    if node != current_node and node not in visited_nodes:
-                        new_edge = edge
-                if new_edge:
+            # Traversing through current node's edges (lowest weight first) to find the first connecting to unvisited
+            for neighbour_id, weight, edge_number in sorted_edges[current_id]:
+                if not visited[neighbour_id]:
+                    new_edge = index.edges[edge_number]
+                    current_id = neighbour_id
                     break
-            # Updating current node
-            for node in new_edge.nodes:
-                if node != current_node:
-                    new_node = node
+            # Stopping if there are no unvisited nodes connected to the current node
+            if new_edge is None:
+                self.stuck = True
+                break
 
-            # Updating output path
+            # Updating output path and current node
+            new_node = index.nodes[current_id]
             self.output_path.add_node(new_node)
             self.output_path.add_edge(new_edge)
             visited_nodes.append(new_node)
-            output_path_edges.append(new_edge)
+            visited[current_id] = 1
             current_node = new_node
 
+        # Closing the path into a tour with the edge from the last node back to the starting node (if it exists)
+        closing_edge = None
+        if close_tour and not self.stuck and len(visited_nodes) > 2:
+            closing_edge = self.input_graph.get_edge(current_node.label, starting_node.label)
+            if closing_edge is not None:
+                self.output_path.add_edge(closing_edge)
+                self.tour_weight = self.output_path.total_weight
+
         log = []
         log.append("Starting Node: " + starting_node.label)
         log.append("")
@@ -89,8 +171,16 @@ class NearestNeighbour:
         path_orderednodes_labels = []
         for node in visited_nodes:
             path_orderednodes_labels.append(node.label)
-        path_str = "──".join(path_orderednodes_labels)  # Edge labels separated by commas
-        log.append("Nearest Neighbour Path: " + path_str)
+        if closing_edge is not None:
+            path_orderednodes_labels.append(starting_node.label)
+            log.append("Nearest Neighbour Tour: " + "──".join(path_orderednodes_labels))
+        else:
+            path_str = "──".join(path_orderednodes_labels)  # Edge labels separated by commas
+            log.append("Nearest Neighbour Path: " + path_str)
+        if self.stuck:
+            log.append("Stuck at Node " + current_node.label + ": all of its connected nodes have already been visited")
+        elif close_tour and closing_edge is None:
+            log.append("No edge from Node " + current_node.label + " back to the Starting Node to close the tour")
 
         path_edges_labels = []
         for edge in self.output_path.edges:
@@ -102,6 +192,48 @@ class NearestNeighbour:
 
         return self.output_path
 
+    def find_all_starts(self):
+        """Carries out the algorithm from every node of the graph in turn, closing each path into a tour. The weight of
+        each tour is an upper bound for the travelling salesman problem, so the lowest of them is the best upper bound.
+        Returns the best tour as the output graph, whose log lists the result from every starting node, or the path
+        from the first node if no tour could be found. The best upper bound is stored in 'best_upper_bound'."""
+
+        self.start_results = []
+        self.best_upper_bound = None
+        best_path = None
+        best_start = None
+        for starting_node in self.input_graph.nodes:
+            path = self.find_path(starting_node, close_tour=True)
+            # Keeping the tour of lowest weight (the first found if there are ties)
+            if self.tour_weight is not None:
+                if self.best_upper_bound is None or self.tour_weight < self.best_upper_bound:
+                    best_path, self.best_upper_bound, best_start = path, self.tour_weight, starting_node
+            self.start_results.append((starting_node.label, path, self.tour_weight))
+
+        log = []
+        log.append("Nearest Neighbour from every Starting Node:")
+        log.append("")
+        for start_label, path, tour_weight in self.start_results:
+            path_labels = [node.label for node in path.nodes]
+            if tour_weight is not None:
+                path_labels.append(start_label)
+                log.append(start_label + ": " + "──".join(path_labels) + " = " + str(tour_weight))
+            elif len(path_labels) < len(self.input_graph.nodes):
+                log.append(start_label + ": " + "──".join(path_labels) + " (stuck at Node " + path_labels[-1] + ")")
+            else:
+                log.append(start_label + ": " + "──".join(path_labels) + " (no edge back to " + start_label + ")")
+        log.append("")
+        if best_path is None:
+            log.append("No tour found from any Starting Node")
+            best_path = self.start_results[0][1] if self.start_results else Graph()
+        else:
+            log.append("Best Upper Bound = " + str(self.best_upper_bound) + " (Starting Node: " + best_start.label + ")")
+            log.append("Total Weight: " + str(self.best_upper_bound))
+        best_path.log = log
+
+        self.output_path = best_path
+        return self.output_path
+
 
 class PrimsMST:
     """This class is used to process the inputted graph by the user and carry out Prim's algorithm, returning the
@@ -117,44 +249,51 @@ class PrimsMST:
         Repeating this process eventually constructs the MST once all nodes have been added to the graph
 
         In implementing the algorithm, the following components have been used:
-        - A 'visited_nodes' set to track the nodes already added to the tree (which is used in identifying those edges
-        that connect a node already in the tree to a node not yet in the tree)
+        - A 'visited' array of flags indexed by node id (from the graph's index) to track the nodes already added to the
+        tree (which is used in identifying those edges that connect a node already in the tree to a node not yet in the
+        tree)
         - A 'connected_edges_queue' which is a priority queue used to stores the edges that are connected to the
          visited nodes in the tree. Whenever a new node is added, the connected edges queue is updated accordingly.
-         Each time, the queue is first sorted into ascending order by weight by calling the Merge Sort."""
+         The queue is a binary heap of (weight, queue order, node id, edge number) entries, so the lowest weight edge is
+         dequeued in O(log E) rather than re-sorting the whole queue each time. The queue order breaks ties between
+         equal weights by which edge was added to the queue first - the same order a stable sort of the queue would
+         give - so the edges are selected in the same order as in the worked solutions."""
 
+        index = self.input_graph.index()
         self.MST_output.add_node(starting_node) # Adding the inputted starting node to the MST to begin
-        visited_nodes = set() # Set for tracking visited nodes
-        visited_nodes.add(starting_node)
-        connected_edges_queue = list(starting_node.edges) # Priority queue for the connected edges to tree being built
+        starting_id = index.ids[starting_node.label]
+        visited = bytearray(len(index)) # Flags for tracking visited nodes by their id
+        visited[starting_id] = 1
+        visited_count = 1
+        connected_edges_queue = [] # Priority queue (heap) for the connected edges to tree being built
+        queue_order = 0 # Counts edges added to the queue - used to break ties between equal weights
+        for neighbour_id, weight, edge_number in index.adjacency[starting_id]:
+            connected_edges_queue.append((weight, queue_order, neighbour_id, edge_number))
+            queue_order += 1
+        heapq.heapify(connected_edges_queue)
         MST_edges = [] # Stores the edges of the MST being built
 
         # Repeating the Prim's algorithm steps until all the input graph's nodes have been added to the MST
-        while len(self.MST_output.nodes) < len(self.input_graph.nodes) and connected_edges_queue:
-            # Sorting priority queue of connected edges by calling merge sort (ascending by weight)
-            edge_sorter = MergeSort(connected_edges_queue)
-            connected_edges_queue = edge_sorter.edges_mergesort_ascending()
-
-            # Dequeuing from the priority queue to retrieve lowest weight connected edge to the current tree
-            new_edge = connected_edges_queue.pop(0)
-            new_node = None
-            # Identifying the new node that the edge connects (or if it doesn't)
-            if new_edge.node1 not in visited_nodes:
-                new_node = new_edge.node1
-            elif new_edge.node2 not in visited_nodes:
-                new_node = new_edge.node2
+        while visited_count < len(index) and connected_edges_queue:
+            # Dequeuing from the priority queue to retrieve lowest weight connected edge to the current tree, along with
+            # the node it leads to from the tree
+            weight, order, new_id, edge_number = heapq.heappop(connected_edges_queue)
 
             # Adding edge to the MST if it connects a new node (to one already in the tree graph being built)
-            if new_node:
+            if not visited[new_id]:
+                new_node = index.nodes[new_id]
+                new_edge = index.edges[edge_number]
                 self.MST_output.add_node(new_node)
                 self.MST_output.add_edge(new_edge)
                 MST_edges.append(new_edge)
-                visited_nodes.add(new_node) # Adding new node to the visited nodes
+                visited[new_id] = 1 # Adding new node to the visited nodes
+                visited_count += 1
 
                 # Updating the connected edges priority queue by adding the new edges connected to the new node
-                for edge in new_node.edges:
-                    if edge.node1 not in visited_nodes or edge.node2 not in visited_nodes:
-                        connected_edges_queue.append(edge)
+                for neighbour_id, weight, edge_number in index.adjacency[new_id]:
+                    if not visited[neighbour_id]:
+                        heapq.heappush(connected_edges_queue, (weight, queue_order, neighbour_id, edge_number))
+                        queue_order += 1
 
         # Storing steps as strings in the log and assigning to outputted MST
         log = []
@@ -171,29 +310,83 @@ class PrimsMST:
         return self.MST_output
 
 
+class DisjointSet:
+    """A disjoint-set (union-find) structure which keeps track of which nodes are already connected to each other.
+    Each set of connected nodes is stored as a tree through a 'parents' dictionary, with the root of the tree
+    representing the whole set. It's used by Kruskal's algorithm to check in almost constant time whether adding
+    an edge would create a cycle (if both of its nodes are already in the same set):
+    - Path compression: once the root of a node is found, all the nodes on the way are pointed straight at the root
+    - Union by rank: the shorter tree is always attached under the root of the taller tree"""
+
+    def __init__(self, items):
+        self.parents = {} # Dictionary mapping each item to its parent in its set's tree
+        self.ranks = {} # Dictionary storing the upper bound on the height of each root's tree
+        for item in items:
+            self.parents[item] = item
+            self.ranks[item] = 0
+
+    def find(self, item):
+        """Returns the root item representing the set the item is in, compressing the path to it on the way"""
+        # Locating the root of the item's tree
+        root = item
+        while self.parents[root] != root:
+            root = self.parents[root]
+        # Pointing every item on the path directly at the root (done iteratively to avoid recursion limits)
+        while self.parents[item] != root:
+            next_item = self.parents[item]
+            self.parents[item] = root
+            item = next_item
+        return root
+
+    def union(self, item1, item2):
+        """Joins the sets of the two items together, returning False if they were already in the same set (meaning
+        connecting them would create a cycle) and True if they were joined"""
+        root1 = self.find(item1)
+        root2 = self.find(item2)
+        if root1 == root2:
+            return False
+
+        # Attaching the shorter tree under the root of the taller tree
+        if self.ranks[root1] < self.ranks[root2]:
+            root1, root2 = root2, root1
+        self.parents[root2] = root1
+        if self.ranks[root1] == self.ranks[root2]:
+            self.ranks[root1] += 1
+        return True
+
+
 class KruskalsMST:
     """This class is used to process the inputted graph by the user and carry out the Kruskal's algorithm, returning
     the output MST. The MST is constructed and returned with steps through the find_MST method. To begin, the
-    output MST is initialised with copies of the input graph's nodes so it can be used for testing when constructing
-    the MST."""
+    output MST is initialised with copies of the input graph's nodes, which the accepted edges are added between.
 
-    def __init__(self, input_graph):
+    An 'excluded_node' can be given to find the MST of the graph with that node (and its edges) deleted, as used for
+    the lower bound of the travelling salesman problem. The input graph's edges already sorted into ascending order
+    can also be passed as 'sorted_edges', so that finding many MSTs of the same graph only sorts its edges once."""
+
+    def __init__(self, input_graph, excluded_node=None, sorted_edges=None):
         self.input_graph = input_graph
         self.MST_output = Graph()
+        self.excluded_node = excluded_node
+        self.sorted_edges = sorted_edges
 
         # Taking copies of inputted graph's nodes to test tentatively on the output MST
-        self.copied_nodes = {} # Dictionary to map input graph nodes to cloned nodes
-        for node in self.input_graph.nodes:
-            node_copy = Node(node.label, node.scenePos().x(), node.scenePos().y())
+        self.index = self.input_graph.index()
+        self.copied_nodes = [] # List of the cloned nodes by the input graph nodes' ids (None for the excluded node)
+        for node in self.index.nodes:
+            if node is excluded_node:
+                self.copied_nodes.append(None)
+                continue
+            node_copy = GraphNode(node.label, node.x, node.y)
             self.MST_output.add_node(node_copy)
-            self.copied_nodes[node] = node_copy
+            self.copied_nodes.append(node_copy)
 
     def find_MST(self):
         """The MST is constructed by:
         - Sorting the edges by weight into ascending order within a priority queue (by calling the merge sort)
-        - Traversing through the priority queue and adding edges tentatively to the output MST to check if they create
-        a cycle - adding it to the MST if they don't, discarding the edge if it does. The testing for cycles utilises
-        a depth-first-search which involves recursion
+        - Traversing through the priority queue and checking if adding each edge to the output MST would create a
+        cycle - adding it to the MST if it doesn't, discarding the edge if it does. The testing for cycles uses a
+        disjoint-set of the MST's connected nodes: an edge creates a cycle if its nodes are already connected
 
         The output MST is returned and the logs of the steps followed are stored to display to the user including steps:
         - The edge sorting into ascending order
@@ -202,9 +395,15 @@ class KruskalsMST:
 
         log = [] # Stores required steps followed in log to display to user
 
-        # Sorting edges into ascending order
-        edge_sorter = MergeSort(self.input_graph.edges)
-        sorted_edges_queue = edge_sorter.edges_mergesort_ascending() # Priority queue for edges by ascending weight
+        # Sorting edges into ascending order (unless they have been given already sorted)
+        if self.sorted_edges is None:
+            edge_sorter = MergeSort(list(self.input_graph.edges))
+            self.sorted_edges = edge_sorter.edges_mergesort_ascending()
+        sorted_edges_queue = self.sorted_edges # Priority queue for edges by ascending weight
+        # Leaving out the edges of the excluded node
+        if self.excluded_node is not None:
+            sorted_edges_queue = [edge for edge in sorted_edges_queue
+                                  if edge.node1 is not self.excluded_node and edge.node2 is not self.excluded_node]
         # Storing line for edge sorting as a string in the log
         sorted_edges_labels = []
         for edge in sorted_edges_queue:
@@ -214,21 +413,20 @@ class KruskalsMST:
         log.append("")
 
         # Traversing through edges priority queue and testing if adding the edge creates a cycle
-        while len(self.MST_output.edges) < (len(self.MST_output.nodes) - 1) and sorted_edges_queue:
-            smallest_edge = sorted_edges_queue.pop(0)
-            edge_node1 = self.copied_nodes[smallest_edge.node1]
-            edge_node2 = self.copied_nodes[smallest_edge.node2]
-            # Creating a dummy logical edge to tentatively add to the MST output
-            test_edge = DummyLogicalEdge(smallest_edge.weight, edge_node1, edge_node2)
-            self.MST_output.edges.append(test_edge)
-            # Checking if adding the edge created a cycle and accordingly adding it to the MST or discarding it
-            if self._check_cycles(self.MST_output) == True:
-                self.MST_output.edges.remove(test_edge)
+        node_ids = self.index.ids
+        connected_nodes = DisjointSet(range(len(self.index))) # Tracks which node ids the MST so far already connects
+        queue_position = 0
+        while len(self.MST_output.edges) < (len(self.MST_output.nodes) - 1) and queue_position < len(sorted_edges_queue):
+            smallest_edge = sorted_edges_queue[queue_position]
+            queue_position += 1
+            node1_id = node_ids[smallest_edge.node1.label]
+            node2_id = node_ids[smallest_edge.node2.label]
+            # Checking if adding the edge would create a cycle and accordingly adding it to the MST or discarding it
+            if not connected_nodes.union(node1_id, node2_id):
                 log.append("Reject " + smallest_edge.edge_label) # Storing edge rejection step to log
             else:
-                self.MST_output.edges.remove(test_edge)
                 log.append("Accept " + smallest_edge.edge_label) # Storing edge acceptance step to log
-                real_edge = Edge(smallest_edge.weight, edge_node1, edge_node2, None)
+                real_edge = GraphEdge(smallest_edge.weight, self.copied_nodes[node1_id], self.copied_nodes[node2_id])
                 self.MST_output.add_edge(real_edge)
         log.append("")
 
@@ -243,52 +441,212 @@ class KruskalsMST:
 
         return self.MST_output
 
-    def _check_cycles(self, graph):
-        """Private method used in the class to check if adding an edge has created a cycle. A depth-first-search is
-        used to carry this out, which recursively calls itself to traverse through the graph's nodes - if the
-        depth-first-search returns to a visited node that's not the parent, it means there is a cycle. The method
-        returns True if a cycle has been found and False if there is no cycle."""
 
-        visited = set() # Stores visited nodes during the cycles check
+class DynamicMST:
+    """This class keeps the minimum spanning tree of the inputted graph up to date as the graph is edited, rather than
+    carrying out Prim's or Kruskal's algorithm again from scratch after every change. If the graph isn't connected, a
+    minimum spanning tree of each of its connected parts (a minimum spanning forest) is kept instead.
+
+    It registers itself as a change listener of the graph, and updates the tree after each edit:
+    - Adding an edge: if its nodes aren't yet connected by the tree, the edge joins the tree. Otherwise the edge and
+    the path between its nodes in the tree form a cycle, and if the edge is lighter than the heaviest edge on the path,
+    it replaces that edge in the tree
+    - Deleting a tree edge: the tree is split into two parts, and the lightest edge of the graph reconnecting them (if
+    any) joins the tree
+    - Changing the weight of an edge: a tree edge is treated as being deleted and added back, and any other edge as
+    being added again
+    - Adding a node: the new node is a tree of its own
+    After a batch edit, the tree is rebuilt with Kruskal's algorithm instead. This includes deleting a node, as the
+    graph deletes the node and all of its edges as a single batch edit.
+
+    The tree is stored both as a nested dictionary of its edges (in the same way as the graph's adjacency) and as a
+    'parents' dictionary giving each node's parent towards the root of its tree. The path between two nodes is then
+    found by only following their parents up to where they meet, and removing an edge just detaches the lower node
+    from its parent. When two trees are joined, the smaller one is re-rooted at the new edge and hung from the other -
+    the smaller tree is found by exploring both trees at the same time and stopping once either has been explored
+    fully, so only the part of the forest affected by an edit is visited rather than the whole graph."""
 
-        def depth_first_search(node, parent):
-            visited.add(node) # Add current node to visited
-
-            # Traversing through the neighbouring nodes connected to the current node
-            for edge in graph.edges:
-
-                # Locating neighbour node objects
-                if edge.node1 is node:
-                    neighbour = edge.node2
-                elif edge.node2 is node:
-                    neighbour = edge.node1
-                else:
-                    continue
+    def __init__(self, input_graph):
+        self.input_graph = input_graph
+        self.tree_adjacency = {} # Dictionary mapping node labels to dictionaries of tree neighbour labels to edges
+        self.parents = {} # Dictionary mapping node labels to their parent's label in the tree (None for the root)
+        self.tree_edges = {} # Dictionary mapping the tree's edge objects to their weight when they joined the tree
+        self.total_weight = 0 # Total weight of the tree's edges
+        self.rebuild()
+        self.input_graph.add_change_listener(self._graph_changed)
+
+    def close(self):
+        """Stops keeping the tree up to date with the graph"""
+        self.input_graph.remove_change_listener(self._graph_changed)
+
+    def rebuild(self):
+        """Builds the tree from scratch with Kruskal's algorithm: accepting the edges in ascending order of weight
+        unless their nodes are already connected"""
+        self.tree_adjacency = {label: {} for label in self.input_graph.node_index}
+        self.parents = dict.fromkeys(self.input_graph.node_index)
+        self.tree_edges = {}
+        self.total_weight = 0
+        connected_nodes = DisjointSet(self.input_graph.node_index)
+        for edge in MergeSort(list(self.input_graph.edges)).edges_mergesort_ascending():
+            if connected_nodes.union(edge.node1.label, edge.node2.label):
+                self._add_tree_edge(edge)
+
+        # Rooting each tree at its first node, pointing every other node at its parent
+        rooted = set()
+        for root_label in self.tree_adjacency:
+            if root_label not in rooted:
+                rooted.update(self._hang_from(root_label, None))
+
+    def MST_graph(self):
+        """Returns the current tree as a graph (with copies of the input graph's nodes and edges) with a log of its
+        edges and total weight, in the same form as the MSTs returned by Prim's and Kruskal's algorithms"""
+        MST_output = Graph()
+        copied_nodes = {} # Dictionary mapping node labels to the copied nodes
+        for node in self.input_graph.nodes:
+            copied_nodes[node.label] = GraphNode(node.label, node.x, node.y)
+            MST_output.add_node(copied_nodes[node.label])
+        for edge in self.tree_edges:
+            MST_output.add_edge(GraphEdge(edge.weight, copied_nodes[edge.node1.label], copied_nodes[edge.node2.label]))
 
-                # Testing recursively for cycles
-                if neighbour not in visited:
-                    # Recursively call depth-first-search again to now test the neighbouring node
-                    if depth_first_search(neighbour, node):
-                        return True  # A cycle was found in the series of recursive calls
-                elif neighbour != parent:
-                    return True  # If neighbour is already visited but not the parent - means there's a cycle
+        log = []
+        log.append("MST Edges: " + ", ".join(edge.edge_label for edge in MST_output.edges))
+        log.append("Total MST Weight: " + str(MST_output.total_weight))
+        MST_output.log = log
+        return MST_output
+
+    def _graph_changed(self, change, item):
+        """Change listener called by the graph after each edit, updating the tree accordingly"""
+        if change == "add_node":
+            self.tree_adjacency[item.label] = {}
+            self.parents[item.label] = None
+        elif change == "add_edge":
+            self._edge_added(item)
+        elif change in ("delete_edge", "change_weight") and item in self.tree_edges:
+            # Removing the edge from the tree, then reconnecting the two parts with the lightest edge between them
+            # (which is the same edge again if its weight has only changed and it's still the lightest)
+            self._cut(item)
+            self._reconnect(item.node1.label, item.node2.label)
+        elif change == "change_weight":
+            self._edge_added(item)
+        elif change == "batch":
+            self.rebuild()
+
+    def _edge_added(self, edge):
+        """Updates the tree for an edge added to the graph (or a non-tree edge whose weight has changed)"""
+        path_edges = self._tree_path(edge.node1.label, edge.node2.label)
+        if path_edges is None:
+            self._link(edge) # The edge connects two separate trees
+            return
+
+        # Replacing the heaviest edge of the cycle formed if the new edge is lighter
+        heaviest_edge = None
+        for path_edge in path_edges:
+            if heaviest_edge is None or path_edge.weight > heaviest_edge.weight:
+                heaviest_edge = path_edge
+        if heaviest_edge is not None and edge.weight < heaviest_edge.weight:
+            self._cut(heaviest_edge)
+            self._link(edge)
+
+    def _tree_path(self, start_label, end_label):
+        """Returns the list of tree edges on the path between two nodes, or None if the tree doesn't connect them. The
+        path is found by following the start node's parents to its root, then the end node's parents until they reach
+        one of the start node's ancestors."""
+        start_ancestors = [start_label]
+        while self.parents[start_ancestors[-1]] is not None:
+            start_ancestors.append(self.parents[start_ancestors[-1]])
+        ancestor_positions = {label: position for position, label in enumerate(start_ancestors)}
+
+        end_ancestors = [end_label]
+        while end_ancestors[-1] not in ancestor_positions:
+            parent = self.parents[end_ancestors[-1]]
+            if parent is None:
+                return None # Different roots, so the nodes are in separate trees
+            end_ancestors.append(parent)
+
+        # Joining the two halves of the path where they meet
+        path_labels = start_ancestors[:ancestor_positions[end_ancestors[-1]] + 1] + end_ancestors[-2::-1]
+        return [self.tree_adjacency[label1][label2] for label1, label2 in zip(path_labels, path_labels[1:])]
+
+    def _reconnect(self, label1, label2):
+        """After a tree edge between the two nodes has been removed, finds the smaller of the two parts of the tree and
+        adds the lightest edge of the graph from it to the other part (if there is one)"""
+        smaller_part = self._smaller_part(label1, label2)
+
+        lightest_weight = None
+        lightest_labels = None
+        for label in smaller_part:
+            for other_label, weight in self.input_graph.adjacency[label].items():
+                if other_label not in smaller_part and (lightest_weight is None or weight < lightest_weight):
+                    lightest_weight = weight
+                    lightest_labels = (label, other_label)
+        if lightest_labels is not None:
+            self._link(self.input_graph.get_edge(*lightest_labels), smaller_part)
+
+    def _smaller_part(self, label1, label2):
+        """Explores the trees of the two (unconnected) nodes one node at a time each, returning the set of nodes of
+        whichever tree is fully explored first (so only about twice the size of the smaller tree is explored)"""
+        parts = ({label1}, {label2})
+        queues = (deque([label1]), deque([label2]))
+        while True:
+            for part, queue in zip(parts, queues):
+                if not queue:
+                    return part
+                label = queue.popleft()
+                for neighbour_label in self.tree_adjacency[label]:
+                    if neighbour_label not in part:
+                        part.add(neighbour_label)
+                        queue.append(neighbour_label)
+
+    def _link(self, edge, smaller_part=None):
+        """Adds an edge joining two separate trees to the tree, re-rooting the smaller of the two trees at its node of
+        the edge and hanging it from the other node"""
+        label1, label2 = edge.node1.label, edge.node2.label
+        if smaller_part is None:
+            smaller_part = self._smaller_part(label1, label2)
+        if label2 in smaller_part:
+            label1, label2 = label2, label1
+        self._hang_from(label1, label2)
+        self._add_tree_edge(edge)
+
+    def _hang_from(self, root_label, parent_label):
+        """Re-roots the tree containing the root node at that node, and sets its parent to the given node. Returns the
+        list of nodes in the tree."""
+        self.parents[root_label] = parent_label
+        tree_labels = [root_label]
+        for label in tree_labels:
+            for neighbour_label in self.tree_adjacency[label]:
+                if neighbour_label != self.parents[label]:
+                    self.parents[neighbour_label] = label
+                    tree_labels.append(neighbour_label)
+        return tree_labels
+
+    def _cut(self, edge):
+        """Removes an edge from the tree, detaching whichever of its nodes is the child of the other from its parent"""
+        label1, label2 = edge.node1.label, edge.node2.label
+        del self.tree_adjacency[label1][label2]
+        del self.tree_adjacency[label2][label1]
+        if self.parents[label1] == label2:
+            self.parents[label1] = None
+        else:
+            self.parents[label2] = None
+        self.total_weight -= self.tree_edges.pop(edge) # Its weight when it joined (in case it has since changed)
 
-            return False  # For no cycle found
-
-        # Testing each part of the graph sequentially
-        for node in graph.nodes:
-            if node not in visited:
-                # Testing for cycle on this part of the graph recursively through the depth-first-search
-                if depth_first_search(node, None):
-                    return True
-        return False
+    def _add_tree_edge(self, edge):
+        self.tree_adjacency[edge.node1.label][edge.node2.label] = edge
+        self.tree_adjacency[edge.node2.label][edge.node1.label] = edge
+        self.tree_edges[edge] = edge.weight
+        self.total_weight += edge.weight
 
 
 class DijkstrasShortestPath:
     """This class is used to process the inputted graph by the user and carry out Dijkstra's algorithm, returning the
     shortest path between the inputted start and end node. The path is calculated and returned with steps through
     the find_shortest_path method. Dictionaries are initialised with node labels as keys for storing the Dijkstra's
-    tables to display in working log."""
+    tables to display in working log.
+
+    A single run from the start node can also be kept and reused: find_shortest_path_tree returns the final values and
+    predecessors of every node (the shortest path tree), and path_to then traces the path to any end node from it
+    without carrying out the algorithm again."""
 
     def __init__(self, input_graph):
         self.input_graph = input_graph
@@ -296,12 +654,19 @@ class DijkstrasShortestPath:
         self.predecessors = {} # Dictionary to track preceding nodes in the shortest path
         self.visited_order = [] # Tracking order of nodes visited
         self.shortest_path = [] # Storing final shortest path solution
+        self.total_weight = float('inf') # Storing total weight of the final shortest path solution
 
         # Dictionaries with node labels as keys for the Dijkstra's tables (to display in working log)
         self.labelling_orders = {}
         self.working_values_lists = {}
         self.current_working_values = {}
         self.final_labels = {}
+        self._reset_tables()
+
+    def _reset_tables(self):
+        """Initialises the Dijkstra's tables for every node of the graph, so the same object can be reused for
+        another run"""
+        self.visited_order = []
         for node in self.input_graph.nodes:
             self.current_working_values[node.label] = float('inf') # Storing distances as infinity initially
             self.labelling_orders[node.label] = None
@@ -309,72 +674,684 @@ class DijkstrasShortestPath:
             self.predecessors[node.label] = None
             self.working_values_lists[node.label] = []
 
-    def find_shortest_path(self, start_node, end_node):
+    def find_shortest_path(self, start_node, end_node, stop_at_end=False):
         """Finds the shortest path between the start and end node using Dijkstra's algorithm. The algorithm involves:
         - Updating working values of all neighbouring nodes to the node last given its final value (starting from the
         start node)
         - A working value is only replaced if the tentative value is lower than the current working value
         - A node's final value is given when it has the lowest working value from all the nodes without final values
         - Once all nodes are visited, final values are used to calculate the shortest path by tracing back from end to
-        start node (via the predecessors dictionary)"""
+        start node (via the predecessors dictionary)
 
-        # Initialising values for starting node
-        self.current_working_values[start_node.label] = 0
-        self.working_values_lists[start_node.label].append(0)
-        self.labelling_orders[start_node.label] = 1
+        If 'stop_at_end' is True, the algorithm stops as soon as the end node has been given its final value - the
+        nodes which haven't been labelled by then are left without a labelling order or final value."""
 
-        # Creating a set for unvisited nodes
-        unvisited = set()
-        for node in self.input_graph.nodes:
-            unvisited.add(node.label)
-        label_order = 2
-
-        # Iterating the algorithm's steps until all the nodes have been visited
-        while unvisited:
-            # Finding the unvisited node with the smallest current working distance from the start node
-            lowest_value = float('inf')
-            current_label = None
-            for label in unvisited:
-                if self.current_working_values[label] < lowest_value:
-                    lowest_value = self.current_working_values[label]
-                    current_label = label
-            if self.current_working_values[current_label] == float('inf'):
-                break
+        self._label_nodes(start_node, end_node if stop_at_end else None)
+        self.shortest_path, self.total_weight = self.path_to(end_node)
+
+        return self.shortest_path, self.total_weight, self.labelling_orders, self.final_labels, self.working_values_lists
+
+    def solution_log(self):
+        """Returns the lines of the working log for the last shortest path found: the shortest path and its total
+        weight ('no path' with infinity weight if it doesn't exist)"""
+        log = []
+        if self.shortest_path:
+            shortest_path_str = join_labels(self.shortest_path)
+        else:
+            shortest_path_str = "No Path"
+        log.append("Shortest Path: " + shortest_path_str)
+
+        if self.total_weight == float('inf'):
+            log.append("Total Weight: ∞")
+        else:
+            log.append("Total Weight: " + str(self.total_weight))
+
+        return log
+
+    def table_data(self):
+        """Returns the rows of the Dijkstra's working table for the last run - a (label, labelling order, final value,
+        working values) row for each node, in order of label"""
+        table_data = []
+
+        # Storing labelling order, final label, and working values list for each node
+        for label in sorted(self.labelling_orders.keys()):
+            # Adding labelling orders
+            if self.labelling_orders[label] is not None:
+                order = self.labelling_orders[label]
+            else:
+                order = "-"
+            # Adding final labels
+            if self.final_labels[label] is None:
+                final_value = "-"
+            elif self.final_labels[label] == float('inf'):
+                final_value = "∞"
+            else:
+                final_value = self.final_labels[label]
+            # Adding working values seperated by commas
+            working_values_string = ", ".join(str(value) for value in self.working_values_lists[label])
+
+            # Add rows to the table for each node
+            table_data.append((label, order, final_value, working_values_string))
+
+        return table_data
+
+    def find_shortest_path_tree(self, start_node):
+        """Carries out Dijkstra's algorithm from the start node over the whole graph, returning the final values
+        (shortest distances) and predecessors of every node. Any number of end nodes can then be looked up through
+        path_to from this one run."""
+
+        self._label_nodes(start_node, None)
+
+        return self.final_labels, self.predecessors
+
+    def path_to(self, end_node):
+        """Returns the shortest path (as a list of labels) and its total weight to the end node, by tracing back from
+        the end node to the start node of the last run via the predecessors dictionary"""
+
+        # Error handling for if the start node and end node have no path
+        if self.final_labels[end_node.label] is None or self.final_labels[end_node.label] == float('inf'):
+            return [], float('inf')
+
+        # Recording the shortest path based on the filled final values (tracing back from end to start via predecessors)
+        path = []
+        current = end_node.label
+        while current is not None:
+            path.append(current)
+            current = self.predecessors[current]
+
+        return path[::-1], self.final_labels[end_node.label]
+
+    def _label_nodes(self, start_node, stop_node):
+        """Carries out the labelling steps of Dijkstra's algorithm from the start node. The nodes are worked with by
+        their integer ids from the graph's index, storing the working values, final values and predecessors in lists
+        indexed by id, which are only converted into the dictionaries by label at the end. The unvisited node with the
+        lowest working value is found through a binary heap of (working value, node label, node id) entries rather than
+        checking every unvisited node, and only the edges actually connected to each node are used to update working
+        values. Entries in the heap which have since been replaced by a lower working value are skipped when they are
+        dequeued. Ties between equal working values are broken by the alphabetical order of the nodes' labels, so the
+        labelling order is the one normally used when carrying out the algorithm by hand (and doesn't depend on the
+        order the nodes were added to the graph). The steps stop early once the stop node (if given) has received its
+        final value."""
+
+        index = self.input_graph.index()
+        adjacency = index.adjacency
+        node_count = len(index)
+        start_id = index.ids[start_node.label]
+        stop_id = index.ids[stop_node.label] if stop_node else None
+
+        working_values = [float('inf')] * node_count # Current working value of each node (infinity initially)
+        working_values_lists = [[] for node_id in range(node_count)] # Every working value given to each node
+        final_values = [None] * node_count
+        labelling_orders = [None] * node_count
+        predecessor_ids = [None] * node_count # Tracking preceding nodes in the shortest path
+        visited = bytearray(node_count) # Flags for the nodes which have been given their final value
+        visited_ids = [] # Tracking order of nodes visited
+
+        # Initialising values for starting node
+        working_values[start_id] = 0
+        working_values_lists[start_id].append(0)
+        label_order = 1
+        labels = index.labels
+        unvisited_queue = [(0, labels[start_id], start_id)] # Heap of nodes' working values (tied ones by label)
+
+        # Iterating the algorithm's steps until all the reachable nodes have been visited
+        while unvisited_queue:
+            # Dequeuing the unvisited node with the smallest current working distance from the start node
+            lowest_value, current_label, current_id = heapq.heappop(unvisited_queue)
+            if visited[current_id] or lowest_value > working_values[current_id]:
+                continue # Skipping outdated entries
             # Updating the values of the node found and marking it as visited
-            unvisited.remove(current_label)
-            self.visited_order.append(current_label)
-            if self.labelling_orders[current_label] is None:
-                self.labelling_orders[current_label] = label_order
-                label_order += 1
+            visited[current_id] = 1
+            visited_ids.append(current_id)
+            labelling_orders[current_id] = label_order
+            final_values[current_id] = lowest_value
+            label_order += 1
+            if current_id == stop_id:
+                break
 
             # Updating neighbouring nodes and their working values according to the new node marked
-            for neighbor_label, weight in self.input_graph.distance_matrix[current_label].items():
-                if weight > 0 and neighbor_label in unvisited:
-                    tentative = self.current_working_values[current_label] + weight # Calculating new tentative value
+            for neighbour_id, weight, edge_number in adjacency[current_id]:
+                if not visited[neighbour_id]:
+                    tentative = lowest_value + weight # Calculating new tentative value
 
                     # Replacing a neighbour's working value if tentative is lower than the current and updating logs
-                    if tentative < self.current_working_values[neighbor_label]:
-                        self.current_working_values[neighbor_label] = tentative
-                        self.working_values_lists[neighbor_label].append(tentative)
-                        self.predecessors[neighbor_label] = current_label # Tracking predecessor path
+                    if tentative < working_values[neighbour_id]:
+                        working_values[neighbour_id] = tentative
+                        working_values_lists[neighbour_id].append(tentative)
+                        predecessor_ids[neighbour_id] = current_id # Tracking predecessor path
+                        heapq.heappush(unvisited_queue, (tentative, labels[neighbour_id], neighbour_id))
+
+        # Nodes which can't be reached from the start node have a final value of infinity (unless stopped early)
+        if stop_node is None:
+            final_values = [float('inf') if value is None else value for value in final_values]
+
+        # Keeping the results by id, then converting them into the dictionaries by label for the working tables
+        self.final_values = final_values
+        self.predecessor_ids = predecessor_ids
+        self.visited_ids = visited_ids
+        self.visited_order = [labels[node_id] for node_id in visited_ids]
+        self.current_working_values = dict(zip(labels, working_values))
+        self.working_values_lists = dict(zip(labels, working_values_lists))
+        self.final_labels = dict(zip(labels, final_values))
+        self.labelling_orders = dict(zip(labels, labelling_orders))
+        self.predecessors = dict(zip(labels, [None if node_id is None else labels[node_id]
+                                              for node_id in predecessor_ids]))
+
+
+class AllPairsShortestPaths:
+    """This class is used to find the shortest distances between every pair of nodes of the inputted graph at once,
+    rather than carrying out Dijkstra's algorithm separately for each start & end node. The results are stored as:
+    - A distance matrix, where distances[i][j] is the shortest distance from the i-th to the j-th node in 'labels'
+    (infinity if there's no path)
+    - A next-hop (route) matrix, where next_hops[i][j] is the position of the node to travel to next from the i-th node
+    along the shortest path to the j-th node (None if there's no path), so any shortest path can be traced
+
+    Two methods are available:
+    - Floyd's (Floyd-Warshall) algorithm, which improves the distance & route tables by allowing each node in turn to
+    be passed through. Each iteration is carried out on the whole table at once with NumPy if it's installed (falling
+    back to plain Python otherwise), and the tables after each iteration can be recorded to display the working
+    - Dijkstra's algorithm carried out once from every node, which is quicker for large sparse graphs
+
+    As the results don't change until the graph is edited, they are kept in the graph's result cache - so asking for
+    them again (e.g. from the travelling salesman bounds) doesn't carry out the algorithm again."""
 
+    def __init__(self, input_graph):
+        self.input_graph = input_graph
+        self.labels = [] # Node labels in the order of the rows & columns of the matrices
+        self.positions = {} # Dictionary mapping node labels to their row & column in the matrices
+        self.distances = [] # Shortest distance matrix (as a list of rows)
+        self.next_hops = [] # Next-hop (route) matrix (as a list of rows)
+        self.tables = None # (distance table, route table) initially and after each iteration of Floyd's algorithm
+        self.method = None # Method used to find the results
+
+    def choose_method(self):
+        """Chooses the quicker method for the graph: Floyd's algorithm takes about V³ steps, while Dijkstra's algorithm
+        from every node takes about V·(V + E)·log V steps - so it's only chosen for large sparse graphs. Each step of
+        Floyd's algorithm is simpler (about twice as quick in Python, and about 15 times as quick when carried out by
+        NumPy's compiled loops), which is allowed for when comparing them."""
+        node_count = len(self.input_graph.nodes)
+        edge_count = len(self.input_graph.edges)
+        floyd_steps = node_count ** 3 / (15 if numpy is not None else 2)
+        dijkstra_steps = node_count * (node_count + edge_count) * max(1, math.log2(max(node_count, 1)))
+        return "floyd-warshall" if floyd_steps <= dijkstra_steps else "dijkstra"
+
+    def solve(self, method=None, record_tables=False):
+        """Finds the shortest distances & routes between every pair of nodes with the given method ('floyd-warshall'
+        or 'dijkstra', chosen by choose_method if None), reusing the graph's cached results if they exist. If
+        'record_tables' is True, Floyd's algorithm is used and its tables after each iteration are recorded."""
+        if record_tables:
+            method = "floyd-warshall"
+        elif method is None:
+            method = self.choose_method()
+        if method not in ("floyd-warshall", "dijkstra"):
+            raise ValueError(f"Unknown shortest paths method '{method}'.")
+
+        # Reusing the cached results for this version of the graph (as long as they have the tables if they're needed)
+        cache_key = ("all_pairs_shortest_paths", (method,), self.input_graph.version)
+        cached_results = self.input_graph.result_cache.get(cache_key)
+        if cached_results is not None and (cached_results[3] is not None or not record_tables):
+            self.labels, self.distances, self.next_hops, self.tables = cached_results
+        else:
+            if method == "floyd-warshall":
+                self._floyd_warshall(record_tables)
+            else:
+                self._repeated_dijkstra()
+            self.input_graph.result_cache.put(cache_key, (self.labels, self.distances, self.next_hops, self.tables))
+
+        self.method = method
+        self.positions = {label: position for position, label in enumerate(self.labels)}
+        return self.distances, self.next_hops
+
+    def distance(self, label1, label2):
+        """Returns the shortest distance between the two nodes with the given labels (infinity if there's no path)"""
+        return self.distances[self.positions[label1]][self.positions[label2]]
+
+    def route(self, label1, label2):
+        """Returns the shortest path between the two nodes with the given labels as a list of labels (empty if there's
+        no path), by following the next-hop matrix from the first node to the second"""
+        position = self.positions[label1]
+        end_position = self.positions[label2]
+        if self.next_hops[position][end_position] is None:
+            return []
+        route = [self.labels[position]]
+        while position != end_position:
+            position = self.next_hops[position][end_position]
+            route.append(self.labels[position])
+        return route
+
+    def _initial_tables(self):
+        """Returns the initial distance & route tables of Floyd's algorithm: the weights of the direct edges (infinity
+        where there's no edge) and the node at the end of each direct edge"""
+        self.labels = [node.label for node in self.input_graph.nodes]
+        positions = {label: position for position, label in enumerate(self.labels)}
+        node_count = len(self.labels)
+        distances = [[float('inf')] * node_count for row in range(node_count)]
+        next_hops = [[None] * node_count for row in range(node_count)]
+        for position in range(node_count):
+            distances[position][position] = 0
+            next_hops[position][position] = position
+        for edge in self.input_graph.edges:
+            position1 = positions[edge.node1.label]
+            position2 = positions[edge.node2.label]
+            distances[position1][position2] = distances[position2][position1] = edge.weight
+            next_hops[position1][position2] = position2
+            next_hops[position2][position1] = position1
+        return distances, next_hops
+
+    def _floyd_warshall(self, record_tables):
+        """Carries out Floyd's algorithm: on the k-th iteration, every distance is replaced by the distance via the
+        k-th node if that is shorter, in which case the route goes towards the k-th node first. The k-th row & column
+        don't change during the k-th iteration, so the whole table can be updated at once."""
+        distances, next_hops = self._initial_tables()
+        node_count = len(self.labels)
+        self.tables = [(self._copy_table(distances), self._copy_table(next_hops))] if record_tables else None
+
+        if numpy is not None and node_count > 0:
+            distance_array = numpy.array(distances, dtype=float)
+            next_hop_array = numpy.array([[-1 if hop is None else hop for hop in row] for row in next_hops],
+                                         dtype=numpy.int64)
+            for k in range(node_count):
+                # Distances via the k-th node for every pair at once, replacing those which are shorter
+                via_k = distance_array[:, k, None] + distance_array[None, k, :]
+                shorter = via_k < distance_array
+                distance_array = numpy.where(shorter, via_k, distance_array)
+                next_hop_array = numpy.where(shorter, next_hop_array[:, k, None], next_hop_array)
+                if record_tables:
+                    self.tables.append(self._tables_from_arrays(distance_array, next_hop_array))
+            distances, next_hops = self._tables_from_arrays(distance_array, next_hop_array)
+        else:
+            for k in range(node_count):
+                row_k = distances[k]
+                for i in range(node_count):
+                    distance_to_k = distances[i][k]
+                    if distance_to_k == float('inf'):
+                        continue # No routes via the k-th node from the i-th node
+                    row_i = distances[i]
+                    next_hops_i = next_hops[i]
+                    hop_to_k = next_hops_i[k]
+                    for j in range(node_count):
+                        via_k = distance_to_k + row_k[j]
+                        if via_k < row_i[j]:
+                            row_i[j] = via_k
+                            next_hops_i[j] = hop_to_k
+                if record_tables:
+                    self.tables.append((self._copy_table(distances), self._copy_table(next_hops)))
+
+        self.distances = distances
+        self.next_hops = next_hops
+
+    def _repeated_dijkstra(self):
+        """Carries out Dijkstra's algorithm once from every node, filling in the node's row of the distance matrix
+        from the final values, and its row of the next-hop matrix by tracing the first node of each path from the
+        predecessors (in labelling order, so a node's predecessor is always traced before the node itself). The
+        results are read from the lists by node id, whose ids match the positions of the rows and columns."""
+        self.labels = [node.label for node in self.input_graph.nodes]
+        dijkstra = DijkstrasShortestPath(self.input_graph)
+        self.distances = []
+        self.next_hops = []
+        self.tables = None
+        for start_id, start_node in enumerate(self.input_graph.nodes):
+            dijkstra.find_shortest_path_tree(start_node)
+            predecessor_ids = dijkstra.predecessor_ids
+            first_hops = [None] * len(self.labels) # First node on the path to each reached node
+            for node_id in dijkstra.visited_ids:
+                predecessor_id = predecessor_ids[node_id]
+                if predecessor_id is None or predecessor_id == start_id:
+                    first_hops[node_id] = node_id
+                else:
+                    first_hops[node_id] = first_hops[predecessor_id]
+            self.distances.append(dijkstra.final_values)
+            self.next_hops.append(first_hops)
+
+    def _tables_from_arrays(self, distance_array, next_hop_array):
+        """Converts NumPy distance & next-hop arrays back into tables of Python numbers (with whole number distances
+        as integers and missing next hops as None)"""
+        distances = [[value if value == float('inf') else int(value) if value.is_integer() else value
+                      for value in row] for row in distance_array.tolist()]
+        next_hops = [[None if hop < 0 else hop for hop in row] for row in next_hop_array.tolist()]
+        return distances, next_hops
+
+    def _copy_table(self, table):
+        return [list(row) for row in table]
+
+    def table_log(self):
+        """Returns the lines of the working log for Floyd's algorithm: the distance & route tables initially and after
+        each iteration, with the route table giving the label of the next node to travel to. The tables must have been
+        recorded by solve(record_tables=True)."""
+        if self.tables is None:
+            raise ValueError("The tables of Floyd's algorithm have not been recorded.")
+        log = []
+        for iteration, (distances, next_hops) in enumerate(self.tables):
+            if iteration == 0:
+                title = "Initial Tables"
+            else:
+                title = "Iteration " + str(iteration) + " (via Node " + self.labels[iteration - 1] + ")"
+            log.append(title + " - Distance Table:")
+            log.extend(self._table_lines(distances, lambda value: "∞" if value == float('inf') else str(value)))
+            log.append(title + " - Route Table:")
+            log.extend(self._table_lines(next_hops, lambda hop: "-" if hop is None else self.labels[hop]))
+            log.append("")
+        return log
+
+    def _table_lines(self, table, format_entry):
+        """Returns a table as lines of tab-separated entries, with the node labels as the header row & column and a
+        dash along the diagonal"""
+        lines = ["\t" + "\t".join(self.labels)]
+        for i, row in enumerate(table):
+            entries = ["-" if i == j else format_entry(entry) for j, entry in enumerate(row)]
+            lines.append(self.labels[i] + "\t" + "\t".join(entries))
+        return lines
+
+
+class TravellingSalesman:
+    """This class is used to find the bounds for the travelling salesman problem on the inputted graph - the weight of
+    the shortest tour visiting every node and returning to its start lies between the two:
+    - Upper bound: the weight of a tour found by the Nearest Neighbour algorithm, carried out from every starting node
+    with the lowest tour weight being the best upper bound
+    - Lower bound: for a deleted node, the weight of the MST of the rest of the graph (found by Kruskal's algorithm)
+    plus the two lowest weight edges connected to the deleted node. This is found for every deleted node, with the
+    highest being the best lower bound
+
+    The bounds are found for the practical problem, where the salesman can travel between two nodes along any route
+    rather than only along a direct edge: the graph is first converted into a complete graph where the weight between
+    every pair of nodes is their shortest distance (found by the all-pairs shortest paths engine). The
+    routes of any edges which don't follow a direct edge are stored so the tour can be drawn on the original graph.
+    If 'practical' is False, the bounds are instead found for the classical problem on the graph as it is.
+
+    Finding the lower bound for every deleted node is done together in one batch: the edges are only sorted once, with
+    each node's connected edges taken from the sorted edges in the same pass, and every node's MST then reuses them."""
+
+    def __init__(self, input_graph, practical=True):
+        self.input_graph = input_graph
+        self.practical = practical
+        self.shortest_routes = {} # Dictionary mapping (node1 label, node2 label) to the route of indirect edges
+        self._tsp_graph = None # Graph the bounds are found on (the practical problem's complete graph if practical)
+
+        self.upper_bounds = [] # (starting node label, tour weight or None) for every starting node
+        self.lower_bounds = [] # (deleted node label, lower bound or None, MST weight, two lowest edges) for every node
+        self.best_upper_bound = None
+        self.best_lower_bound = None
+        self.log = []
+
+    def tsp_graph(self):
+        """Returns the graph the bounds are found on: the complete graph of shortest distances between every pair of
+        nodes for the practical problem (built the first time it's needed), otherwise the input graph itself"""
+        if self._tsp_graph is None:
+            self._tsp_graph = self.practical_graph() if self.practical else self.input_graph
+        return self._tsp_graph
+
+    def practical_graph(self):
+        """Converts the graph into the practical problem by building a complete graph, with an edge between every pair
+        of connected nodes weighted by their shortest distance. The shortest distances between every pair of nodes are
+        found all at once, and the routes of edges which pass through other nodes are recorded in 'shortest_routes'."""
+        practical_graph = Graph()
+        copied_nodes = [] # Copies of the input graph's nodes, in the same order
+        for node in self.input_graph.nodes:
+            node_copy = GraphNode(node.label, node.x, node.y)
+            practical_graph.add_node(node_copy)
+            copied_nodes.append(node_copy)
+
+        shortest_paths = AllPairsShortestPaths(self.input_graph)
+        distances, next_hops = shortest_paths.solve()
+        self.shortest_routes = {}
+        for position, start_node in enumerate(copied_nodes):
+            for other_position in range(position + 1, len(copied_nodes)):
+                end_node = copied_nodes[other_position]
+                distance = distances[position][other_position]
+                if distance == float('inf'):
+                    continue # No edge between nodes which can't reach each other
+                practical_graph.add_edge(GraphEdge(distance, start_node, end_node))
+                # Recording the route if the shortest distance isn't along the direct edge
+                if next_hops[position][other_position] != other_position:
+                    self.shortest_routes[(start_node.label, end_node.label)] = shortest_paths.route(start_node.label,
+                                                                                                    end_node.label)
+
+        return practical_graph
+
+    def find_upper_bounds(self):
+        """Carries out the Nearest Neighbour algorithm from every starting node, closing each path into a tour, and
+        returns the best (lowest) upper bound - None if no tour could be found"""
+        nearest_neighbour = NearestNeighbour(self.tsp_graph())
+        nearest_neighbour.find_all_starts()
+        self.upper_bounds = []
+        for start_label, path, tour_weight in nearest_neighbour.start_results:
+            self.upper_bounds.append((start_label, tour_weight))
+        self.best_upper_bound = nearest_neighbour.best_upper_bound
+        return self.best_upper_bound
+
+    def find_lower_bound(self, deleted_node):
+        """Returns the lower bound found by deleting the given node of the graph the bounds are found on, as a
+        (lower bound, MST weight, two lowest weight edges) tuple - the lower bound is None if the rest of the graph
+        isn't connected or the deleted node has fewer than two edges"""
+        graph = self.tsp_graph()
+        deleted_node = graph.get_node(deleted_node.label) # The node of the practical problem's graph (if converted)
+        connected_edges = MergeSort(list(deleted_node.edges)).edges_mergesort_ascending()
+        return self._deleted_node_bound(graph, deleted_node, connected_edges, None)
+
+    def find_lower_bounds(self):
+        """Finds the lower bound for every deleted node of the graph in one batch, returning the best (highest) lower
+        bound - None if none could be found"""
+        graph = self.tsp_graph()
+
+        # Sorting the edges only once, and taking each node's connected edges from them in ascending order
+        sorted_edges = MergeSort(list(graph.edges)).edges_mergesort_ascending()
+        connected_edges = {} # Dictionary mapping node labels to their connected edges in ascending order of weight
+        for node in graph.nodes:
+            connected_edges[node.label] = []
+        for edge in sorted_edges:
+            connected_edges[edge.node1.label].append(edge)
+            connected_edges[edge.node2.label].append(edge)
 
-        self.final_labels = self.current_working_values.copy() # Marking final labels as final working values
+        self.lower_bounds = []
+        self.best_lower_bound = None
+        for node in graph.nodes:
+            lower_bound, MST_weight, lowest_edges = self._deleted_node_bound(graph, node, connected_edges[node.label],
+                                                                             sorted_edges)
+            self.lower_bounds.append((node.label, lower_bound, MST_weight, lowest_edges))
+            # Keeping the highest lower bound
+            if lower_bound is not None and (self.best_lower_bound is None or lower_bound > self.best_lower_bound):
+                self.best_lower_bound = lower_bound
+        return self.best_lower_bound
+
+    def _deleted_node_bound(self, graph, deleted_node, connected_edges, sorted_edges):
+        """Finds the MST of the graph without the deleted node (reusing Kruskal's algorithm) and adds the two lowest
+        weight edges connected to the deleted node, returning (lower bound, MST weight, two lowest weight edges)"""
+        MST = KruskalsMST(graph, excluded_node=deleted_node, sorted_edges=sorted_edges).find_MST()
+        lowest_edges = list(connected_edges[:2])
+        # Checking that the MST connects every other node and the deleted node can be reconnected by two edges
+        if len(MST.edges) < len(MST.nodes) - 1 or len(lowest_edges) < 2:
+            return None, MST.total_weight, lowest_edges
+        return MST.total_weight + lowest_edges[0].weight + lowest_edges[1].weight, MST.total_weight, lowest_edges
+
+    def find_bounds(self):
+        """Finds both the best upper and lower bound for the travelling salesman problem, returning them as a
+        (lower bound, upper bound) tuple, and stores the steps in the log to display to the user"""
+        self.find_upper_bounds()
+        self.find_lower_bounds()
+        graph = self.tsp_graph()
 
-        # Error handling for if the start node and end node have no path
-        if self.current_working_values[end_node.label] == float('inf'):
-            self.shortest_path = []
-            total_weight = float('inf')
-        # Recording the shortest path based on the filled final values (tracing back from end to start via predecessors)
+        log = []
+        # Storing the edges of the practical problem which follow a route through other nodes
+        if self.shortest_routes:
+            log.append("Practical Problem (Shortest Distances replacing Direct Edges):")
+            for (label1, label2), route in self.shortest_routes.items():
+                distance = graph.get_edge(label1, label2).weight
+                log.append(join_labels((label1, label2)) + " = " + str(distance) + " (" + "──".join(route) + ")")
+            log.append("")
+
+        # Storing the tour weight from every starting node and the best upper bound
+        log.append("Upper Bounds (Nearest Neighbour):")
+        for start_label, tour_weight in self.upper_bounds:
+            if tour_weight is None:
+                log.append(start_label + ": no tour found")
+            else:
+                log.append(start_label + ": " + str(tour_weight))
+        if self.best_upper_bound is None:
+            log.append("No Upper Bound found")
         else:
-            path = []
-            current = end_node.label
-            while current is not None:
-                path.append(current)
-                current = self.predecessors[current]
-            self.shortest_path = path[::-1]
-            total_weight = self.final_labels[end_node.label]
+            log.append("Best Upper Bound = " + str(self.best_upper_bound))
+        log.append("")
 
-        return self.shortest_path, total_weight, self.labelling_orders, self.final_labels, self.working_values_lists
+        # Storing the lower bound from every deleted node and the best lower bound
+        log.append("Lower Bounds (Deleted Node):")
+        for deleted_label, lower_bound, MST_weight, lowest_edges in self.lower_bounds:
+            if lower_bound is None:
+                log.append(deleted_label + ": no lower bound found")
+            else:
+                edges_str = " + ".join(edge.edge_label for edge in lowest_edges)
+                log.append(deleted_label + ": MST Weight " + str(MST_weight) + " + " + edges_str + " = "
+                           + str(lower_bound))
+        if self.best_lower_bound is None:
+            log.append("No Lower Bound found")
+        else:
+            log.append("Best Lower Bound = " + str(self.best_lower_bound))
+
+        # Storing the final interval the optimal tour's weight lies in
+        if self.best_lower_bound is not None and self.best_upper_bound is not None:
+            log.append("")
+            log.append(str(self.best_lower_bound) + " ≤ Optimal Tour Weight ≤ " + str(self.best_upper_bound))
+        self.log = log
+
+        return self.best_lower_bound, self.best_upper_bound
+
+
+class RouteInspection:
+    """This class is used to solve the route inspection (Chinese postman) problem on the inputted graph: finding the
+    shortest route which travels along every edge at least once and returns to its start. The route is found by:
+    - Identifying the odd nodes (nodes with an odd valency). If there are none, every edge is travelled exactly once
+    - Finding the shortest distance (and path) between every pair of odd nodes with Dijkstra's algorithm
+    - Choosing the pairing of the odd nodes with the lowest total distance - the paths between each pair are repeated,
+    and the route length is the total weight of the graph plus the total distance of the pairing
 
+    Rather than listing every possible pairing (of which there are 1 × 3 × 5 × ... × (n - 1) for n odd nodes), the best
+    pairing is found by dynamic programming over the subsets of odd nodes, stored as bitmasks: the best pairing of a
+    subset pairs its first node with one of the others and then uses the best pairing of the nodes left over. This
+    takes about 2ⁿ × n steps, so graphs with up to around 16 odd nodes are solved almost instantly - but as the steps
+    double with each extra odd node, graphs with more than MAX_ODD_NODES odd nodes are rejected."""
 
+    MAX_ODD_NODES = 20
+
+    def __init__(self, input_graph):
+        self.input_graph = input_graph
+        self.odd_nodes = [] # Labels of the nodes with odd valency
+        self.pair_distances = {} # Dictionary mapping pairs of odd node labels to their shortest distance
+        self.pair_paths = {} # Dictionary mapping pairs of odd node labels to their shortest path (as a list of labels)
+        self.best_pairing = [] # Pairs of odd node labels whose paths are repeated
+        self.repeated_edges = [] # Edges travelled twice by the route
+        self.route_length = None # Length of the route (None if the graph isn't connected)
+        self.log = []
+
+    def find_route(self):
+        """Finds the shortest route inspection route, returning its length and the list of repeated edges (the length
+        is None if the edges of the graph aren't all connected, as then no route exists), and stores the steps in the
+        log to display to the user"""
+        log = []
+        self.odd_nodes = [node.label for node in self.input_graph.nodes if node.valency % 2 == 1]
+        self.best_pairing = []
+        self.repeated_edges = []
+        self.route_length = None
+
+        # Checking the edges are all connected to each other (nodes without edges don't need to be visited)
+        connected_nodes = DisjointSet(self.input_graph.nodes)
+        for edge in self.input_graph.edges:
+            connected_nodes.union(edge.node1, edge.node2)
+        roots = {connected_nodes.find(node) for node in self.input_graph.nodes if node.valency > 0}
+        if len(roots) > 1:
+            log.append("No Route: the edges of the graph are not all connected")
+            self.log = log
+            return self.route_length, self.repeated_edges
+        if len(self.odd_nodes) > self.MAX_ODD_NODES:
+            raise ValueError(f"The graph has {len(self.odd_nodes)} odd nodes - route inspection can only be carried out "
+                             f"with up to {self.MAX_ODD_NODES}.")
+
+        if not self.odd_nodes:
+            log.append("Odd Nodes: None")
+            log.append("Every node has even valency, so every edge is travelled exactly once")
+        else:
+            log.append("Odd Nodes: " + ", ".join(self.odd_nodes))
+            log.append("")
+            self._find_pair_distances()
+            log.append("Shortest Distances between Odd Nodes:")
+            for (label1, label2), distance in self.pair_distances.items():
+                path_str = "──".join(self.pair_paths[(label1, label2)])
+                log.append(join_labels((label1, label2)) + " = " + str(distance) + " (" + path_str + ")")
+            log.append("")
+
+            # Choosing the best pairing and repeating the edges along the paths between each pair
+            pairing_distance = self._find_best_pairing()
+            pair_labels = [join_labels((label1, label2)) for label1, label2 in self.best_pairing]
+            pair_distances = [str(self.pair_distances[pair]) for pair in self.best_pairing]
+            log.append("Best Pairing: " + " + ".join(pair_labels) + " = " + " + ".join(pair_distances) + " = "
+                       + str(pairing_distance))
+            for pair in self.best_pairing:
+                path = self.pair_paths[pair]
+                for label1, label2 in zip(path, path[1:]):
+                    self.repeated_edges.append(self.input_graph.get_edge(label1, label2))
+            log.append("Repeated Edges: " + ", ".join(edge.edge_label for edge in self.repeated_edges))
+            log.append("")
+
+        # Storing the final route length (total weight of the graph plus the repeated edges)
+        repeated_weight = sum(edge.weight for edge in self.repeated_edges)
+        self.route_length = self.input_graph.total_weight + repeated_weight
+        log.append("Route Length = " + str(self.input_graph.total_weight) + " + " + str(repeated_weight) + " = "
+                   + str(self.route_length))
+        log.append("Total Weight: " + str(self.route_length))
+        self.log = log
+
+        return self.route_length, self.repeated_edges
+
+    def _find_pair_distances(self):
+        """Carries out Dijkstra's algorithm from each odd node (except the last) to find the shortest distance and
+        path to each of the later odd nodes"""
+        self.pair_distances = {}
+        self.pair_paths = {}
+        dijkstra = DijkstrasShortestPath(self.input_graph)
+        for position, start_label in enumerate(self.odd_nodes[:-1]):
+            dijkstra.find_shortest_path_tree(self.input_graph.get_node(start_label))
+            for end_label in self.odd_nodes[position + 1:]:
+                path, distance = dijkstra.path_to(self.input_graph.get_node(end_label))
+                self.pair_distances[(start_label, end_label)] = distance
+                self.pair_paths[(start_label, end_label)] = path
+
+    def _find_best_pairing(self):
+        """Finds the pairing of the odd nodes with the lowest total distance by dynamic programming over bitmasks of
+        the odd nodes, storing the pairs in 'best_pairing' and returning the total distance"""
+        odd_count = len(self.odd_nodes)
+        distances = [[0] * odd_count for row in range(odd_count)]
+        for (label1, label2), distance in self.pair_distances.items():
+            position1 = self.odd_nodes.index(label1)
+            position2 = self.odd_nodes.index(label2)
+            distances[position1][position2] = distances[position2][position1] = distance
+
+        # best_distances[mask] is the lowest total distance pairing the odd nodes in the mask (None for odd sizes), and
+        # best_partners[mask] is the node paired with the mask's first node in that pairing
+        full_mask = (1 << odd_count) - 1
+        best_distances = [None] * (full_mask + 1)
+        best_partners = [None] * (full_mask + 1)
+        best_distances[0] = 0
+        for mask in range(1, full_mask + 1):
+            if bin(mask).count("1") % 2 == 1:
+                continue # Subsets with an odd number of nodes can't be paired
+            first = (mask & -mask).bit_length() - 1 # Position of the first node in the subset
+            remaining = mask ^ (1 << first)
+            # Trying each other node of the subset as the first node's partner
+            other_nodes = remaining
+            while other_nodes:
+                partner_bit = other_nodes & -other_nodes
+                other_nodes ^= partner_bit
+                partner = partner_bit.bit_length() - 1
+                total_distance = distances[first][partner] + best_distances[remaining ^ partner_bit]
+                if best_distances[mask] is None or total_distance < best_distances[mask]:
+                    best_distances[mask] = total_distance
+                    best_partners[mask] = partner
+
+        # Tracing the pairs of the best pairing back from the full set of odd nodes
+        self.best_pairing = []
+        mask = full_mask
+        while mask:
+            first = (mask & -mask).bit_length() - 1
+            partner = best_partners[mask]
+            self.best_pairing.append((self.odd_nodes[first], self.odd_nodes[partner]))
+            mask ^= (1 << first) | (1 << partner)
+
+        return best_distances[full_mask]
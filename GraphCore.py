@@ -0,0 +1,658 @@
+import gc
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+_NOT_CACHED = object() # Returned by ResultCache.get when there's no result, since a result can itself be None
+
+# NumPy is optional - it's only used to build compact graphs more quickly
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def join_labels(labels):
+    """Joins node labels together for displaying edges & paths in the working. Single letter labels are written next
+    to each other as in the textbook (e.g. AB), while longer labels are separated by dashes so they can still be told
+    apart (e.g. N1-N12)."""
+    labels = list(labels)
+    if all(len(label) == 1 for label in labels):
+        return "".join(labels)
+    return "-".join(labels)
+
+
+def is_valid_label(label):
+    """Returns whether a string can be used as a node label: one or more letters, digits or underscores"""
+    return bool(label) and label.replace("_", "").isalnum()
+
+
+class Graph:
+    """This class represents the entire graph structure, managing its nodes & edges stored as indexes of objects
+     and its adjacency, which is stored efficiently as a dictionary of dictionaries. The collection of nodes and
+     edges is what defines the graph, and the adjacency is updated and stored accordingly. The class includes
+     methods to edit and update the graph by adding & deleting nodes and edges. It only handles the logical storing
+     of the graph with its nodes, edges and distance matrix, since the display is handled in the interface file
+
+    The adjacency is stored as a nested dictionary (dictionary of dictionaries):
+    Each node has its own nested dictionary, where the keys store the labels of the nodes it's connected to and the
+    values store the weights of the edges between them. Only the edges that exist are stored, so adding a node or an
+    edge takes constant time however large the graph is.
+
+    The nodes are indexed by their labels, and the edges by the labels of the two nodes they connect (in the order
+    they were given), both as dictionaries. This means nodes and edges can be looked up, added and deleted in
+    constant time, while the 'nodes' and 'edges' attributes still give them in the order they were added.
+
+    The distance matrix (where every pair of nodes has an entry, stored as zero if there's no edge) is only needed
+    for displaying or exporting the graph, so it's built from the adjacency when it's first asked for and then kept
+    until the graph is next edited.
+
+    The graph also has a 'version' counter which goes up with every edit, so the results of algorithms can be kept in
+    its 'result_cache' (a ResultCache) under their algorithm, parameters and the graph's version through
+    cached_result. Asking for the same result again before the graph is edited returns the kept result instantly,
+    while after an edit the version is different so an outdated result is never reused. Moving a node (through
+    move_node) doesn't change the version, since it doesn't change the graph's structure, but it does clear the cache
+    since results such as the MST graphs hold copies of the nodes with their positions.
+
+    Other objects (such as the interface's matrix display) can register a change listener to be told whenever the
+    graph is edited. Large numbers of edits can be grouped with batch_edit (or loaded all at once with bulk_load), in
+    which case the listeners are only told once at the end, rather than after every single edit.
+
+    Node labels can be any strings, so for the algorithms the nodes are also numbered with dense integer ids by a
+    GraphIndex (built from the graph the first time it's needed after an edit). The algorithms work with the ids and
+    lists indexed by them in their inner loops, only converting back to labels when building the working log.
+
+    The graph is completely independent of PyQt so that the algorithms can be run without a display (e.g. when
+    generating worked solutions in bulk). The nodes and edges it stores are the plain GraphNode & GraphEdge records
+    below, which the Qt display items in GraphStructure wrap around."""
+
+    def __init__(self, cache_size=32):
+        self.node_index = {} # Dictionary mapping the labels of the nodes to the node objects of graph
+        self.edge_index = {} # Dictionary mapping the (node1 label, node2 label) of the edges to the edge objects of graph
+        self.adjacency = {} # Stored as nested dictionary (dictionary of dictionaries) of the existing edges only
+        self.total_weight = 0 # Sum of all the edge weights - useful in algorithms
+
+        self.log = [] # Used to log the steps of algorithms as array of strings for each line to display working
+
+        self._distance_matrix = None # Dense distance matrix built from the adjacency when needed (None if outdated)
+        self._index = None # GraphIndex numbering the nodes with integer ids, built when needed (None if outdated)
+        self.version = 0 # Goes up by one with every edit of the graph
+        self.result_cache = ResultCache(cache_size) # Results of algorithms, kept under the version they were found for
+        self.change_listeners = [] # Functions called as listener(change, item) whenever the graph is edited
+        self._batch_depth = 0 # Number of batch edits currently in progress (listeners are held back while above 0)
+        self._batch_changed = False # Whether the graph has been edited during the current batch edit
+
+    @property
+    def nodes(self):
+        """The node objects of the graph, in the order they were added"""
+        return self.node_index.values()
+
+    @property
+    def edges(self):
+        """The edge objects of the graph, in the order they were added"""
+        return self.edge_index.values()
+
+    def get_node(self, label):
+        """Returns the node object with the given label, or None if the graph has no such node"""
+        return self.node_index.get(label)
+
+    def get_edge(self, label1, label2):
+        """Returns the edge object between the nodes with the given labels (in either order), or None if the graph has
+        no such edge"""
+        edge = self.edge_index.get((label1, label2))
+        if edge is None:
+            edge = self.edge_index.get((label2, label1))
+        return edge
+
+    def has_edge(self, label1, label2):
+        """Returns whether there is an edge between the nodes with the given labels"""
+        return label1 in self.adjacency and label2 in self.adjacency[label1]
+
+    @property
+    def distance_matrix(self):
+        """The distance matrix of the graph as a nested dictionary, with a row & column for every node (stored as zero
+        between nodes without an edge). It's built from the adjacency the first time it's needed after an edit."""
+        if self._distance_matrix is None:
+            labels = [node.label for node in self.nodes]
+            self._distance_matrix = {}
+            for label in labels:
+                row = dict.fromkeys(labels, 0) # Initialises the node's row with zeros for all nodes of the graph
+                row.update(self.adjacency[label]) # Fills in the weights of the edges connected to the node
+                self._distance_matrix[label] = row
+        return self._distance_matrix
+
+    def index(self):
+        """Returns the GraphIndex numbering the nodes of the graph with integer ids. It's built the first time it's
+        needed after an edit."""
+        if self._index is None:
+            self._index = GraphIndex(self)
+        return self._index
+
+    def cached_result(self, algorithm, parameters, find_result):
+        """Returns the result of an algorithm with the given parameters (a tuple) on the current version of the graph
+        from the result cache, or calls find_result() to find it and keeps it in the cache if it isn't there"""
+        key = (algorithm, parameters, self.version)
+        result = self.result_cache.get(key, _NOT_CACHED)
+        if result is _NOT_CACHED:
+            result = find_result()
+            self.result_cache.put(key, result)
+        return result
+
+    def move_node(self, node, x, y):
+        """Moves a node of the graph to a new position (e.g. as it's dragged on the canvas). The listeners aren't told
+        and the version is kept, since the nodes and edges are unchanged, but the cached results are cleared as they
+        may hold copies of the node at its old position."""
+        node.x = x
+        node.y = y
+        self.result_cache.clear()
+
+    def add_change_listener(self, listener):
+        """Registers a function to be called as listener(change, item) after every edit of the graph, where change is
+        one of 'add_node', 'delete_node', 'add_edge', 'delete_edge' or 'change_weight' and item is the node/edge object.
+        At the end of a batch edit the listeners are instead called once as listener('batch', None)."""
+        self.change_listeners.append(listener)
+
+    def remove_change_listener(self, listener):
+        """Stops a function registered through add_change_listener from being called"""
+        self.change_listeners.remove(listener)
+
+    def _graph_changed(self, change, item):
+        """Called after every edit: updates the version, marks the distance matrix as outdated and tells the change
+        listeners (or records that there's been a change if a batch edit is in progress)"""
+        self.version += 1
+        self._distance_matrix = None
+        self._index = None
+        if self._batch_depth > 0:
+            self._batch_changed = True
+            return
+        for listener in list(self.change_listeners):
+            listener(change, item)
+
+    @contextmanager
+    def batch_edit(self):
+        """Groups the edits made inside a 'with graph.batch_edit():' block so that the change listeners are only called
+        once at the end (e.g. so the interface redraws the matrix once rather than after every node & edge). Batch
+        edits can be nested, in which case the listeners are called at the end of the outermost one."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_changed:
+                self._batch_changed = False
+                for listener in list(self.change_listeners):
+                    listener("batch", None)
+
+    def check_records(self, nodes, edges):
+        """Checks that (label, x, y) node records and (node1 label, node2 label, weight) edge records could be added to
+        the graph, raising a ValueError if any would be invalid, without changing the graph. Checking them with an empty
+        Graph() checks whether they make a valid graph on their own."""
+        labels = set(self.node_index)
+        for label, x, y in nodes:
+            if label in labels:
+                raise ValueError(f"Node {label} cannot already exist!")
+            labels.add(label)
+        edge_keys = set()
+        for label1, label2, weight in edges:
+            if label1 not in labels or label2 not in labels:
+                raise ValueError(f"Both nodes of edge {join_labels((label1, label2))} must exist!")
+            if label1 == label2:
+                raise ValueError(f"Edge {join_labels((label1, label2))} must be between two different nodes!")
+            if self.has_edge(label1, label2) or (label1, label2) in edge_keys or (label2, label1) in edge_keys:
+                raise ValueError(f"Edge {join_labels((label1, label2))} cannot already exist!")
+            edge_keys.add((label1, label2))
+
+    def bulk_load(self, nodes, edges):
+        """Adds many nodes and edges to the graph in one batch edit. The nodes are given as (label, x, y) records and
+        the edges as (node1 label, node2 label, weight) records. All the records are checked before anything is
+        added, raising a ValueError if any would be invalid. Returns the lists of the new node and edge objects."""
+        # Checking the records first so that the graph is left unchanged if any are invalid
+        self.check_records(nodes, edges)
+
+        # Adding the nodes and edges, with the listeners only told once at the end. Python's garbage collector is
+        # paused meanwhile, since none of the objects created are garbage but would otherwise be repeatedly scanned
+        new_nodes = []
+        new_edges = []
+        collector_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with self.batch_edit():
+                for label, x, y in nodes:
+                    new_node = GraphNode(label, x, y)
+                    self.add_node(new_node)
+                    new_nodes.append(new_node)
+                for label1, label2, weight in edges:
+                    new_edge = GraphEdge(weight, self.node_index[label1], self.node_index[label2])
+                    self.add_edge(new_edge)
+                    new_edges.append(new_edge)
+        finally:
+            if collector_was_enabled:
+                gc.enable()
+
+        return new_nodes, new_edges
+
+    def add_node(self, new_node):
+        """Adds a new node to the logical graph, then initialises its (empty) row within the adjacency."""
+        # Adding node to the logical graph structure
+        self.node_index[new_node.label] = new_node
+
+        # Update adjacency with new node
+        self.adjacency[new_node.label] = {}
+        self._graph_changed("add_node", new_node)
+
+    def delete_node(self, removal_node):
+        """Deletes a node from the logical graph, also deleting the connected edges,
+        then deletes its row from the adjacency. This is done as one batch edit, so the listeners are told once at the
+        end rather than after every connected edge is deleted."""
+        with self.batch_edit():
+            # Deleting the node from the logical graph structure
+            del self.node_index[removal_node.label]
+
+            # Removing all connected edges from the node
+            for edge in list(removal_node.edges):
+                self.delete_edge(edge)
+
+            # Update adjacency with node deleted (its connected edges have already been removed from the other rows)
+            del self.adjacency[removal_node.label]
+            self._graph_changed("delete_node", removal_node)
+
+
+    def add_edge(self, new_edge):
+        """Adds an edge to the logical graph, updating its total weight, then assigns the edge weight to the relevant
+        entries in the adjacency."""
+        # Adding edge to logical graph structure
+        self.edge_index[(new_edge.node1.label, new_edge.node2.label)] = new_edge
+        self.total_weight += new_edge.weight
+
+        # Update adjacency with new edge:
+        self.adjacency[new_edge.node1.label][new_edge.node2.label] = new_edge.weight
+        self.adjacency[new_edge.node2.label][new_edge.node1.label] = new_edge.weight
+        self._graph_changed("add_edge", new_edge)
+
+
+    def delete_edge(self, removal_edge):
+        """Deletes an edge from the logical graph, updating its total weight, and then deletes the edge also from the
+         node objects. Finally, deletes the edge weight from the relevant entries in the adjacency."""
+        # Deleting edge from logical graph structure and the nodes it's connected to
+        del self.edge_index[(removal_edge.node1.label, removal_edge.node2.label)]
+        removal_edge.node1.remove_edge(removal_edge)
+        removal_edge.node2.remove_edge(removal_edge)
+        self.total_weight -= removal_edge.weight
+
+        # Update adjacency with edge deleted
+        del self.adjacency[removal_edge.node1.label][removal_edge.node2.label]
+        del self.adjacency[removal_edge.node2.label][removal_edge.node1.label]
+        self._graph_changed("delete_edge", removal_edge)
+
+
+    def change_edge_weight(self, edge, new_weight):
+        """Changes the weight of an edge of the graph, updating its total weight and the relevant entries in the
+        adjacency."""
+        self.total_weight += new_weight - edge.weight
+        edge.weight = new_weight
+        edge.edge_label = f"{join_labels((edge.node1.label, edge.node2.label))}({new_weight})"
+
+        # Update adjacency with new weight
+        self.adjacency[edge.node1.label][edge.node2.label] = new_weight
+        self.adjacency[edge.node2.label][edge.node1.label] = new_weight
+        self._graph_changed("change_weight", edge)
+
+    def compact(self):
+        """Returns a frozen CompactGraph snapshot of the graph as it is now, which stores the nodes & edges in arrays
+        rather than objects (later edits of this graph don't change the snapshot)"""
+        node_ids = {} # Dictionary mapping node labels to their position in the list of nodes
+        labels = []
+        coordinates = array("d")
+        for node_id, node in enumerate(self.nodes):
+            node_ids[node.label] = node_id
+            labels.append(node.label)
+            coordinates.append(node.x)
+            coordinates.append(node.y)
+
+        edge_ends = array("i")
+        edge_weights = array("q")
+        for edge in self.edges:
+            edge_ends.append(node_ids[edge.node1.label])
+            edge_ends.append(node_ids[edge.node2.label])
+            edge_weights.append(edge.weight)
+
+        return CompactGraph(labels, coordinates, edge_ends, edge_weights)
+
+
+class GraphIndex:
+    """Numbers the nodes of a graph with dense integer ids 0, 1, 2, ... in the order they were added, so that the
+    algorithms can store their working in lists indexed by id rather than dictionaries keyed by label. It stores:
+    - 'labels': the label of each id, and 'ids': a dictionary mapping each label to its id
+    - 'nodes': the node object of each id
+    - 'edges': the edge objects in the order they were added, so each edge is numbered by its position
+    - 'adjacency': for each id, a list of (neighbour id, weight, edge number) entries for its connected edges, in the
+    order they were added to the node
+    The index is only valid for the version of the graph it was built from, so it should be taken from Graph.index
+    rather than kept between edits."""
+
+    def __init__(self, graph):
+        self.version = graph.version
+        self.nodes = list(graph.nodes)
+        self.labels = [node.label for node in self.nodes]
+        self.ids = {label: node_id for node_id, label in enumerate(self.labels)}
+        self.edges = list(graph.edges)
+        ids = self.ids
+        edge_numbers = {edge: number for number, edge in enumerate(self.edges)}
+        self.adjacency = [[(ids[other_label], edge.weight, edge_numbers[edge])
+                           for other_label, edge in node.connections.items()] for node in self.nodes]
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class GraphNode:
+    """Nodes of a graph are stored logically as objects of this 'GraphNode' class. The nodes are identified by their
+    'label' attribute, which stores the inputted node label. Alongside its connected edges and valency, the node
+    also records the (x, y) position of its centre so that a solution can be drawn in the same layout as the
+    inputted graph - but no PyQt objects are created, so it is cheap enough to build thousands of them."""
+
+    def __init__(self, label, x=0, y=0):
+        self.label = label # Node label (a single letter, or any string of letters, digits & underscores)
+        self.x = x # Position of the node's centre on the canvas
+        self.y = y
+        self.connections = {} # Dictionary mapping the labels of connected nodes to the edge objects connecting them
+        self.valency = 0 # Number of connected edges (degree) - used to find the odd nodes in route inspection
+
+    @property
+    def edges(self):
+        """The edge objects connected to the node, in the order they were added"""
+        return self.connections.values()
+
+    def add_edge(self, edge):
+        """Called when an edge is added to the node: adds edge to the 'connections' attribute and updates valency"""
+        other_node = edge.node2 if edge.node1 is self else edge.node1
+        self.connections[other_node.label] = edge
+        self.valency += 1
+
+    def remove_edge(self, edge):
+        """Called when an edge is deleted from the graph: removes edge from the 'connections' attribute and updates
+        valency"""
+        other_node = edge.node2 if edge.node1 is self else edge.node1
+        del self.connections[other_node.label]
+        self.valency -= 1
+
+
+class GraphEdge:
+    """Edges of a graph are stored logically as objects of this 'GraphEdge' class - as weighted connections between
+    two GraphNode objects. Creating the edge adds it to both of its nodes, in the same way as the displayed edges."""
+
+    def __init__(self, weight, node1, node2):
+        self.weight = weight
+        self.node1 = node1
+        self.node2 = node2
+        self.nodes = [node1, node2] # The node objects the edge connects
+        # Adding edge to its nodes
+        self.node1.add_edge(self)
+        self.node2.add_edge(self)
+
+        # Label in format AB(5) to use in displaying working
+        self.edge_label = f"{join_labels((node1.label, node2.label))}({weight})"
+
+
+class ResultCache:
+    """A least recently used (LRU) cache of the results of algorithms, holding up to 'max_size' results. The results
+    are stored in an ordered dictionary in order of when they were last used: using a result moves it to the end, and
+    once the cache is full, adding a result removes the one at the start (which was used longest ago). The numbers of
+    hits (results found in the cache) and misses (results not found) are counted to show how useful the cache is."""
+
+    def __init__(self, max_size=32):
+        self.max_size = max_size
+        self.results = OrderedDict() # Dictionary mapping keys to results, from least to most recently used
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.results)
+
+    def get(self, key, default=None):
+        """Returns the result stored under the key (marking it as the most recently used), or 'default' if there isn't
+        one"""
+        if key not in self.results:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.results.move_to_end(key)
+        return self.results[key]
+
+    def put(self, key, result):
+        """Stores a result under the key, removing the least recently used results if the cache is over its size"""
+        self.results[key] = result
+        self.results.move_to_end(key)
+        while len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+
+    def clear(self):
+        """Removes every result from the cache (the hit & miss counts are kept)"""
+        self.results.clear()
+
+    def statistics(self):
+        """Returns the numbers of hits & misses, the proportion of hits and the number of results stored"""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self.results), "max_size": self.max_size}
+
+
+class CompactGraph:
+    """A frozen snapshot of a graph for very large graphs which are only solved rather than edited, storing its
+    adjacency in compressed sparse row (CSR) form: rather than an object for every node & edge, the graph is held in a
+    few flat arrays of numbers (from the 'array' module, or memory-mapped from a file):
+    - 'offsets': for each node id, where its connected edges start in the arrays below (with one extra entry at the
+    end), so node i's edges are at positions offsets[i] up to offsets[i + 1]
+    - 'neighbours', 'weights' & 'edge_numbers': for each of those positions, the id of the node at the other end of
+    the edge, its weight and its number (position in the order the edges were added)
+    - 'edge_ends' & 'edge_weights': the two node ids and the weight of each edge by its number
+    Each node's edges are in the order they were added, and the nodes & edges keep their order from the original graph,
+    so the algorithms break ties in exactly the same way and give the same working as on the Graph.
+
+    This takes about 50 bytes per edge, compared to several hundred for the edge objects and dictionaries of a
+    Graph. The node and edge objects the algorithms use (CompactNode & CompactEdge) are only made when they're asked
+    for: the nodes once for the whole graph, and the edges each time they're looked up, so they're never all kept in
+    memory.
+
+    The graph has the same read-only attributes & methods as a Graph (nodes, edges, get_node, get_edge, total_weight,
+    version, result_cache & cached_result) and is its own GraphIndex, so every algorithm which doesn't edit the graph
+    can be carried out on it. DynamicMST needs an editable Graph, since it updates its tree as the graph is edited.
+
+    The CSR arrays are built from the edges (by NumPy's stable sort if it's installed, otherwise by counting the
+    edges of each node), unless they're given already built - e.g. as memory-mapped views of a file saved by
+    GraphFiles.save_compact_graph, which are used directly without being copied."""
+
+    def __init__(self, labels, coordinates, edge_ends, edge_weights, csr_arrays=None, buffer=None):
+        self.labels = list(labels) # Label of each node id
+        self.ids = {label: node_id for node_id, label in enumerate(self.labels)} # Dictionary mapping labels to ids
+        self.coordinates = coordinates # Positions of the nodes (x1, y1, x2, y2, ...)
+        self.edge_ends = edge_ends # Node ids at the ends of the edges (node1 of edge 1, node2 of edge 1, ...)
+        self.edge_weights = edge_weights # Weight of each edge
+        if csr_arrays is None:
+            csr_arrays = self._build_csr()
+        self.offsets, self.neighbours, self.weights, self.edge_numbers = csr_arrays
+        self.buffer = buffer # Memory-mapped file the arrays are views of (kept open while the graph is in use)
+
+        self.version = 0 # The graph can't be edited, so it always has the same version
+        self.result_cache = ResultCache()
+        self.total_weight = sum(edge_weights)
+        self.adjacency = CompactAdjacency(self)
+        self.edges = CompactEdgeList(self)
+        self._nodes = None
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _build_csr(self):
+        """Builds the offsets, neighbours, weights & edge numbers arrays from the edges, with each node's edges in the
+        order of their numbers"""
+        node_count = len(self.labels)
+        edge_count = len(self.edge_weights)
+
+        if numpy is not None and edge_count:
+            # Sorting the two ends of every edge by the node they start from, keeping them in order of edge number
+            ends = numpy.frombuffer(self.edge_ends, dtype=numpy.int32).reshape(edge_count, 2)
+            starts = ends.ravel()
+            others = ends[:, ::-1].ravel()
+            order = numpy.argsort(starts, kind="stable")
+            offsets = numpy.zeros(node_count + 1, dtype=numpy.int64)
+            numpy.cumsum(numpy.bincount(starts, minlength=node_count), out=offsets[1:])
+            weights = numpy.frombuffer(self.edge_weights, dtype=numpy.int64)
+            return (array("q", offsets.tobytes()), array("i", others[order].tobytes()),
+                    array("q", weights[order // 2].tobytes()), array("i", (order // 2).astype(numpy.int32).tobytes()))
+
+        # Counting the edges of each node to find where they start, then placing each edge at both of its ends
+        offsets = array("q", [0]) * (node_count + 1)
+        for node_id in self.edge_ends:
+            offsets[node_id + 1] += 1
+        for node_id in range(node_count):
+            offsets[node_id + 1] += offsets[node_id]
+        neighbours = array("i", [0]) * (2 * edge_count)
+        weights = array("q", [0]) * (2 * edge_count)
+        edge_numbers = array("i", [0]) * (2 * edge_count)
+        next_positions = offsets[:-1].tolist() # Where the next edge of each node is placed
+        edge_ends = self.edge_ends
+        for edge_number, weight in enumerate(self.edge_weights):
+            node1_id = edge_ends[2 * edge_number]
+            node2_id = edge_ends[2 * edge_number + 1]
+            for node_id, other_id in ((node1_id, node2_id), (node2_id, node1_id)):
+                position = next_positions[node_id]
+                neighbours[position] = other_id
+                weights[position] = weight
+                edge_numbers[position] = edge_number
+                next_positions[node_id] = position + 1
+        return offsets, neighbours, weights, edge_numbers
+
+    def numpy_arrays(self):
+        """Returns the offsets, neighbours, weights & edge numbers as NumPy arrays sharing the same memory (NumPy must
+        be installed)"""
+        return tuple(numpy.frombuffer(values, dtype=numpy.int64 if values.itemsize == 8 else numpy.int32)
+                     for values in (self.offsets, self.neighbours, self.weights, self.edge_numbers))
+
+    @property
+    def nodes(self):
+        """The node objects of the graph in order of their ids (made the first time they're needed)"""
+        if self._nodes is None:
+            self._nodes = [CompactNode(self, node_id) for node_id in range(len(self.labels))]
+        return self._nodes
+
+    def index(self):
+        """The graph is its own index, since its nodes are already numbered by id"""
+        return self
+
+    def get_node(self, label):
+        """Returns the node object with the given label, or None if the graph has no such node"""
+        node_id = self.ids.get(label)
+        return None if node_id is None else self.nodes[node_id]
+
+    def get_edge(self, label1, label2):
+        """Returns the edge object between the nodes with the given labels (in either order), or None if the graph has
+        no such edge"""
+        node1_id = self.ids.get(label1)
+        node2_id = self.ids.get(label2)
+        if node1_id is None or node2_id is None:
+            return None
+        for position in range(self.offsets[node1_id], self.offsets[node1_id + 1]):
+            if self.neighbours[position] == node2_id:
+                return self.edges[self.edge_numbers[position]]
+        return None
+
+    def has_edge(self, label1, label2):
+        """Returns whether there is an edge between the nodes with the given labels"""
+        return self.get_edge(label1, label2) is not None
+
+    def cached_result(self, algorithm, parameters, find_result):
+        """Returns the result of an algorithm with the given parameters (a tuple) from the result cache, or calls
+        find_result() to find it and keeps it in the cache if it isn't there"""
+        key = (algorithm, parameters, self.version)
+        result = self.result_cache.get(key, _NOT_CACHED)
+        if result is _NOT_CACHED:
+            result = find_result()
+            self.result_cache.put(key, result)
+        return result
+
+
+class CompactAdjacency:
+    """The adjacency of a CompactGraph in the same form as GraphIndex.adjacency: indexing it by a node id gives the
+    list of (neighbour id, weight, edge number) entries for the node's edges, read from the CSR arrays"""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __len__(self):
+        return len(self.graph.labels)
+
+    def __getitem__(self, node_id):
+        graph = self.graph
+        start, end = graph.offsets[node_id], graph.offsets[node_id + 1]
+        return list(zip(graph.neighbours[start:end], graph.weights[start:end], graph.edge_numbers[start:end]))
+
+    def __iter__(self):
+        for node_id in range(len(self.graph.labels)):
+            yield self[node_id]
+
+
+class CompactEdgeList:
+    """The edges of a CompactGraph in the order they were added, with each CompactEdge only made when it's used"""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __len__(self):
+        return len(self.graph.edge_weights)
+
+    def __getitem__(self, edge_number):
+        graph = self.graph
+        nodes = graph.nodes
+        return CompactEdge(edge_number, graph.edge_weights[edge_number], nodes[graph.edge_ends[2 * edge_number]],
+                           nodes[graph.edge_ends[2 * edge_number + 1]])
+
+    def __iter__(self):
+        for edge_number in range(len(self.graph.edge_weights)):
+            yield self[edge_number]
+
+
+class CompactNode:
+    """A node of a CompactGraph, with the same attributes the algorithms use as a GraphNode. Its connected edges and
+    valency are read from the graph's arrays rather than stored on the node."""
+    __slots__ = ("graph", "node_id", "label", "x", "y") # No per-node dictionary, since there can be a great many
+
+    def __init__(self, graph, node_id):
+        self.graph = graph
+        self.node_id = node_id
+        self.label = graph.labels[node_id]
+        self.x = graph.coordinates[2 * node_id]
+        self.y = graph.coordinates[2 * node_id + 1]
+
+    @property
+    def valency(self):
+        """Number of connected edges (degree)"""
+        return self.graph.offsets[self.node_id + 1] - self.graph.offsets[self.node_id]
+
+    @property
+    def edges(self):
+        """The edge objects connected to the node, in the order they were added"""
+        graph = self.graph
+        start, end = graph.offsets[self.node_id], graph.offsets[self.node_id + 1]
+        return [graph.edges[edge_number] for edge_number in graph.edge_numbers[start:end]]
+
+
+class CompactEdge:
+    """An edge of a CompactGraph, with the same attributes the algorithms use as a GraphEdge"""
+    __slots__ = ("edge_number", "weight", "node1", "node2")
+
+    def __init__(self, edge_number, weight, node1, node2):
+        self.edge_number = edge_number
+        self.weight = weight
+        self.node1 = node1
+        self.node2 = node2
+
+    @property
+    def nodes(self):
+        return [self.node1, self.node2]
+
+    @property
+    def edge_label(self):
+        """Label in format AB(5) to use in displaying working"""
+        return f"{join_labels((self.node1.label, self.node2.label))}({self.weight})"
@@ -0,0 +1,355 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from GraphCore import CompactGraph, join_labels, is_valid_label
+
+
+BINARY_MAGIC = b"DMGRAPH1" # Identifies (and versions) the compact binary graph files
+BINARY_HEADER = struct.Struct("<8sQQQ") # Magic, node count, edge count, byte length of the labels block
+COMPACT_MAGIC = b"DMCSR001" # Identifies (and versions) the memory-mappable compact graph files (same header layout)
+
+
+def read_edge_list(file_path):
+    """Reads a graph from a plain text file so that it can be imported all at once rather than entering each node and
+    edge separately. Each line of the file is either:
+    - 'node <label>' or 'node <label> <x> <y>' to add a node (optionally at a given position)
+    - 'edge <label> <label> <weight>' to add a weighted edge between two nodes
+    Labels can be any letters, digits & underscores (and are made upper case). Blank lines and lines starting with '#'
+    are ignored, and any nodes used by edges without having been listed are added automatically. The nodes are
+    returned as (label, x, y) records - with x & y as None if no position was given - and the edges as (node1 label,
+    node2 label, weight) records, ready to be passed to Graph.bulk_load. A ValueError is raised if any line can't be
+    read, or if an edge is listed twice or joins a node to itself."""
+
+    nodes = []
+    edges = []
+    listed_labels = {} # Dictionary mapping the labels of the nodes listed so far to their position in 'nodes'
+    listed_edges = set() # Pairs of labels of the edges listed so far (in both orders)
+
+    with open(file_path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            parts = line.split()
+            # Skipping blank and comment lines
+            if not parts or parts[0].startswith("#"):
+                continue
+
+            keyword = parts[0].lower()
+            # Checking the labels of the nodes on the line
+            label_count = {"node": 1, "edge": 2}.get(keyword, 0)
+            for label in parts[1:1 + label_count]:
+                if not is_valid_label(label):
+                    raise ValueError(f"Line {line_number}: node label '{label}' must only contain letters, digits or "
+                                     f"underscores.")
+            if keyword == "node" and len(parts) in (2, 4):
+                label = parts[1].upper()
+                x, y = None, None
+                if len(parts) == 4:
+                    try:
+                        x, y = float(parts[2]), float(parts[3])
+                    except ValueError:
+                        raise ValueError(f"Line {line_number}: node position must be two numbers.")
+                if label not in listed_labels:
+                    listed_labels[label] = len(nodes)
+                    nodes.append((label, x, y))
+                elif x is not None:
+                    nodes[listed_labels[label]] = (label, x, y) # Positioning a node already added by an edge
+
+            elif keyword == "edge" and len(parts) == 4:
+                label1, label2 = parts[1].upper(), parts[2].upper()
+                try:
+                    weight = int(parts[3])
+                except ValueError:
+                    raise ValueError(f"Line {line_number}: edge weight must be an integer.")
+                if weight <= 0:
+                    raise ValueError(f"Line {line_number}: edge weight must be positive.")
+                if label1 == label2:
+                    raise ValueError(f"Line {line_number}: edge must be between two different nodes.")
+                if (label1, label2) in listed_edges:
+                    raise ValueError(f"Line {line_number}: edge {join_labels((label1, label2))} is listed more than once.")
+                listed_edges.add((label1, label2))
+                listed_edges.add((label2, label1))
+                # Adding any nodes of the edge which haven't been listed yet
+                for label in (label1, label2):
+                    if label not in listed_labels:
+                        listed_labels[label] = len(nodes)
+                        nodes.append((label, None, None))
+                edges.append((label1, label2, weight))
+
+            else:
+                raise ValueError(f"Line {line_number}: expected 'node <label> [x y]' or 'edge <label> <label> <weight>'.")
+
+    return nodes, edges
+
+
+def save_edge_list(graph, file_path):
+    """Saves a graph in the plain text format read by read_edge_list, with a 'node <label> <x> <y>' line for each node
+    followed by an 'edge <label> <label> <weight>' line for each edge"""
+    lines = []
+    for node in graph.nodes:
+        lines.append(f"node {node.label} {node.x!r} {node.y!r}")
+    for edge in graph.edges:
+        lines.append(f"edge {edge.node1.label} {edge.node2.label} {edge.weight}")
+
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def load_graph_file(file_path):
+    """Reads the nodes and edges of a graph from a file in any of the supported formats, chosen by its extension (see
+    GRAPH_FILE_FORMATS). Returns (label, x, y) node records and (node1 label, node2 label, weight) edge records. A
+    ValueError is raised if the extension isn't that of a supported format."""
+    return _graph_file_format(file_path)[0](file_path)
+
+
+def save_graph_file(graph, file_path):
+    """Saves a graph in the format chosen by the file's extension (see GRAPH_FILE_FORMATS), in the same way as
+    load_graph_file reads it back. A ValueError is raised if the extension isn't that of a supported format."""
+    _graph_file_format(file_path)[1](graph, file_path)
+
+
+def _graph_file_format(file_path):
+    """Returns the (load function, save function) of the graph file format given by a file's extension"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in GRAPH_FILE_FORMATS:
+        raise ValueError(f"Unknown graph file extension '{extension}' (expected "
+                         f"{', '.join(list(GRAPH_FILE_FORMATS)[:-1])} or {list(GRAPH_FILE_FORMATS)[-1]}).")
+    return GRAPH_FILE_FORMATS[extension]
+
+
+def save_json(graph, file_path):
+    """Saves a graph's nodes (with their labels & positions) and edges (with their weights) in a human-readable JSON
+    file, with one line for each node and edge."""
+    lines = ['{"nodes": [']
+    node_lines = []
+    for node in graph.nodes:
+        node_lines.append("  " + json.dumps({"label": node.label, "x": node.x, "y": node.y}))
+    lines.append(",\n".join(node_lines))
+    lines.append('], "edges": [')
+    edge_lines = []
+    for edge in graph.edges:
+        edge_lines.append("  " + json.dumps({"node1": edge.node1.label, "node2": edge.node2.label,
+                                              "weight": edge.weight}))
+    lines.append(",\n".join(edge_lines))
+    lines.append("]}")
+
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def load_json(file_path):
+    """Reads a graph saved by save_json, returning (label, x, y) node records and (node1 label, node2 label, weight)
+    edge records. Labels are checked and made upper case in the same way as read_edge_list. A ValueError is raised if
+    the file isn't a valid graph (including an invalid label or a weight which isn't a positive whole number)."""
+    try:
+        with open(file_path, encoding="utf-8") as file:
+            data = json.load(file)
+        nodes = [(_json_label(node["label"]), float(node["x"]), float(node["y"])) for node in data["nodes"]]
+        edges = []
+        for edge in data["edges"]:
+            weight = edge["weight"]
+            # Rejecting weights such as 2.7 rather than cutting them down to a whole number
+            if isinstance(weight, bool) or isinstance(weight, float) and not weight.is_integer():
+                raise ValueError(f"edge weight {weight} must be an integer")
+            if weight <= 0:
+                raise ValueError(f"edge weight {weight} must be positive")
+            edges.append((_json_label(edge["node1"]), _json_label(edge["node2"]), int(weight)))
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Not a valid JSON graph file ({error}).")
+
+    return nodes, edges
+
+
+def _json_label(label):
+    """Returns a node label from a JSON graph file made upper case, raising a ValueError if it isn't valid"""
+    label = str(label)
+    if not is_valid_label(label):
+        raise ValueError(f"node label '{label}' must only contain letters, digits or underscores")
+    return label.upper()
+
+
+def save_binary(graph, file_path):
+    """Saves a graph in a compact binary format, which is much smaller and quicker to load than the JSON format for
+    large graphs. After a fixed-size header, the file stores (all little-endian):
+    - The node labels as UTF-8 text separated by newlines
+    - The x & y positions of the nodes as an array of doubles (x1, y1, x2, y2, ...)
+    - The edges as an array of 32-bit node positions (node1 of edge 1, node2 of edge 1, ...)
+    - The edge weights as an array of 64-bit integers"""
+
+    node_positions = {} # Dictionary mapping node labels to their position in the list of nodes
+    labels = []
+    coordinates = array("d")
+    for position, node in enumerate(graph.nodes):
+        node_positions[node.label] = position
+        labels.append(node.label)
+        coordinates.append(node.x)
+        coordinates.append(node.y)
+
+    edge_ends = array("i")
+    weights = array("q")
+    for edge in graph.edges:
+        edge_ends.append(node_positions[edge.node1.label])
+        edge_ends.append(node_positions[edge.node2.label])
+        weights.append(edge.weight)
+
+    labels_block = "\n".join(labels).encode("utf-8")
+    # Arrays are stored little-endian whatever the machine's own byte order is
+    if sys.byteorder == "big":
+        for values in (coordinates, edge_ends, weights):
+            values.byteswap()
+
+    with open(file_path, "wb") as file:
+        file.write(BINARY_HEADER.pack(BINARY_MAGIC, len(labels), len(weights), len(labels_block)))
+        file.write(labels_block)
+        coordinates.tofile(file)
+        edge_ends.tofile(file)
+        weights.tofile(file)
+
+
+def read_binary_arrays(file_path):
+    """Reads a graph saved by save_binary straight into arrays, without creating any node or edge records. Returns the
+    list of node labels, the array of node coordinates (x1, y1, x2, y2, ...), the array of edge ends as node positions
+    (node1 of edge 1, node2 of edge 1, ...) and the array of edge weights. A ValueError is raised if the file isn't a
+    valid binary graph file."""
+
+    with open(file_path, "rb") as file:
+        header = file.read(BINARY_HEADER.size)
+        if len(header) != BINARY_HEADER.size:
+            raise ValueError("Not a valid binary graph file (missing header).")
+        magic, node_count, edge_count, labels_length = BINARY_HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise ValueError("Not a valid binary graph file.")
+
+        labels_block = file.read(labels_length)
+        coordinates = array("d")
+        edge_ends = array("i")
+        weights = array("q")
+        try:
+            coordinates.fromfile(file, 2 * node_count)
+            edge_ends.fromfile(file, 2 * edge_count)
+            weights.fromfile(file, edge_count)
+        except EOFError:
+            raise ValueError("Not a valid binary graph file (file is incomplete).")
+
+    if sys.byteorder == "big":
+        for values in (coordinates, edge_ends, weights):
+            values.byteswap()
+    labels = labels_block.decode("utf-8").split("\n") if node_count else []
+    if len(labels) != node_count:
+        raise ValueError("Not a valid binary graph file (wrong number of labels).")
+    # Checking every edge end is the position of a node (a negative position would otherwise wrap around to the end)
+    if edge_ends and (min(edge_ends) < 0 or max(edge_ends) >= node_count):
+        raise ValueError("Not a valid binary graph file (edge between missing nodes).")
+    # Checking every edge weight is positive, in the same way as the other formats
+    if weights and min(weights) <= 0:
+        raise ValueError("Not a valid binary graph file (edge weight which isn't positive).")
+
+    return labels, coordinates, edge_ends, weights
+
+
+def load_binary(file_path):
+    """Reads a graph saved by save_binary, returning (label, x, y) node records and (node1 label, node2 label, weight)
+    edge records. A ValueError is raised if the file isn't a valid binary graph file.
+
+    Reading the file itself is quick, but building an editable Graph from the records creates an object for every node
+    and edge, which takes several seconds for a million edges - only the compact paths load a graph of that size in
+    well under a second. For graphs which are only being solved, load_binary_compact loads the file as a CompactGraph
+    instead, and load_compact_graph memory-maps a file saved by save_compact_graph."""
+    labels, coordinates, edge_ends, weights = read_binary_arrays(file_path)
+
+    nodes = list(zip(labels, coordinates[0::2], coordinates[1::2]))
+    node1_labels = [labels[position] for position in edge_ends[0::2]]
+    node2_labels = [labels[position] for position in edge_ends[1::2]]
+    edges = list(zip(node1_labels, node2_labels, weights))
+
+    return nodes, edges
+
+
+def load_binary_compact(file_path):
+    """Reads a graph saved by save_binary straight into a CompactGraph, without creating any node or edge records. Its
+    CSR arrays still have to be built, so a million edges load in about half a second with NumPy installed (and
+    about three times as long without it, when the arrays are built in plain Python). A ValueError is raised if the
+    file isn't a valid binary graph file."""
+    labels, coordinates, edge_ends, weights = read_binary_arrays(file_path)
+    return CompactGraph(labels, coordinates, edge_ends, weights)
+
+
+# The graph file formats, mapping each file extension to its (load function, save function)
+GRAPH_FILE_FORMATS = {".json": (load_json, save_json),
+                      ".graphbin": (load_binary, save_binary),
+                      ".txt": (read_edge_list, save_edge_list)}
+
+
+def _compact_arrays(node_count, edge_count):
+    """Returns the (attribute name, type code, length) of each array of a compact graph file, in the order they're
+    stored - the 8-byte arrays first, so every array starts on a multiple of its item size"""
+    return (("coordinates", "d", 2 * node_count), ("offsets", "q", node_count + 1), ("weights", "q", 2 * edge_count),
+            ("edge_weights", "q", edge_count), ("neighbours", "i", 2 * edge_count),
+            ("edge_numbers", "i", 2 * edge_count), ("edge_ends", "i", 2 * edge_count))
+
+
+def save_compact_graph(compact_graph, file_path):
+    """Saves a CompactGraph with its CSR arrays, so that load_compact_graph can memory-map them straight back in
+    without building them again. After the same fixed-size header as the binary format, the file stores the node
+    labels as UTF-8 text separated by newlines (padded to a multiple of 8 bytes), then each array in turn (all
+    little-endian)."""
+    node_count = len(compact_graph.labels)
+    edge_count = len(compact_graph.edge_weights)
+    labels_block = "\n".join(compact_graph.labels).encode("utf-8")
+    labels_block += bytes(-(BINARY_HEADER.size + len(labels_block)) % 8)
+
+    with open(file_path, "wb") as file:
+        file.write(BINARY_HEADER.pack(COMPACT_MAGIC, node_count, edge_count, len(labels_block)))
+        file.write(labels_block)
+        for name, type_code, length in _compact_arrays(node_count, edge_count):
+            values = array(type_code, getattr(compact_graph, name))
+            # Arrays are stored little-endian whatever the machine's own byte order is
+            if sys.byteorder == "big":
+                values.byteswap()
+            values.tofile(file)
+
+
+def load_compact_graph(file_path):
+    """Reads a graph saved by save_compact_graph as a CompactGraph. The file is memory-mapped, and the graph's arrays
+    are views of it rather than copies, so loading takes almost no time or memory however large the graph is - the
+    operating system only reads in the parts of the file which are used. (On a big-endian machine the arrays are
+    copied instead, to swap their byte order.) A ValueError is raised if the file isn't a valid compact graph file.
+    Unlike the other loaders, the edges and their weights aren't checked, as that would mean reading the whole file -
+    the file is trusted to have been written by save_compact_graph from a valid graph."""
+
+    with open(file_path, "rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError("Not a valid compact graph file (file is empty).")
+
+    if len(buffer) < BINARY_HEADER.size:
+        raise ValueError("Not a valid compact graph file (missing header).")
+    magic, node_count, edge_count, labels_length = BINARY_HEADER.unpack_from(buffer)
+    if magic != COMPACT_MAGIC:
+        raise ValueError("Not a valid compact graph file.")
+
+    labels_block = buffer[BINARY_HEADER.size:BINARY_HEADER.size + labels_length].rstrip(b"\0")
+    labels = labels_block.decode("utf-8").split("\n") if node_count else []
+    if len(labels) != node_count:
+        raise ValueError("Not a valid compact graph file (wrong number of labels).")
+
+    # Taking a view of the file (or a copy on big-endian machines) for each array
+    arrays = {}
+    position = BINARY_HEADER.size + labels_length
+    for name, type_code, length in _compact_arrays(node_count, edge_count):
+        end = position + length * array(type_code).itemsize
+        if end > len(buffer):
+            raise ValueError("Not a valid compact graph file (file is incomplete).")
+        if sys.byteorder == "big":
+            arrays[name] = array(type_code, buffer[position:end])
+            arrays[name].byteswap()
+        else:
+            arrays[name] = memoryview(buffer)[position:end].cast(type_code)
+        position = end
+
+    csr_arrays = (arrays["offsets"], arrays["neighbours"], arrays["weights"], arrays["edge_numbers"])
+    return CompactGraph(labels, arrays["coordinates"], arrays["edge_ends"], arrays["edge_weights"], csr_arrays,
+                        buffer)
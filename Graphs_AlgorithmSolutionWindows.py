@@ -28,7 +28,6 @@ class MSTWindow(QMainWindow):
                 background-color: white;
             }
         """)
-        self.log_widget.setPlainText("\n".join(log_data))
         splitter.addWidget(self.log_widget)
 
         # Customising splitter
@@ -36,8 +35,15 @@ class MSTWindow(QMainWindow):
         splitter.setStretchFactor(1, 1)
         self.setCentralWidget(splitter)
 
-
         self.node_map = {} # Dictionary to map node labels to its objects in the MST
+        self.show_tree(node_data, edge_data, log_data)
+
+    def show_tree(self, node_data, edge_data, log_data):
+        """Displays the given tree and log, replacing any tree already shown (so the window can be redrawn when the
+        graph it was found from is edited)"""
+        self.scene.clear()
+        self.node_map = {}
+        self.log_widget.setPlainText("\n".join(log_data))
 
         # Adding MST's nodes to solution graph display
         for label, x, y in node_data:
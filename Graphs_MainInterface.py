@@ -1,10 +1,14 @@
+import math
+
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QSplitter, QGraphicsScene, QLineEdit, QTableWidgetItem,
-                             QPushButton, QVBoxLayout, QHBoxLayout, QTableWidget, QMessageBox, QLabel)
+                             QPushButton, QVBoxLayout, QHBoxLayout, QTableWidget, QMessageBox, QLabel, QFileDialog)
 from PyQt5.QtGui  import QPainter, QFont
 from PyQt5.QtCore import Qt
 
-from GraphStructure import Graph, Node, Edge
-from GraphAlgorithms import KruskalsMST, PrimsMST, DijkstrasShortestPath, NearestNeighbour
+from GraphCore import Graph, GraphNode, GraphEdge, is_valid_label
+from GraphStructure import Node, Edge
+from GraphFiles import GRAPH_FILE_FORMATS, load_graph_file, save_graph_file
+from GraphAlgorithms import KruskalsMST, PrimsMST, DynamicMST, DijkstrasShortestPath, NearestNeighbour
 from Graphs_View import GraphView
 from Graphs_AlgorithmSolutionWindows import MSTWindow, DijkstrasWindow
 
@@ -13,7 +17,15 @@ class GraphAlgorithmsWindow(QMainWindow):
     def __init__(self):
         super().__init__()
 
-        self.graph = Graph()
+        self.graph = Graph() # Logical graph (Qt-free) which the algorithms are carried out on
+        self.node_items = {} # Dictionary to map node labels to the displayed node objects wrapping the logical nodes
+        self.edge_items = {} # Dictionary to map logical edge objects to the displayed edge objects wrapping them
+        # Minimum spanning tree kept up to date as the graph is edited, so an open MST solution window can be redrawn
+        # without carrying out Prim's or Kruskal's algorithm again. It's created before the window's own change listener
+        # is registered, so the tree has always been updated by the time the window is told about an edit.
+        self.dynamic_MST = DynamicMST(self.graph)
+        self.MST_window = None # The MST solution window (if one has been opened)
+        self.graph.add_change_listener(self._graph_changed) # Updating the matrix display whenever the graph is edited
         self.setWindowTitle("Graph Algorithms")
         self.setGeometry(100, 100, 1200, 800)
 
@@ -135,6 +147,18 @@ class GraphAlgorithmsWindow(QMainWindow):
         control_layout.addLayout(edges_panel_layout)
         control_layout.addSpacing(space_between_buttons)
 
+        # Import Graph & Save Graph Buttons
+        graph_files_layout = QHBoxLayout()
+        self.import_graph_button = QPushButton("Import Graph")
+        self.import_graph_button.clicked.connect(self.import_graph)
+        self.save_graph_button = QPushButton("Save Graph")
+        self.save_graph_button.clicked.connect(self.save_graph)
+        graph_files_layout.addWidget(self.import_graph_button)
+        graph_files_layout.addSpacing(space_between_parallel)
+        graph_files_layout.addWidget(self.save_graph_button)
+        control_layout.addLayout(graph_files_layout)
+        control_layout.addSpacing(space_between_buttons)
+
         # Clear Graph Button
         self.clear_graph_button = QPushButton("Clear Graph")
         self.clear_graph_button.setStyleSheet(
@@ -153,7 +177,7 @@ class GraphAlgorithmsWindow(QMainWindow):
         # Nearest Neighbour
         nearest_neighbour_layout = QHBoxLayout()
         self.nearest_neighbour_start_node_input = QLineEdit()
-        self.nearest_neighbour_start_node_input.setPlaceholderText("Starting Node")
+        self.nearest_neighbour_start_node_input.setPlaceholderText("Starting Node (blank for all)")
         nearest_neighbour_layout.addWidget(self.nearest_neighbour_start_node_input, 1)
         nearest_neighbour_layout.addSpacing(space_between_parallel)
 
@@ -224,52 +248,44 @@ class GraphAlgorithmsWindow(QMainWindow):
         # Storing label input (capitalising automatically)
         label = self.addnode_label_input.text().upper().strip()
 
-        # Error message if label input is not a single letter
-        if len(label) != 1 or not label.isalpha():
-            QMessageBox.warning(self, "Input Error", "Node label must be a single letter!")
+        # Error message if label input is not made of letters, digits or underscores
+        if not is_valid_label(label):
+            QMessageBox.warning(self, "Input Error", "Node label must only contain letters, digits or underscores!")
             return
         # Error message if node already exists
-        for node in self.graph.nodes:
-            if node.label == label:
-                QMessageBox.warning(self, "Input Error", "Node cannot already exist!")
-                return
+        if self.graph.get_node(label):
+            QMessageBox.warning(self, "Input Error", "Node cannot already exist!")
+            return
 
-        # Adding node to scene and logical graph, then updating matrix display
+        # Adding node to logical graph (which updates the matrix display), then to the scene
         x, y = 0, 0
-        new_node = Node(label, x, y)
-        self.scene.addItem(new_node)
+        new_node = GraphNode(label, x, y)
         self.graph.add_node(new_node)
-        self.update_matrix()
+        self._add_node_item(new_node)
 
     def delete_node(self):
         # Storing label input (capitalising automatically)
         label = self.deletenode_label_input.text().upper().strip()
 
-        # Error message if label input is not a single letter
-        if len(label) != 1 or not label.isalpha():
-            QMessageBox.warning(self, "Input Error", "Node label must be a single letter!")
+        # Error message if label input is not made of letters, digits or underscores
+        if not is_valid_label(label):
+            QMessageBox.warning(self, "Input Error", "Node label must only contain letters, digits or underscores!")
             return
         # Searching for node to delete
-        found = False
-        for node in self.graph.nodes:
-            if node.label == label:
-                found = True
-                node_to_remove = node
+        node_to_remove = self.graph.get_node(label)
         # Error message if node doesn't exist
-        if not found:
+        if not node_to_remove:
             QMessageBox.warning(self, "Input Error", "Node must already exist!")
             return
 
         # Deleting node from logical graph
-        node_to_remove_edges = node_to_remove.edges[:]
+        node_to_remove_edges = list(node_to_remove.edges)
         self.graph.delete_node(node_to_remove)
         # Deleting the node's connected edges from scene
         for edge in node_to_remove_edges:
-            self.scene.removeItem(edge.weight_text)
-            self.scene.removeItem(edge)
-        # Deleting node from scene and updating matrix display
-        self.scene.removeItem(node_to_remove)
-        self.update_matrix()
+            self._remove_edge_item(edge)
+        # Deleting node from scene
+        self.scene.removeItem(self.node_items.pop(label))
 
     def add_edge(self):
         # Taking input for edge node's start & end label
@@ -286,9 +302,9 @@ class GraphAlgorithmsWindow(QMainWindow):
         if weight <= 0:
             QMessageBox.warning(self, "Input Error", "Edge weight must be positive!")
             return
-        # Error message if label inputs are not a single letter
-        if len(start_label) != 1 or not start_label.isalpha() or len(end_label) != 1 or not end_label.isalpha():
-            QMessageBox.warning(self, "Input Error", "Node labels must be a single letter!")
+        # Error message if label inputs are not made of letters, digits or underscores
+        if not is_valid_label(start_label) or not is_valid_label(end_label):
+            QMessageBox.warning(self, "Input Error", "Node labels must only contain letters, digits or underscores!")
             return
         # Error message if inputted start node and end node is same
         if start_label == end_label:
@@ -296,44 +312,31 @@ class GraphAlgorithmsWindow(QMainWindow):
             return
 
         # Locating the start and end nodes
-        start_node = None
-        for node in self.graph.nodes:
-            if node.label == start_label:
-                start_node = node
-                break
-        end_node = None
-        for node in self.graph.nodes:
-            if node.label == end_label:
-                end_node = node
-                break
+        start_node = self.graph.get_node(start_label)
+        end_node = self.graph.get_node(end_label)
         # Error messages if either of the inputted nodes aren't found
         if not start_node or not end_node:
             QMessageBox.warning(self, "Input Error", "Both nodes must exist!")
             return
 
         # Error message if edge already exists
-        for edge in self.graph.edges:
-            if edge.node1.label == start_label and edge.node2.label == end_label:
-                QMessageBox.warning(self, "Input Error", "Edge cannot already exist!")
-                return
-            elif edge.node2.label == start_label and edge.node1.label == end_label:
-                QMessageBox.warning(self, "Input Error", "Edge cannot already exist!")
-                return
+        if self.graph.has_edge(start_label, end_label):
+            QMessageBox.warning(self, "Input Error", "Edge cannot already exist!")
+            return
 
-        # Adding the edge to the scene and logical graph then updating matrix display
-        new_edge = Edge(weight, start_node, end_node, self.scene)
-        self.scene.addItem(new_edge)
+        # Adding the edge to the logical graph (which updates the matrix display) then to the scene
+        new_edge = GraphEdge(weight, start_node, end_node)
         self.graph.add_edge(new_edge)
-        self.update_matrix()
+        self._add_edge_item(new_edge)
 
     def delete_edge(self):
         # Taking input for edge node's start & end label
         start_label = self.deleteedge_startnode_input.text().upper().strip()
         end_label = self.deleteedge_endnode_input.text().upper().strip()
 
-        # Error message if label inputs are not a single letter
-        if len(start_label) != 1 or not start_label.isalpha() or len(end_label) != 1 or not end_label.isalpha():
-            QMessageBox.warning(self, "Input Error", "Node labels must be a single letter!")
+        # Error message if label inputs are not made of letters, digits or underscores
+        if not is_valid_label(start_label) or not is_valid_label(end_label):
+            QMessageBox.warning(self, "Input Error", "Node labels must only contain letters, digits or underscores!")
             return
         # Error message if inputted start node and end node is same
         if start_label == end_label:
@@ -341,40 +344,153 @@ class GraphAlgorithmsWindow(QMainWindow):
             return
 
         # Locating the edge
-        edge_to_remove = None
-        for edge in self.graph.edges:
-            if edge.node1.label == start_label and edge.node2.label == end_label:
-                edge_to_remove = edge
-                break
-        if not edge_to_remove:
-            for edge in self.graph.edges:
-                if edge.node2.label == start_label and edge.node1.label == end_label:
-                    edge_to_remove = edge
-                    break
+        edge_to_remove = self.graph.get_edge(start_label, end_label)
 
         # Error message if the edge is not found
         if not edge_to_remove:
             QMessageBox.warning(self, "Input Error", "Edge must already exist!")
             return
 
-        # Deleting the edge from the scene and logical graph then updating matrix display
+        # Deleting the edge from the logical graph (which updates the matrix display) then from the scene
         self.graph.delete_edge(edge_to_remove)
-        self.scene.removeItem(edge_to_remove.weight_text)
-        self.scene.removeItem(edge_to_remove)
-        self.update_matrix()
+        self._remove_edge_item(edge_to_remove)
 
     def clear_graph(self):
-        # Deleting all edges
-        for edge in list(self.graph.edges):
-            self.graph.delete_edge(edge)
-            self.scene.removeItem(edge.weight_text)
-            self.scene.removeItem(edge)
-        # Deleting all nodes
-        for node in list(self.graph.nodes):
-            self.graph.delete_node(node)
-            self.scene.removeItem(node)
-        # Updating the matrix
+        # Deleting everything as one batch edit so the matrix is only updated once at the end
+        with self.graph.batch_edit():
+            # Deleting all edges
+            for edge in list(self.graph.edges):
+                self.graph.delete_edge(edge)
+                self._remove_edge_item(edge)
+            # Deleting all nodes
+            for node in list(self.graph.nodes):
+                self.graph.delete_node(node)
+                self.scene.removeItem(self.node_items.pop(node.label))
+
+    def import_graph(self):
+        # Choosing the graph file to import
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import Graph", "",
+                                                   "Graph Files (*.json *.graphbin *.txt);;All Files (*)")
+        if not file_path:
+            return
+
+        # Reading the nodes and edges from the file (in the format given by its extension)
+        try:
+            nodes, edges = load_graph_file(file_path)
+        # Error message if the file can't be read
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Import Error", str(error))
+            return
+        # Error message if any node label is not made of letters, digits or underscores
+        for label, x, y in nodes:
+            if not is_valid_label(label):
+                QMessageBox.warning(self, "Import Error", "Node labels must only contain letters, digits or underscores!")
+                return
+
+        # Replacing the current graph with the imported one
+        self.load_graph(nodes, edges)
+
+    def save_graph(self):
+        # Error message if the graph is empty
+        if not self.graph.nodes:
+            QMessageBox.warning(self, "Input Error", "The graph cannot be empty")
+            return
+
+        # Choosing where to save the graph and in which format
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Save Graph", "", "JSON Graph (*.json);;Binary Graph (*.graphbin);;Text Graph (*.txt)")
+        if not file_path:
+            return
+        # Adding the extension of the chosen format (given in the filter's brackets) if it wasn't typed in
+        if not file_path.lower().endswith(tuple(GRAPH_FILE_FORMATS)):
+            file_path += selected_filter[selected_filter.index("(*") + 2:-1]
+
+        # Saving the graph (with its node positions) to the file
+        try:
+            save_graph_file(self.graph, file_path)
+        # Error message if the file can't be written
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Save Error", str(error))
+
+    def load_graph(self, nodes, edges):
+        """Replaces the current graph with the given (label, x, y) node records and (node1 label, node2 label, weight)
+        edge records. The whole graph is loaded as one batch edit, so the matrix display is only updated once rather
+        than after every node and edge. Any nodes without a position are spaced out around a circle."""
+
+        # Placing nodes without a position evenly around a circle
+        radius = 60 * len(nodes) / math.pi
+        positioned_nodes = []
+        for index, (label, x, y) in enumerate(nodes):
+            if x is None or y is None:
+                angle = 2 * math.pi * index / len(nodes)
+                x = radius * math.cos(angle)
+                y = radius * math.sin(angle)
+            positioned_nodes.append((label, x, y))
+
+        # Checking the records make a valid graph before the current graph is cleared, so it's kept if they don't
+        try:
+            Graph().check_records(positioned_nodes, edges)
+        # Error message if the graph is invalid (e.g. repeated edges)
+        except ValueError as error:
+            QMessageBox.warning(self, "Import Error", str(error))
+            return
+
+        with self.graph.batch_edit():
+            self.clear_graph()
+            new_nodes, new_edges = self.graph.bulk_load(positioned_nodes, edges)
+
+            # Adding the loaded nodes and edges to the scene
+            self.view.setUpdatesEnabled(False)
+            for node in new_nodes:
+                self._add_node_item(node)
+            for edge in new_edges:
+                self._add_edge_item(edge)
+            self.view.setUpdatesEnabled(True)
+
+    def _graph_changed(self, change, item):
+        """Called by the logical graph whenever it is edited (or once at the end of a batch of edits)"""
+        # Updating the displayed weight of an edge whose weight has been changed
+        if change == "change_weight" and item in self.edge_items:
+            self.edge_items[item].set_weight(item.weight)
         self.update_matrix()
+        # Redrawing the tree shown in an open MST solution window
+        if self.MST_window is not None and self.MST_window.isVisible():
+            self._update_MST_window()
+
+    def _update_MST_window(self):
+        """Redraws the open MST solution window with the minimum spanning tree kept by the dynamic MST, so the effect of an
+        edit on the tree is shown straight away. The tree's edges are read directly rather than the algorithm being
+        carried out again, and the log then gives the updated tree's edges and total weight."""
+        node_data = []
+        for node in self.graph.nodes:
+            node_data.append((node.label, node.x, node.y))
+        edge_data = []
+        for edge in self.dynamic_MST.tree_edges:
+            edge_data.append((edge.node1.label, edge.node2.label, edge.weight, edge.edge_label))
+        log_data = ["Updated after editing the graph:",
+                    "MST Edges: " + ", ".join(edge[3] for edge in edge_data),
+                    "Total MST Weight: " + str(self.dynamic_MST.total_weight)]
+        self.MST_window.show_tree(node_data, edge_data, log_data)
+
+    def _add_node_item(self, logical_node):
+        """Displays a logical node (which has been added to the graph) on the scene"""
+        node_item = Node(logical_node.label, logical_node.x, logical_node.y, logical_node, self.graph)
+        self.scene.addItem(node_item)
+        self.node_items[logical_node.label] = node_item
+
+    def _add_edge_item(self, logical_edge):
+        """Displays a logical edge (which has been added to the graph) on the scene between its displayed nodes"""
+        edge_item = Edge(logical_edge.weight, self.node_items[logical_edge.node1.label],
+                         self.node_items[logical_edge.node2.label], self.scene, logical_edge)
+        self.edge_items[logical_edge] = edge_item
+
+    def _remove_edge_item(self, logical_edge):
+        """Removes the displayed edge wrapping a logical edge (which has been deleted from the graph) from the scene"""
+        edge_item = self.edge_items.pop(logical_edge)
+        edge_item.node1.edges.remove(edge_item)
+        edge_item.node2.edges.remove(edge_item)
+        self.scene.removeItem(edge_item.weight_text)
+        self.scene.removeItem(edge_item)
 
 
     def update_matrix(self):
@@ -428,12 +544,13 @@ class GraphAlgorithmsWindow(QMainWindow):
             }
         """)
 
-        # Filling in matrix (retrieving data from logical graph's nested dictionary matrix)
+        # Filling in matrix (retrieving data from logical graph's nested dictionary matrix, built from its adjacency)
+        distance_matrix = self.graph.distance_matrix
         for i, node1 in enumerate(nodes):
             self.matrix_table.setRowHeight(i, row_height)
             for j, node2 in enumerate(nodes):
                 self.matrix_table.setColumnWidth(j, column_width)
-                value = self.graph.distance_matrix[node1.label][node2.label]
+                value = distance_matrix[node1.label][node2.label]
                 display_text = "-" if value == 0 else str(value) # Replacing zero in logical matrix with dash in display
                 item = QTableWidgetItem(display_text)
                 item.setTextAlignment(Qt.AlignCenter)
@@ -449,27 +566,29 @@ class GraphAlgorithmsWindow(QMainWindow):
             QMessageBox.warning(self, "Input Error", "The graph cannot be empty")
             return
 
-        # Locating the starting node by the inputted label
-        found = False
-        for node in self.graph.nodes:
-            if node.label == start_label:
-                found = True
-                starting_node = node
-        # Error message if node doesn't exist
-        if not found:
-            QMessageBox.warning(self, "Input Error", "Starting Node must exist in the graph!")
-            return
+        # Calling Nearest Neighbour's algorithm from every node if no starting node is entered (reusing the result if
+        # it has already been found for the graph as it is)
+        if not start_label:
+            output_path = self.graph.cached_result("nearest_neighbour", (start_label,),
+                                                   lambda: NearestNeighbour(self.graph).find_all_starts())
+        else:
+            # Locating the starting node by the inputted label
+            starting_node = self.graph.get_node(start_label)
+            # Error message if node doesn't exist
+            if not starting_node:
+                QMessageBox.warning(self, "Input Error", "Starting Node must exist in the graph!")
+                return
 
-        # Calling Nearest Neighbour's algorithm on the constructed graph
-        algorithm = NearestNeighbour(self.graph)
-        output_path = algorithm.find_path(starting_node)
+            # Calling Nearest Neighbour's algorithm on the constructed graph
+            output_path = self.graph.cached_result("nearest_neighbour", (start_label,),
+                                                   lambda: NearestNeighbour(self.graph).find_path(starting_node))
 
         # Storing logical and visual data for nodes & edges and log steps
         node_data = []
         for node in output_path.nodes:
             label = node.label
-            x = node.scenePos().x()
-            y = node.scenePos().y()
+            x = node.x
+            y = node.y
             node_data.append((label, x, y))
         edge_data = []
         for edge in output_path.edges:
@@ -493,26 +612,22 @@ class GraphAlgorithmsWindow(QMainWindow):
             return
 
         # Locating the starting node by the inputted label
-        found = False
-        for node in self.graph.nodes:
-            if node.label == start_label:
-                found = True
-                starting_node = node
+        starting_node = self.graph.get_node(start_label)
         # Error message if node doesn't exist
-        if not found:
+        if not starting_node:
             QMessageBox.warning(self, "Input Error", "Starting Node must exist in the graph!")
             return
 
-        # Calling Prim's algorithm on the constructed graph
-        algorithm = PrimsMST(self.graph)
-        output_MST = algorithm.find_MST(starting_node)
+        # Calling Prim's algorithm on the constructed graph (reusing the result if it has already been found)
+        output_MST = self.graph.cached_result("prims_MST", (start_label,),
+                                              lambda: PrimsMST(self.graph).find_MST(starting_node))
 
         # Storing logical and visual data for nodes & edges and log steps
         node_data = []
         for node in output_MST.nodes:
             label = node.label
-            x = node.scenePos().x()
-            y = node.scenePos().y()
+            x = node.x
+            y = node.y
             node_data.append((label, x, y))
         edge_data = []
         for edge in output_MST.edges:
@@ -533,16 +648,15 @@ class GraphAlgorithmsWindow(QMainWindow):
             QMessageBox.warning(self, "Input Error", "The graph cannot be empty")
             return
 
-        # Calling Kruskal's algorithm on the constructed graph
-        algorithm = KruskalsMST(self.graph)
-        output_MST = algorithm.find_MST()
+        # Calling Kruskal's algorithm on the constructed graph (reusing the result if it has already been found)
+        output_MST = self.graph.cached_result("kruskals_MST", (), lambda: KruskalsMST(self.graph).find_MST())
 
         # Storing logical and visual data for nodes & edges and log steps
         node_data = []
         for node in output_MST.nodes:
             label = node.label
-            x = node.scenePos().x()
-            y = node.scenePos().y()
+            x = node.x
+            y = node.y
             node_data.append((label, x, y))
         edge_data = []
         for edge in output_MST.edges:
@@ -557,50 +671,45 @@ class GraphAlgorithmsWindow(QMainWindow):
         self.MST_window = MSTWindow(node_data, edge_data, log_data)
         self.MST_window.show()
 
+    def _find_shortest_path(self, start_node, end_node):
+        """Carries out Dijkstra's algorithm between the two nodes, returning the algorithm object holding its tables"""
+        algorithm = DijkstrasShortestPath(self.graph)
+        algorithm.find_shortest_path(start_node, end_node)
+        return algorithm
+
     def show_dijkstra_shortest_path(self):
         # Storing Start Node & End Node labels inputs (capitalising automatically)
         start_label = self.dijkstra_start_node_input.text().upper().strip()
         end_label = self.dijkstra_end_node_input.text().upper().strip()
 
-        # Error message if label input is not a single letter
-        if len(start_label) != 1 or not start_label.isalpha() or len(end_label) != 1 or not end_label.isalpha():
-            QMessageBox.warning(self, "Input Error", "Node labels must be a single letter!")
+        # Error message if label inputs are not made of letters, digits or underscores
+        if not is_valid_label(start_label) or not is_valid_label(end_label):
+            QMessageBox.warning(self, "Input Error", "Node labels must only contain letters, digits or underscores!")
             return
 
         # Locating the start and end nodes
-        start_node = None
-        for node in self.graph.nodes:
-            if node.label == start_label:
-                start_node = node
-                break
-        end_node = None
-        for node in self.graph.nodes:
-            if node.label == end_label:
-                end_node = node
-                break
+        start_node = self.graph.get_node(start_label)
+        end_node = self.graph.get_node(end_label)
         # Error messages if either of the inputted nodes aren't found
         if not start_node or not end_node:
             QMessageBox.warning(self, "Input Error", "Both nodes must exist!")
             return
 
-        # Calling Dijkstra's algorithm on the inputted graph
-        algorithm = DijkstrasShortestPath(self.graph)
+        # Calling Dijkstra's algorithm on the inputted graph (reusing the result if it has already been found)
+        algorithm = self.graph.cached_result("dijkstras_shortest_path", (start_label, end_label),
+                                             lambda: self._find_shortest_path(start_node, end_node))
         # Storing returned data for solution
-        shortest_path, total_weight, labelling_orders, final_labels, working_values_list = algorithm.find_shortest_path(start_node, end_node)
+        shortest_path = algorithm.shortest_path
 
         # Copy nodes logical and visuals data from the inputted graph for the shortest path graph display
         path_nodes = []
         for label in shortest_path:
-            inputgraph_node = None
             # Locating node from input graph
-            for node in self.graph.nodes:
-                if node.label == label:
-                    inputgraph_node = node
-                    break
+            inputgraph_node = self.graph.get_node(label)
             # Copying it for the solution path display
             if inputgraph_node:
-                x = inputgraph_node.scenePos().x()
-                y = inputgraph_node.scenePos().y()
+                x = inputgraph_node.x
+                y = inputgraph_node.y
                 node_copy = Node(label, x, y)
                 path_nodes.append(node_copy)
 
@@ -610,7 +719,7 @@ class GraphAlgorithmsWindow(QMainWindow):
             # Identifying edges present in the path
             node1_label = shortest_path[i - 1]
             node2_label = shortest_path[i]
-            weight = self.graph.distance_matrix[node1_label][node2_label]
+            weight = self.graph.adjacency[node1_label][node2_label]
             # Locate nodes of the path's edges
             node1 = None
             node2 = None
@@ -624,50 +733,9 @@ class GraphAlgorithmsWindow(QMainWindow):
                 edge = Edge(weight, node1, node2, None)
                 path_edges.append(edge)
 
-        # Storing the algorithm's solution steps for the log including Dijkstra's tables:
-
-        # Shortest Path and its Total Weight as lines in the log ('no path' with infinity weight if doesn't exist)
-        log = []
-        if shortest_path:
-            shortest_path_str = ""
-            for label in shortest_path:
-                shortest_path_str += label
-        else:
-            shortest_path_str = "No Path"
-        log.append("Shortest Path: " + shortest_path_str)
-
-        if total_weight == float('inf'):
-            log.append("Total Weight: ∞")
-        else:
-            log.append("Total Weight: " + str(total_weight))
-
-        # Storing data in Dijkstras working tables for the log (row for each node)
-        table_data = []
-        sorted_labels = sorted(labelling_orders.keys())
-
-        # Storing labelling order, final label, and working values list for each node
-        for label in sorted_labels:
-            # Adding labelling orders
-            if labelling_orders[label] is not None:
-                order = labelling_orders[label]
-            else:
-                order = "-"
-            # Adding final labels
-            if final_labels[label] == float('inf'):
-                final_value = "∞"
-            else:
-                final_value = final_labels[label]
-            # Adding working values
-            working_values = working_values_list[label]
-            working_values_string = ""
-            for value in working_values:
-                working_values_string += str(value) + ", " # Working values seperated by commas
-            if working_values_string.endswith(", "):
-                working_values_string = working_values_string[:-2] # Remove comma from end
-
-            # Add rows to the table for each node
-            table_data.append((label, order, final_value, working_values_string))
-
+        # Storing the algorithm's solution steps for the log including Dijkstra's tables
+        log = algorithm.solution_log()
+        table_data = algorithm.table_data()
 
         # Construct graph for path to display in solution window
         edge_data = []
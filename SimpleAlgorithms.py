@@ -1,4 +1,7 @@
+import bisect
+import heapq
 import math
+import time
 
 
 class Sort:
@@ -19,59 +22,65 @@ class BubbleSort(Sort):
     - The list is sorted once we have a 'blank pass' with no swaps being made
 
     For the purpose of the solution log for step-by-step working, the list is written out after each pass, along with
-    the number of swaps of the pass - upto and including the blank pass with no swaps."""
+    the number of swaps of the pass - upto and including the blank pass with no swaps.
+
+    The passes are carried out lazily by generators, one pass each time the next is asked for, so the working can be
+    displayed as it's produced without every pass of a long list being kept in memory at once:
+    - passes yields (list after the pass, number of swaps) for each pass
+    - pass_swaps yields only the positions swapped in each pass (position i meaning the items at i and i + 1 were
+    swapped, in the order the swaps were made) - applying them in turn to the list gives the list after each pass
+    The ascending and descending methods collect every pass into a list for the solution log."""
 
     def ascending(self):
-        current_list = self.items_list.copy()
-        log = []
-        sorted = False
+        return list(self.passes())
 
-        # Carrying out passes until the list has been sorted
-        while sorted == False:
-            swaps = 0
-            # Iterating through list
-            for index in range(len(current_list) - 1):
-                # Comparing adjacent elements
-                if current_list[index] > current_list[index + 1]:
-                    # Swapping if needed and updating swaps count
-                    smaller = current_list[index + 1]
-                    current_list[index + 1] = current_list[index]
-                    current_list[index] = smaller
-                    swaps += 1
-            # Adding pass with number of swaps to the log
-            log.append((current_list.copy(), swaps))
+    def descending(self):
+        return list(self.passes(descending=True))
 
-            # End Bubble Sort after blank pass has occurred
-            if swaps == 0:
-                sorted = True
+    def passes(self, descending=False):
+        """Generator which yields (list after the pass, number of swaps) for each pass of the Bubble Sort"""
+        for current_list, swapped_positions in self._sort_passes(descending):
+            yield current_list.copy(), len(swapped_positions)
 
-        return log
+    def pass_swaps(self, descending=False):
+        """Generator which yields the list of positions swapped in each pass of the Bubble Sort"""
+        for current_list, swapped_positions in self._sort_passes(descending):
+            yield swapped_positions
 
-    def descending(self):
+    def _sort_passes(self, descending):
+        """Carries out the passes of the Bubble Sort, yielding the list being sorted (not a copy) and the positions
+        swapped after each pass"""
         current_list = self.items_list.copy()
-        log = []
         sorted = False
 
         # Carrying out passes until the list has been sorted
         while sorted == False:
-            swaps = 0
+            swapped_positions = []
             # Iterating through list
             for index in range(len(current_list) - 1):
                 # Comparing adjacent elements
-                if current_list[index] < current_list[index + 1]:
-                    # Swapping if needed and updating swaps count
-                    bigger = current_list[index + 1]
-                    current_list[index + 1] = current_list[index]
-                    current_list[index] = bigger
-                    swaps += 1
-            # Adding pass with number of swaps to the log
-            log.append((current_list.copy(), swaps))
+                if (current_list[index] < current_list[index + 1] if descending
+                        else current_list[index] > current_list[index + 1]):
+                    # Swapping if needed and recording the swap
+                    current_list[index], current_list[index + 1] = current_list[index + 1], current_list[index]
+                    swapped_positions.append(index)
+            # Giving the pass with its swaps
+            yield current_list, swapped_positions
 
             # End Bubble Sort after blank pass has occurred
-            if swaps == 0:
+            if not swapped_positions:
                 sorted = True
 
-        return log
+    def log_lines(self, sort_log):
+        """Returns the step-by-step working of a sort log (from ascending or descending, or the passes generator) as
+        plain lines of text, in the same layout as the Simple Algorithms window: the original list, then the list after
+        each pass with its number of swaps, then the sort being complete."""
+        lines = [str(self.items_list), "", ""]
+        for state, swaps in sort_log:
+            lines.append(f"{state}   →   {swaps} swaps")
+            lines.append("")
+        lines.append("No Swaps - Sort Complete")
+        return lines
 
 
 class Bin:
@@ -87,11 +96,79 @@ class Bin:
         self.storage += item
 
 
+class FirstFitTree:
+    """A segment tree used by the First-Fit algorithm to find the first bin an item fits into without checking every
+    bin in turn. It's a complete binary tree stored in a list, where the leaves are the remaining space of each bin
+    (in order) and every other entry is the largest remaining space of the two entries below it - so the root is the
+    most space left in any bin.
+
+    To find the first bin with enough space for an item, the tree is followed down from the root, going to the left
+    whenever the left half has a bin with enough space and otherwise to the right. The remaining space of the chosen
+    bin is then reduced and the entries above it updated. Both take O(log n) steps, rather than the O(bins) steps of
+    checking each bin, so packing n items takes O(n log n) steps overall.
+
+    There is a leaf for as many bins as there could be (one per item), and the bins which haven't been opened yet
+    have all of their space remaining. The first bin with enough space is therefore either the first open bin the item
+    fits into, or the next new bin if it doesn't fit into any - exactly the bin the First-Fit algorithm chooses."""
+
+    def __init__(self, capacity, max_bins):
+        self.capacity = capacity
+        self.bin_count = 0 # Number of bins opened so far
+        self.leaf_start = 1 # Position of the first leaf (the number of leaves, rounded up to a power of 2)
+        while self.leaf_start < max_bins:
+            self.leaf_start *= 2
+        self.tree = [capacity] * (2 * self.leaf_start) # Root at position 1, with the children of i at 2i and 2i + 1
+
+    def place(self, item):
+        """Places an item into the first bin it fits into, returning the bin's position (which is the number of bins
+        opened before if a new bin is needed)"""
+        tree = self.tree
+        leaf_start = self.leaf_start
+
+        if tree[1] >= item:
+            # Following the tree down to the first leaf with enough space
+            position = 1
+            while position < leaf_start:
+                position *= 2
+                if tree[position] < item:
+                    position += 1
+        else:
+            # An item larger than the bin capacity still goes into a new bin of its own
+            position = leaf_start + self.bin_count
+        bin_index = position - leaf_start
+        if bin_index == self.bin_count:
+            self.bin_count += 1
+
+        # Reducing the bin's remaining space, then updating the largest remaining space above it
+        tree[position] -= item
+        position //= 2
+        while position:
+            largest = max(tree[2 * position], tree[2 * position + 1])
+            if tree[position] == largest:
+                break # Nothing further up changes
+            tree[position] = largest
+            position //= 2
+        return bin_index
+
+
 class BinPacking:
     """Contains the Bin-Packing algorithms including First-Fit, First-Fit-Decreasing and also calculating
-    a Lower Bound for a bin-packing scenario."""
+    a Lower Bound for a bin-packing scenario. The other heuristics Best-Fit, Best-Fit-Decreasing, Worst-Fit, Next-Fit
+    and Full-Bin are also included so that the number of bins each uses can be compared on the same items."""
+
+    MAX_FULL_BIN_WORK = 2 * 10 ** 6 # Largest number of items × bin capacity Full-Bin packing is carried out for
 
     def __init__(self, items_list, capacity):
+        # Error messages for a bin capacity or an item which can't be packed (an item of 0 or less would make the
+        # algorithms divide by zero or never finish)
+        if capacity <= 0:
+            raise ValueError("Bin capacity must be positive.")
+        for position, weight in enumerate(items_list, start=1):
+            if weight <= 0:
+                raise ValueError(f"Item #{position} of weight {weight} must be positive")
+            if weight > capacity:
+                raise ValueError(f"Item #{position} of weight {weight} cannot be larger than the Bin Capacity")
+
         self.items_list = items_list
         self.capacity = capacity
 
@@ -107,48 +184,548 @@ class BinPacking:
 
         return total_weight, self.capacity, lower_bound_value
 
+    def martello_toth_lower_bound(self):
+        """The Martello-Toth lower bound (L2) is a stronger lower bound than dividing the total weight by the capacity,
+        since it also counts the bins which large items must have to themselves. For a value α (up to half the
+        capacity), the items are split into:
+        - J1: items larger than capacity - α, which no item of weight α or more can share a bin with
+        - J2: items larger than half the capacity (but not in J1), which must each be in a different bin
+        - J3: items from α up to half the capacity, which can only go into the J2 bins' space or into new bins
+        Every J1 and J2 item needs a bin of its own, and the J3 items which don't fit into the space left in the J2
+        bins need at least (J3's total weight - J2's space left) / capacity more bins, rounded up. The bound is the
+        largest of these over α = 0 and each item weight up to half the capacity.
+
+        The items are sorted with running totals of their weights, so each value of α only takes a few bisections and
+        the bound is found in O(n log n) steps."""
+
+        capacity = self.capacity
+        sorted_items = sorted(self.items_list)
+        # running_totals[i] is the total weight of the i smallest items
+        running_totals = [0]
+        for item in sorted_items:
+            running_totals.append(running_totals[-1] + item)
+
+        # Position of the first item larger than half the capacity (J1 and J2 are the items from here on)
+        half_position = bisect.bisect_right(sorted_items, capacity // 2)
+        # α = 0 gives the weight bound, so it's the starting value
+        best_bound = math.ceil(running_totals[-1] / capacity)
+
+        alpha_values = set(sorted_items[:half_position])
+        alpha_values.add(0)
+        for alpha in alpha_values:
+            # J1 are the items from j1_position onwards, J2 from half_position up to j1_position
+            j1_position = max(bisect.bisect_right(sorted_items, capacity - alpha), half_position)
+            j3_position = bisect.bisect_left(sorted_items, alpha)
+            j2_count = j1_position - half_position
+            j2_space_left = j2_count * capacity - (running_totals[j1_position] - running_totals[half_position])
+            j3_weight = running_totals[half_position] - running_totals[j3_position]
+
+            bound = len(sorted_items) - half_position + max(0, math.ceil((j3_weight - j2_space_left) / capacity))
+            best_bound = max(best_bound, bound)
+
+        return best_bound
+
     def first_fit(self):
         """The First-Fit algorithm works by taking each item and traversing through the bins and seeing the
         first bin in which it would fit. If it cannot fit in the existing bins, a new bin is created.
-        This is repeated until all the items have been packed into bins."""
+        This is repeated until all the items have been packed into bins.
+
+        Rather than traversing through every bin for each item, the first bin the item fits into is found with a
+        FirstFitTree of the bins' remaining space, so large lists of items are packed in O(n log n) steps."""
 
         bins = []
+        bin_tree = FirstFitTree(self.capacity, len(self.items_list))
 
         # Traversing through the inputted list until all items have been added to bins
         for item in self.items_list:
-            placed = False
-
-            # Traversing through the bins
-            for bin in bins:
-                # Adding item to a bin if there is enough space and terminating traversal
-                if bin.storage + item <= bin.capacity:
-                    bin.insert_item(item)
-                    placed = True
-                    break
+            bin_index = bin_tree.place(item)
 
             # Creating a new bin if it could not be placed into any of the existing bins
-            if not placed:
-                new_bin = Bin(self.capacity)
-                new_bin.insert_item(item)
-                bins.append(new_bin)
+            if bin_index == len(bins):
+                bins.append(Bin(self.capacity))
+            bins[bin_index].insert_item(item)
 
         return bins
 
 
-    def first_fit_decreasing(self):
+    def first_fit_decreasing(self, record_sort=True):
         """The First-Fit-Decreasing algorithm works by first sorting the list into descending order and then carrying
         out the First-Fit algorithm on the sorted list. In exam questions, the descending sort is done using a
         bubble sort which the students must carry out, so this has been incorporated into the First-Fit-Decreasing
-        solution."""
+        solution.
 
-        # Sorting the list into descending order via bubble sort
-        sorter = BubbleSort(self.items_list)
-        sort_log = sorter.descending()
-        sorted_list = sort_log[-1][0]
+        The bubble sort takes O(n²) steps and keeps a copy of the list after every pass, so if 'record_sort' is False
+        (when the working of the sort isn't being shown) the list is instead sorted with Python's built-in stable
+        O(n log n) sort and the sort log is None. The sorted list, and so the packed bins, are the same either way."""
+
+        sort_log, sorted_list = self._sort_decreasing(record_sort)
 
         # Carrying out first-fit on the sorted list with the inputted bin capacity
         bins = BinPacking(sorted_list, self.capacity).first_fit()
 
         return sort_log, sorted_list, bins
 
+    def best_fit(self):
+        """The Best-Fit algorithm works by placing each item into the bin it fits into with the least space left
+        (the first such bin if there are several), creating a new bin if it doesn't fit into any.
+
+        Rather than checking every bin for each item, the bins are grouped by their remaining space: a sorted list of
+        the different amounts of remaining space (searched by bisection), each with a heap of the positions of the bins
+        with that much space left. The smallest remaining space the item fits into is found by bisection and its first
+        bin taken from the heap, so each item takes O(log n) steps (plus shifting the sorted list when an amount of
+        space is added or removed, which is at most the number of different amounts)."""
+
+        bins = []
+        space_amounts = [] # Sorted list of the different amounts of space left in the bins
+        bins_with_space = {} # Dictionary mapping each amount of space left to a heap of the positions of those bins
+
+        for item in self.items_list:
+            amount_index = bisect.bisect_left(space_amounts, item)
+            if amount_index < len(space_amounts):
+                # Taking the first bin with the least space left which the item fits into
+                space_left = space_amounts[amount_index]
+                bin_positions = bins_with_space[space_left]
+                bin_index = heapq.heappop(bin_positions)
+                if not bin_positions:
+                    del bins_with_space[space_left]
+                    del space_amounts[amount_index]
+            else:
+                # Creating a new bin if it could not be placed into any of the existing bins
+                bin_index = len(bins)
+                bins.append(Bin(self.capacity))
+            bins[bin_index].insert_item(item)
+
+            # Recording the bin's new amount of space left (full bins are left out since nothing more fits)
+            space_left = self.capacity - bins[bin_index].storage
+            if space_left > 0:
+                if space_left not in bins_with_space:
+                    bins_with_space[space_left] = []
+                    bisect.insort(space_amounts, space_left)
+                heapq.heappush(bins_with_space[space_left], bin_index)
+
+        return bins
+
+    def best_fit_decreasing(self, record_sort=True):
+        """The Best-Fit-Decreasing algorithm sorts the list into descending order (in the same way as First-Fit-
+        Decreasing) and then carries out the Best-Fit algorithm on the sorted list"""
+
+        sort_log, sorted_list = self._sort_decreasing(record_sort)
+        bins = BinPacking(sorted_list, self.capacity).best_fit()
+
+        return sort_log, sorted_list, bins
+
+    def worst_fit(self):
+        """The Worst-Fit algorithm works by placing each item into the bin with the most space left (the first such bin
+        if there are several), as long as it fits, otherwise creating a new bin. The bins are kept in a max-heap of
+        their remaining space, so the bin with the most space left is found in O(log n) steps."""
+
+        bins = []
+        space_heap = [] # Heap of (negative space left, bin position) so the most space left is at the top
+
+        for item in self.items_list:
+            if space_heap and -space_heap[0][0] >= item:
+                bin_index = heapq.heappop(space_heap)[1]
+            else:
+                # Creating a new bin if it could not be placed into the emptiest bin
+                bin_index = len(bins)
+                bins.append(Bin(self.capacity))
+            bins[bin_index].insert_item(item)
+            heapq.heappush(space_heap, (bins[bin_index].storage - self.capacity, bin_index))
+
+        return bins
+
+    def next_fit(self):
+        """The Next-Fit algorithm only ever considers the current bin: each item is placed into it if it fits,
+        otherwise the current bin is closed and the item placed into a new bin. This takes O(n) steps, but usually
+        uses more bins than the other algorithms."""
+
+        bins = []
+        for item in self.items_list:
+            if not bins or bins[-1].storage + item > self.capacity:
+                bins.append(Bin(self.capacity))
+            bins[-1].insert_item(item)
 
+        return bins
+
+    def full_bin(self):
+        """Full-Bin packing works by looking for combinations of items which fill a bin exactly, putting each such
+        combination into a bin of its own, and then packing the remaining items with the First-Fit algorithm.
+
+        The combinations are searched for with the items in descending order, so the largest items are used first.
+        Each search is a subset sum, with the items of the same weight grouped together: for each group (from the
+        largest weight), the totals which can be made from the items in that group and the groups after it are stored
+        as the bits of an integer (bit t set if a total of t can be made). These are found by shifting the totals of
+        the groups after it by the weight, by twice the weight, by four times the weight and so on (splitting the number
+        of copies into powers of 2), so each group only takes a few shifts however many items it has. If the capacity
+        can be made, the combination is traced forwards through the groups, taking as many copies of each weight as
+        possible while the rest of the total can still be made from the groups after it. This gives the same bins as
+        taking each item in the sorted list in turn whenever the rest of the total can still be made. The full bins
+        come first in the returned bins.
+
+        Each integer of totals is (capacity + 1) bits long, so rather than keeping one for every group, they're only
+        kept at every k-th group (k being the square root of the number of groups) and the ones in between are worked
+        out again from these, one block of k groups at a time, while tracing the combination. This keeps the memory
+        used to about 2√n integers rather than n. The work still grows with the number of different weights times the
+        capacity for every full bin found, so a ValueError is raised if the number of items times the capacity is more
+        than MAX_FULL_BIN_WORK."""
+
+        if len(self.items_list) * self.capacity > self.MAX_FULL_BIN_WORK:
+            raise ValueError(f"Full-Bin packing can only be carried out when the number of items × the bin capacity "
+                             f"is at most {self.MAX_FULL_BIN_WORK:,}.")
+
+        # The different weights in descending order, with how many items of each weight are left to pack
+        weight_counts = {}
+        for item in self.items_list:
+            weight_counts[item] = weight_counts.get(item, 0) + 1
+        weights = sorted(weight_counts, reverse=True)
+        counts = [weight_counts[weight] for weight in weights]
+
+        full_bins = []
+        capacity_mask = (1 << (self.capacity + 1)) - 1 # Keeps only the totals up to the capacity
+
+        while True:
+            groups = [index for index in range(len(weights)) if counts[index]] # Weights with items left
+            group_count = len(groups)
+            if not group_count:
+                break
+            block_size = max(1, math.isqrt(group_count))
+
+            # Finding the totals which can be made from each group onwards, keeping those at the start of each block
+            # (and after the last group, where only a total of 0 can be made from no items)
+            checkpoints = {group_count: 1}
+            totals = 1
+            for position in range(group_count - 1, -1, -1):
+                totals = self._add_copies(totals, weights[groups[position]], counts[groups[position]], capacity_mask)
+                if position % block_size == 0:
+                    checkpoints[position] = totals
+            if not totals >> self.capacity & 1:
+                break # No combination of the remaining items fills a bin exactly
+
+            # Tracing forwards which items make up the capacity, taking as many copies of each weight as possible
+            full_bin = Bin(self.capacity)
+            total = self.capacity
+            for block_start in range(0, group_count, block_size):
+                if not total:
+                    break # The combination is already complete
+                block_end = min(block_start + block_size, group_count)
+
+                # Working out the totals from each group in the block onwards again, from the next checkpoint
+                block_totals = [0] * (block_end - block_start) + [checkpoints[block_end]]
+                for position in range(block_end - 1, block_start - 1, -1):
+                    weight_index = groups[position]
+                    block_totals[position - block_start] = self._add_copies(
+                        block_totals[position - block_start + 1], weights[weight_index], counts[weight_index],
+                        capacity_mask)
+
+                for position in range(block_start, block_end):
+                    weight_index = groups[position]
+                    weight = weights[weight_index]
+                    later_totals = block_totals[position - block_start + 1]
+                    copies = min(counts[weight_index], total // weight)
+                    while copies and not later_totals >> (total - copies * weight) & 1:
+                        copies -= 1
+                    for copy in range(copies):
+                        full_bin.insert_item(weight)
+                    counts[weight_index] -= copies
+                    total -= copies * weight
+            full_bins.append(full_bin)
+
+        # Packing the items not in a full bin (still in descending order) with First-Fit
+        remaining_items = [weight for weight, count in zip(weights, counts) for copy in range(count)]
+        return full_bins + BinPacking(remaining_items, self.capacity).first_fit()
+
+    def _add_copies(self, totals, weight, count, capacity_mask):
+        """Returns the totals (as the bits of an integer) which can be made by adding up to 'count' copies of a weight
+        to the given totals. The copies are added in groups of 1, 2, 4, ... (and what's left over), since any number of
+        copies up to the count can be made from these, so only a few shifts are needed."""
+        count = min(count, (capacity_mask.bit_length() - 1) // weight) # More copies than fit into a bin can't be used
+        group_size = 1
+        while count:
+            copies = min(group_size, count)
+            totals = (totals | (totals << (weight * copies))) & capacity_mask
+            count -= copies
+            group_size *= 2
+        return totals
+
+    def _sort_decreasing(self, record_sort):
+        """Sorts the list into descending order for the decreasing algorithms, returning the bubble sort's log (None if
+        'record_sort' is False, when the built-in sort is used instead) and the sorted list"""
+        if record_sort:
+            # Sorting the list into descending order via bubble sort
+            sorter = BubbleSort(self.items_list)
+            sort_log = sorter.descending()
+            return sort_log, sort_log[-1][0]
+        return None, sorted(self.items_list, reverse=True)
+
+    def bins_log_lines(self, bins):
+        """Returns the contents of each packed bin as plain lines of text, in the same layout as the Simple Algorithms
+        window"""
+        lines = []
+        for bin_index, bin in enumerate(bins, start=1):
+            lines.append(f"Bin {bin_index}: {bin.contents}")
+            lines.append("")
+        return lines
+
+    def first_fit_decreasing_log_lines(self, sort_log, sorted_list, bins):
+        """Returns the working of the First-Fit-Decreasing algorithm (the bubble sort, the sorted list and the packed
+        bins) as plain lines of text, in the same layout as the Simple Algorithms window. The bubble sort is left out
+        if there is no sort log (when it was sorted without recording the sort). Best-Fit-Decreasing's working has the
+        same layout, so it's written out by this too."""
+        lines = []
+        if sort_log is not None:
+            lines = BubbleSort(self.items_list).log_lines(sort_log)
+            lines.append("")
+        lines.append(f"Sorted List: {sorted_list}")
+        lines.append("")
+        lines.extend(self.bins_log_lines(bins))
+        return lines
+
+    def lower_bound_log_lines(self):
+        """Returns the calculation of the Lower Bound as plain lines of text, in the same layout as the Simple
+        Algorithms window (with the division written to 3dp if it's not a whole number)"""
+        total_weight, capacity, lower_bound_value = self.lower_bound()
+        ratio = total_weight / capacity
+        if ratio.is_integer():
+            calculation = f"Total Weights / Bin Capacity = {total_weight} / {capacity} = {int(ratio)}"
+        else:
+            calculation = f"Total Weights / Bin Capacity = {total_weight} / {capacity} = {ratio:.3f}…"
+        return [calculation, f"Lower Bound = {lower_bound_value}"]
+
+
+class ExactBinPacking:
+    """Finds the least possible number of bins needed to pack a list of items, using a branch-and-bound search. The
+    heuristic algorithms (First-Fit-Decreasing etc.) don't always use the fewest bins, so this is used to show whether
+    a heuristic's answer is optimal.
+
+    The search starts from the First-Fit-Decreasing packing as the best packing found so far, and finishes straight away
+    if it already uses as many bins as the Martello-Toth lower bound. Otherwise it looks for a packing with one bin
+    fewer than the best one: if one is found it becomes the best packing and the search is repeated, and if there isn't
+    one the best packing is optimal.
+
+    Each search packs one bin at a time. The next bin always holds the largest item left, along with one of the sets
+    of the other items left which fit into the space beside it, trying the sets which fill the bin most first. Choosing
+    the bins in this order means the same bins are never tried in a different order, and items of the same weight are
+    grouped together so the same set of weights is only tried once. Sets which can't be part of a better packing than
+    another set are skipped (the Martello-Toth dominance criterion):
+    - a set is only tried if no other item left would also fit into the bin, since moving that item into the bin never
+      needs more bins
+    - a set isn't tried if another item left could take the place of one or two of its items and still fit, since
+      swapping them over never needs more bins either
+    With fewer bins there is a fixed amount of space which can be left empty (the bins' total capacity minus the items'
+    total weight), so a set is also only tried if the space it leaves doesn't take the total empty space over this, and
+    the search goes back to try the next set whenever the bins so far plus the Martello-Toth lower bound of the items
+    left is more than the bins allowed.
+
+    The search stops once it proves the best packing optimal, or when the time limit (in seconds) or node limit (the
+    number of bins tried) is reached - in which case the best packing found is given, but it may not be optimal. Either
+    limit can be None."""
+
+    def __init__(self, items_list, capacity, time_limit=5.0, node_limit=None):
+        BinPacking(items_list, capacity) # Raises a ValueError if the items can't be packed
+        self.items_list = items_list
+        self.capacity = capacity
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+
+        self.bins = [] # The best packing found
+        self.heuristic_bins = 0 # Number of bins used by First-Fit-Decreasing
+        self.lower_bound = 0 # Martello-Toth lower bound
+        self.optimal = False # Whether the best packing has been proven to use the fewest bins
+        self.stopped_by = None # "time limit" or "node limit" if the search was stopped before finishing
+        self.nodes = 0 # Number of bins tried
+        self.elapsed = 0.0 # Time taken in seconds
+
+    def solve(self):
+        """Carries out the search, returning the bins of the best packing found (also kept in 'bins', along with
+        whether it's 'optimal')"""
+
+        self._start_time = time.perf_counter()
+        bin_packer = BinPacking(self.items_list, self.capacity)
+        self.lower_bound = bin_packer.martello_toth_lower_bound()
+        self.bins = bin_packer.first_fit_decreasing(record_sort=False)[2]
+        self.heuristic_bins = len(self.bins)
+
+        # Looking for a packing with one bin fewer until there isn't one (or the search is stopped)
+        while len(self.bins) > self.lower_bound:
+            packing = self._search(len(self.bins) - 1)
+            if packing is None:
+                break
+            self.bins = packing
+        self.optimal = self.stopped_by is None
+        self.elapsed = time.perf_counter() - self._start_time
+
+        return self.bins
+
+    def _search(self, bins_allowed):
+        """Searches for a packing with at most 'bins_allowed' bins, returning its bins or None if there isn't one (or
+        the search was stopped). The search is kept as a stack of the completions generators of each bin (rather than
+        recursion) so long lists of items can be searched."""
+
+        capacity = self.capacity
+        # The different weights in descending order, with how many items of each weight are left to pack
+        weight_counts = {}
+        for item in self.items_list:
+            weight_counts[item] = weight_counts.get(item, 0) + 1
+        self._weights = sorted(weight_counts, reverse=True)
+        self._counts = [weight_counts[weight] for weight in self._weights]
+        self._negated_weights = [-weight for weight in self._weights] # In ascending order, for bisection
+
+        items_left = len(self.items_list)
+        empty_space_left = bins_allowed * capacity - sum(self.items_list) # Space which can still be left empty
+
+        packing = [] # Contents of each bin packed so far
+        empty_spaces = [] # Empty space left in each bin packed so far
+        stack = [self._completions(empty_space_left)]
+
+        while stack:
+            if len(packing) == len(stack):
+                # Taking the top bin's last set of items back out before trying its next set
+                items_left += len(packing.pop())
+                empty_space_left += empty_spaces.pop()
+
+            contents = next(stack[-1], None)
+            if contents is None:
+                # Every set has been tried for this bin, so going back to the bin before it
+                stack.pop()
+                continue
+            packing.append(contents)
+            empty_spaces.append(capacity - sum(contents))
+            items_left -= len(contents)
+            empty_space_left -= empty_spaces[-1]
+
+            # Stopping if either limit has been reached
+            self.nodes += 1
+            if self.node_limit is not None and self.nodes >= self.node_limit:
+                self.stopped_by = "node limit"
+                return None
+            if self.time_limit is not None and time.perf_counter() - self._start_time >= self.time_limit:
+                self.stopped_by = "time limit"
+                return None
+
+            if not items_left:
+                # Every item is packed in the bins allowed
+                bins = []
+                for contents in packing:
+                    bins.append(Bin(capacity))
+                    for item in contents:
+                        bins[-1].insert_item(item)
+                return bins
+
+            # Going on to the next bin unless the items left need more bins than are allowed
+            items = [weight for weight, count in zip(self._weights, self._counts) for copy in range(count)]
+            if len(packing) + BinPacking(items, capacity).martello_toth_lower_bound() <= bins_allowed:
+                stack.append(self._completions(empty_space_left))
+
+        return None
+
+    def _completions(self, empty_space_left):
+        """Generates the sets of items which can go into the next bin: the largest item left along with a set of the
+        other items left which fit beside it, such that the empty space left in the bin is at most 'empty_space_left'
+        and the set isn't dominated. Each set is taken out of the counts of items left while it's being tried, and put
+        back before the next set is generated, with the sets which fill the bin most generally coming first."""
+
+        weights = self._weights
+        counts = self._counts
+        first_index = 0
+        while not counts[first_index]:
+            first_index += 1
+        largest_item = weights[first_index]
+        counts[first_index] -= 1
+
+        # Index of the smallest weight left, and the total weight left from each index onwards
+        last_index = len(weights) - 1
+        while last_index >= first_index and not counts[last_index]:
+            last_index -= 1
+        weight_left_from = [0] * (len(weights) + 1)
+        for index in range(len(weights) - 1, first_index - 1, -1):
+            weight_left_from[index] = weight_left_from[index + 1] + weights[index] * counts[index]
+
+        contents = [largest_item]
+        for completion in self._fill_space(first_index, self.capacity - largest_item, math.inf, last_index,
+                                           weight_left_from, empty_space_left, contents):
+            yield list(completion)
+        counts[first_index] += 1
+
+    def _fill_space(self, start_index, space, smallest_skipped, last_index, weight_left_from, empty_space_left,
+                    contents):
+        """Adds sets of the weights from 'start_index' onwards to the bin's 'contents', yielding the contents whenever
+        nothing else left fits into the space (and no weight skipped over, the smallest being 'smallest_skipped', fits
+        either) and they aren't dominated. Each weight is taken as many times as possible first, so the fullest sets
+        generally come first."""
+
+        weights = self._weights
+        counts = self._counts
+        for index in range(start_index, len(weights)):
+            weight = weights[index]
+            if not counts[index] or weight > space:
+                continue
+            # The empty space can't end up any less than the space minus all of the weight left
+            least_space = space - weight_left_from[index]
+            if least_space > empty_space_left or least_space >= smallest_skipped:
+                break
+
+            most_copies = min(counts[index], space // weight)
+            for copies in range(most_copies, 0, -1):
+                # Any copies of the weight not taken are skipped over
+                skipped = weight if copies < counts[index] else smallest_skipped
+                counts[index] -= copies
+                contents.extend([weight] * copies)
+                yield from self._fill_space(index + 1, space - weight * copies, skipped, last_index, weight_left_from,
+                                            empty_space_left, contents)
+                del contents[-copies:]
+                counts[index] += copies
+
+            # Moving on to the next weight skips over this one
+            smallest_skipped = weight
+
+        # The contents are complete if no weight left fits into the space
+        smallest_left = weights[last_index] if last_index >= start_index and counts[last_index] else math.inf
+        if space < smallest_skipped and space < smallest_left and space <= empty_space_left and \
+                not self._dominated(contents, space):
+            yield contents
+
+    def _dominated(self, contents, space):
+        """Checks whether an item left could take the place of one item, or two items, of the bin's contents (other
+        than its largest item) and still fit into the bin, given the bin's empty 'space'"""
+        if not space:
+            return False
+        items = contents[1:]
+        for position, item in enumerate(items):
+            # An item larger than this one, by at most the empty space
+            if self._weight_left_between(item + 1, item + space):
+                return True
+            for other_item in items[position + 1:]:
+                # An item at least as large as both together, by at most the empty space
+                if self._weight_left_between(item + other_item, item + other_item + space):
+                    return True
+        return False
+
+    def _weight_left_between(self, smallest, largest):
+        """Checks whether there's an item left with a weight from 'smallest' to 'largest'"""
+        index = bisect.bisect_left(self._negated_weights, -largest)
+        while index < len(self._weights) and self._weights[index] >= smallest:
+            if self._counts[index]:
+                return True
+            index += 1
+        return False
+
+    def log_lines(self):
+        """Returns the result of the search as plain lines of text, in the same layout as the Simple Algorithms window:
+        the First-Fit-Decreasing and lower bound bin counts, whether the best packing is optimal and its bins"""
+        lines = [f"First-Fit Decreasing = {self.heuristic_bins} bins",
+                 f"Lower Bound (Martello-Toth) = {self.lower_bound}", ""]
+
+        if self.optimal:
+            lines.append(f"Optimal = {len(self.bins)} bins (proven after {self.nodes} nodes, {self.elapsed:.2f}s)")
+            if self.heuristic_bins == len(self.bins):
+                lines.append("First-Fit Decreasing's packing is optimal")
+            else:
+                lines.append("First-Fit Decreasing's packing is not optimal")
+        else:
+            lines.append(f"Best Found = {len(self.bins)} bins (search stopped by the {self.stopped_by} after "
+                         f"{self.nodes} nodes, {self.elapsed:.2f}s)")
+            lines.append(f"The optimal number of bins is between {self.lower_bound} and {len(self.bins)}")
+        lines.append("")
+
+        lines.extend(BinPacking(self.items_list, self.capacity).bins_log_lines(self.bins))
+        return lines
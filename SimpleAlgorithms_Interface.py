@@ -1,8 +1,10 @@
+import time
+
 from PyQt5.QtWidgets import QWidget, QLineEdit, QPushButton, QTextEdit, QHBoxLayout, QVBoxLayout, QMessageBox, QLabel
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
-from SimpleAlgorithms import BubbleSort, BinPacking
+from SimpleAlgorithms import BubbleSort, BinPacking, ExactBinPacking
 
 
 class SimpleAlgorithmsWindow(QWidget):
@@ -88,30 +90,27 @@ class SimpleAlgorithmsWindow(QWidget):
         main_layout.addLayout(capacity_layout)
         main_layout.addSpacing(15)
 
-        # Bin-packing buttons
-        first_fit_button = QPushButton("First Fit")
-        first_fit_decreasing_button = QPushButton("First Fit Decreasing")
-        lower_bound_button = QPushButton("Calculate Lower Bound")
-
-        for button in (first_fit_button, first_fit_decreasing_button, lower_bound_button):
-            button.setStyleSheet(
-                "background-color: #2196F3; color: white;"
-                " font-weight: bold; border-radius: 15px;"
-            )
-
-        first_fit_button.clicked.connect(self.first_fit)
-        first_fit_decreasing_button.clicked.connect(self.first_fit_decreasing)
-        lower_bound_button.clicked.connect(self.calc_lower_bound)
-
-        bin_buttons_layout = QHBoxLayout()
-        bin_buttons_layout.setSpacing(20)
-
-        bin_buttons_layout.addWidget(first_fit_button)
-        bin_buttons_layout.addWidget(first_fit_decreasing_button)
-        bin_buttons_layout.addWidget(lower_bound_button)
-
-        main_layout.addLayout(bin_buttons_layout)
-        main_layout.addSpacing(25)
+        # Bin-packing buttons (in rows of three)
+        bin_buttons = [("First Fit", self.first_fit), ("First Fit Decreasing", self.first_fit_decreasing),
+                       ("Calculate Lower Bound", self.calc_lower_bound), ("Best Fit", self.best_fit),
+                       ("Best Fit Decreasing", self.best_fit_decreasing), ("Worst Fit", self.worst_fit),
+                       ("Next Fit", self.next_fit), ("Full Bin", self.full_bin),
+                       ("Optimal Packing", self.optimal_packing), ("Compare All", self.compare_bin_packing)]
+
+        for row_start in range(0, len(bin_buttons), 3):
+            bin_buttons_layout = QHBoxLayout()
+            bin_buttons_layout.setSpacing(20)
+            for text, method in bin_buttons[row_start:row_start + 3]:
+                button = QPushButton(text)
+                button.setStyleSheet(
+                    "background-color: #2196F3; color: white;"
+                    " font-weight: bold; border-radius: 15px;"
+                )
+                button.clicked.connect(method)
+                bin_buttons_layout.addWidget(button)
+            main_layout.addLayout(bin_buttons_layout)
+            main_layout.addSpacing(10)
+        main_layout.addSpacing(15)
 
         # Output log
         self.output_log = QTextEdit()
@@ -125,7 +124,8 @@ class SimpleAlgorithmsWindow(QWidget):
         """)
         main_layout.addWidget(self.output_log)
 
-    def _read_input_list(self):
+    def _read_input_list(self, positive=False):
+        # Reads the list's items ('positive' is True for bin-packing, whose items must all be more than 0)
         items = []
 
         # Iterating through boxes to retrieve the list's items
@@ -142,6 +142,9 @@ class SimpleAlgorithmsWindow(QWidget):
             # Error message if input not an integer
             except ValueError:
                 raise ValueError(f"Item #{position} ('{item_text}') is not an integer.")
+            # Error message if a bin-packing item isn't positive
+            if positive and items[-1] <= 0:
+                raise ValueError(f"Item #{position} ('{item_text}') must be positive.")
 
         # Error message in case of empty list
         if not items:
@@ -174,7 +177,8 @@ class SimpleAlgorithmsWindow(QWidget):
         self.output_log.append(f"<b>{original_list}</b>")
         self.output_log.append("")
         self.output_log.append("")
-        # Write number of swaps after the state of the list after each pass
+        # Write number of swaps after the state of the list after each pass (as each pass is carried out if the log is
+        # a generator of the passes)
         for state, swaps in log:
             self.output_log.append(f"{state}   →   {swaps} swaps")
             self.output_log.append("")
@@ -190,10 +194,9 @@ class SimpleAlgorithmsWindow(QWidget):
             QMessageBox.warning(self, "Input Error", str(error))
             return
 
-        # Carry out Ascending Bubble Sort and display log with working steps
+        # Carry out Ascending Bubble Sort and display log with working steps, one pass at a time
         sorter = BubbleSort(items)
-        log = sorter.ascending()
-        self._display_bubblesort_log(items, log)
+        self._display_bubblesort_log(items, sorter.passes())
 
     def sort_descending(self):
         # Retrieve items for the sort from the textboxes
@@ -204,26 +207,52 @@ class SimpleAlgorithmsWindow(QWidget):
             QMessageBox.warning(self, "Input Error", str(error))
             return
 
-        # Carry out Descending Bubble Sort and display log with working steps
+        # Carry out Descending Bubble Sort and display log with working steps, one pass at a time
         sorter = BubbleSort(items)
-        log = sorter.descending()
-        self._display_bubblesort_log(items, log)
+        self._display_bubblesort_log(items, sorter.passes(descending=True))
 
-    def first_fit(self):
-        # Retrieve items for the bin-packing from the textboxes
+    def _read_packing_input(self):
+        """Retrieves the items and bin capacity for the bin-packing, displaying an error message and returning None if
+        either is invalid or an item is larger than the bin capacity"""
         try:
-            items = self._read_input_list()
+            items = self._read_input_list(positive=True)
             capacity_value = self._read_capacity()
         # Display error message if needed for invalid list
         except ValueError as error:
             QMessageBox.warning(self, "Input Error", str(error))
-            return
+            return None
         # Display error message if a list item is larger than the bin capacity
         for position, weight in enumerate(items, start=1):
             if weight > capacity_value:
                 QMessageBox.warning(self, "Input Error",
                                     f"Item #{position} of weight {weight} cannot be larger than the Bin Capacity")
-                return
+                return None
+
+        return items, capacity_value
+
+    def _display_bins(self, bins):
+        # Displaying the contents of each bin
+        for bin_index, bin in enumerate(bins, start=1):
+            self.output_log.append(f"<b>Bin {bin_index}:</b> {bin.contents}")
+            self.output_log.append("")
+
+    def _display_decreasing_log(self, items, sort_log, sorted_list, bins):
+        # Displaying Bubble Sort working
+        self._display_bubblesort_log(items, sort_log)
+        self.output_log.append("")
+        # Writing out sorted list after carried out Bubble Sort
+        self.output_log.append(f"<b>Sorted List: {sorted_list}</b>")
+        self.output_log.append("")
+
+        # Displaying the bins after the algorithm carried out on the sorted list
+        self._display_bins(bins)
+
+    def first_fit(self):
+        # Retrieve items for the bin-packing from the textboxes
+        packing_input = self._read_packing_input()
+        if packing_input is None:
+            return
+        items, capacity_value = packing_input
 
         # Carry out First-Fit Bin-Packing
         bin_packer = BinPacking(items, capacity_value)
@@ -231,58 +260,172 @@ class SimpleAlgorithmsWindow(QWidget):
 
         # Display steps in the log
         self.output_log.clear()
-        for bin_index, bin in enumerate(bins, start=1):
-            self.output_log.append(f"<b>Bin {bin_index}:</b> {bin.contents}")
-            self.output_log.append("")
+        self._display_bins(bins)
 
     def first_fit_decreasing(self):
         # Retrieve items for the bin-packing from the textboxes
-        try:
-            items = self._read_input_list()
-            capacity_value = self._read_capacity()
-        # Display error message if needed for invalid list
-        except ValueError as error:
-            QMessageBox.warning(self, "Input Error", str(error))
+        packing_input = self._read_packing_input()
+        if packing_input is None:
             return
-        # Display error message if a list item is larger than the bin capacity
-        for position, weight in enumerate(items, start=1):
-            if weight > capacity_value:
-                QMessageBox.warning(self, "Input Error",
-                                    f"Item #{position} of weight {weight} cannot be larger than the Bin Capacity")
-                return
+        items, capacity_value = packing_input
 
         # Carrying out First-Fit Decreasing Bin-Packing
         bin_packer = BinPacking(items, capacity_value)
         sort_log, sorted_list, bins = bin_packer.first_fit_decreasing()
+        self._display_decreasing_log(items, sort_log, sorted_list, bins)
 
-        # Displaying Bubble Sort working
-        self._display_bubblesort_log(items, sort_log)
-        self.output_log.append("")
-        # Writing out sorted list after carried out Bubble Sort
-        self.output_log.append(f"<b>Sorted List: {sorted_list}</b>")
-        self.output_log.append("")
+    def best_fit(self):
+        # Retrieve items for the bin-packing from the textboxes
+        packing_input = self._read_packing_input()
+        if packing_input is None:
+            return
+        items, capacity_value = packing_input
 
-        # Displaying the bins after First-Fit carried out on the sorted list
-        for bin_index, bin in enumerate(bins, start=1):
-            self.output_log.append(f"<b>Bin {bin_index}:</b> {bin.contents}")
-            self.output_log.append("")
+        # Carry out Best-Fit Bin-Packing and display the bins
+        bins = BinPacking(items, capacity_value).best_fit()
+        self.output_log.clear()
+        self._display_bins(bins)
 
-    def calc_lower_bound(self):
+    def best_fit_decreasing(self):
+        # Retrieve items for the bin-packing from the textboxes
+        packing_input = self._read_packing_input()
+        if packing_input is None:
+            return
+        items, capacity_value = packing_input
+
+        # Carrying out Best-Fit Decreasing Bin-Packing
+        sort_log, sorted_list, bins = BinPacking(items, capacity_value).best_fit_decreasing()
+        self._display_decreasing_log(items, sort_log, sorted_list, bins)
+
+    def worst_fit(self):
         # Retrieve items for the bin-packing from the textboxes
+        packing_input = self._read_packing_input()
+        if packing_input is None:
+            return
+        items, capacity_value = packing_input
+
+        # Carry out Worst-Fit Bin-Packing and display the bins
+        bins = BinPacking(items, capacity_value).worst_fit()
+        self.output_log.clear()
+        self._display_bins(bins)
+
+    def next_fit(self):
+        # Retrieve items for the bin-packing from the textboxes
+        packing_input = self._read_packing_input()
+        if packing_input is None:
+            return
+        items, capacity_value = packing_input
+
+        # Carry out Next-Fit Bin-Packing and display the bins
+        bins = BinPacking(items, capacity_value).next_fit()
+        self.output_log.clear()
+        self._display_bins(bins)
+
+    def full_bin(self):
+        # Retrieve items for the bin-packing from the textboxes
+        packing_input = self._read_packing_input()
+        if packing_input is None:
+            return
+        items, capacity_value = packing_input
+
+        # Carry out Full-Bin packing and display the bins (the full bins first)
         try:
-            items = self._read_input_list()
-            capacity_value = self._read_capacity()
-        # Display error message if needed for invalid list
+            bins = BinPacking(items, capacity_value).full_bin()
+        # Display error message if there are too many items for the bin capacity
         except ValueError as error:
             QMessageBox.warning(self, "Input Error", str(error))
             return
-        # Display error message if a list item is larger than the bin capacity
-        for position, weight in enumerate(items, start=1):
-            if weight > capacity_value:
-                QMessageBox.warning(self, "Input Error",
-                                    f"Item #{position} of weight {weight} cannot be larger than the Bin Capacity")
-                return
+        self.output_log.clear()
+        self._display_bins(bins)
+
+    def compare_bin_packing(self):
+        # Retrieve items for the bin-packing from the textboxes
+        packing_input = self._read_packing_input()
+        if packing_input is None:
+            return
+        items, capacity_value = packing_input
+
+        # Carrying out every bin-packing algorithm on the same items, timing each one (the decreasing algorithms are
+        # sorted without recording the bubble sort, since its working isn't displayed)
+        bin_packer = BinPacking(items, capacity_value)
+        algorithms = [("First Fit", bin_packer.first_fit),
+                      ("First Fit Decreasing", lambda: bin_packer.first_fit_decreasing(record_sort=False)[2]),
+                      ("Best Fit", bin_packer.best_fit),
+                      ("Best Fit Decreasing", lambda: bin_packer.best_fit_decreasing(record_sort=False)[2]),
+                      ("Worst Fit", bin_packer.worst_fit),
+                      ("Next Fit", bin_packer.next_fit),
+                      ("Full Bin", bin_packer.full_bin)]
+
+        results = []
+        for name, algorithm in algorithms:
+            start = time.perf_counter()
+            try:
+                bins = algorithm()
+            # Noting an algorithm which can't be carried out on these items (Full-Bin with a very large capacity)
+            except ValueError as error:
+                results.append((name, None, None, str(error)))
+                continue
+            results.append((name, len(bins), (time.perf_counter() - start) * 1000, None))
+        # Finding the optimal number of bins to see which algorithms' answers are optimal
+        exact_packer = ExactBinPacking(items, capacity_value)
+        optimal_bins = len(exact_packer.solve())
+
+        # Displaying the number of bins used and the time taken by each algorithm
+        self.output_log.clear()
+        for name, bin_count, milliseconds, error_message in results:
+            if error_message is not None:
+                self.output_log.append(f"<b>{name}:</b> not carried out - {error_message}")
+                self.output_log.append("")
+                continue
+            optimal_text = " - optimal" if exact_packer.optimal and bin_count == optimal_bins else ""
+            self.output_log.append(f"<b>{name}:</b> {bin_count} bins ({milliseconds:.3f} ms){optimal_text}")
+            self.output_log.append("")
+        # Writing out the lower bound and the optimal number of bins to compare the number of bins against
+        self.output_log.append(f"<b>Lower Bound = {bin_packer.lower_bound()[2]}</b>")
+        if exact_packer.optimal:
+            self.output_log.append(f"<b>Optimal = {optimal_bins} bins</b>")
+        else:
+            self.output_log.append(f"<b>Optimal is between {exact_packer.lower_bound} and {optimal_bins} bins</b> "
+                                   f"(search stopped by the {exact_packer.stopped_by})")
 
+    def optimal_packing(self):
+        # Retrieve items for the bin-packing from the textboxes
+        packing_input = self._read_packing_input()
+        if packing_input is None:
+            return
+        items, capacity_value = packing_input
+
+        # Searching for the packing with the fewest bins, starting from the First-Fit Decreasing packing
+        exact_packer = ExactBinPacking(items, capacity_value)
+        bins = exact_packer.solve()
+
+        # Displaying the result of the search (whether First-Fit Decreasing's packing is optimal) and the bins
+        self.output_log.clear()
+        self.output_log.append(f"First-Fit Decreasing = {exact_packer.heuristic_bins} bins")
+        self.output_log.append(f"Lower Bound (Martello-Toth) = {exact_packer.lower_bound}")
+        self.output_log.append("")
+        if exact_packer.optimal:
+            self.output_log.append(f"<b>Optimal = {len(bins)} bins</b> (proven after {exact_packer.nodes} nodes, "
+                                   f"{exact_packer.elapsed:.2f}s)")
+            if exact_packer.heuristic_bins == len(bins):
+                self.output_log.append("First-Fit Decreasing's packing is optimal")
+            else:
+                self.output_log.append("First-Fit Decreasing's packing is not optimal")
+        else:
+            self.output_log.append(f"<b>Best Found = {len(bins)} bins</b> (search stopped by the "
+                                   f"{exact_packer.stopped_by} after {exact_packer.nodes} nodes, "
+                                   f"{exact_packer.elapsed:.2f}s)")
+            self.output_log.append(
+                f"The optimal number of bins is between {exact_packer.lower_bound} and {len(bins)}")
+        self.output_log.append("")
+        self._display_bins(bins)
+
+    def calc_lower_bound(self):
+        # Retrieve items for the bin-packing from the textboxes
+        packing_input = self._read_packing_input()
+        if packing_input is None:
+            return
+        items, capacity_value = packing_input
         # Calculating Lower Bound for the scenario
         total_weight, capacity_value, lower_bound_value = BinPacking(items, capacity_value).lower_bound()
         ratio = total_weight / capacity_value